@@ -1,102 +1,161 @@
 from labyrinth.Labyrinth import Labyrinth
-from labyrinth.labyrinth_objects import Wall, Door
 from labyrinth.two_dimension import Point
+from labyrinth.writer import ResultWriter
+from labyrinth.records import iter_records
+from labyrinth.batch import solve_batch
+import argparse
+import queue
+import threading
 
 MAX_AREA = 200
-LONG_DOOR = 1
 ERROR_NUM = "-1"
 TESEO = Point(0,0)
 
-def create_wall(point_x: int, point_y: int, parallel: bool, longitude: int) -> Wall:
+def _put(stage_queue: queue.Queue, item, stop: threading.Event):
     """
-    Create a wall from a start point, the line longitude and if its parallel to (x or y) axes
+    Puts the item in the queue of the next stage, waits while the queue is full
+    unless the pipeline is stopped
     """
-    first_point = Point(point_x, point_y)
-    if parallel :
-        #parallel to (y) axis
-        second_point = Point(point_x, point_y + longitude)
-    else:
-        #parallel to (x) axis
-        second_point = Point(point_x+ longitude, point_y )
+    while not stop.is_set():
+        try:
+            stage_queue.put(item, timeout=0.1)
+            return
+        except queue.Full:
+            pass
 
-    return Wall(first_point, second_point)
+def _parse_stage(file, records: queue.Queue, stop: threading.Event):
+    """
+    Parser thread: reads the records of the file and puts them in the records queue,
+    None at the end (or the exception if the file is not valid)
+    """
+    try:
+        for record in iter_records(file):
+            _put(records, record, stop)
+            if stop.is_set(): return
+    except Exception as error:
+        _put(records, error, stop)
+        return
+    _put(records, None, stop)
 
-def create_door(point_x: int, point_y: int, parallel: bool) -> Door:
+def _output_stage(writer: ResultWriter, results: queue.Queue, errors: 'list[Exception]'):
     """
-    Create a door from a start point, the line longitude is 1 and if its parallel to (x or y) axes
+    Output thread: writes the formatted results until None,
+    after an error it keeps emptying the queue so the solver never waits
     """
-    first_point = Point(point_x, point_y)
-    if parallel :
-        #parallel to (y) axis
-        second_point = Point(point_x, point_y + LONG_DOOR)
-    else:
-        #parallel to (x) axis
-        second_point = Point(point_x + LONG_DOOR, point_y )
-        
-    return Door(first_point, second_point)
-    
-def main(filename: str, labyrinth: Labyrinth = Labyrinth(max_area=MAX_AREA)):
+    while True:
+        text = results.get()
+        if text is None:
+            break
+        if not errors:
+            try:
+                writer.write(text)
+            except Exception as error:
+                errors.append(error)
+    if not errors:
+        try:
+            writer.flush()
+        except Exception as error:
+            errors.append(error)
+
+def solve_pipeline(file, labyrinth: Labyrinth, writer: ResultWriter, auto_size: bool = False,
+                   queue_size: int = 16):
     """
-    Reads a file with the description of various labyriths and resolve each labyrith 
-    and write it in the output files
+    Solves the records of a file with a pipeline of 3 stages connected by bounded queues:
+        parser thread -> records queue -> solver (this thread) -> results queue -> output thread
+    so reading the input and writing the output is done while the labyrinths are solved.
+    The results are written in the order of the records.
+
+    The solver formats the results (the text of the nodes depends on the labyrinth,
+    that changes with the next record), the output thread only writes them.
+
+    Args:
+        file: TextIO
+            File with the records
+        labyrinth: Labyrinth
+            Labyrinth used for all the records
+        writer: ResultWriter
+            Writer of the results
+        auto_size: bool
+            Clip the labyrinth to each record, see Labyrinth.fit_to_objects()
+        queue_size: int
+            Max records (and results) waiting between two stages
     """
-    with open(filename, 'r') as file:
-        lines = file.readlines()
-        lines = list(map(lambda x: x.strip(), lines))
-        n_walls: int
-        n_doors: int
-        walls: list[Wall]
-        doors: list[Door]
-        minotaurs: Point
-        while True:
-            first_line = lines.pop(0)       # Get the line with M and N
-            parts = first_line.split(" ")   # Get the two variables
-            if len(parts) != 2: raise Exception("Error: Invalid format file.")
-            n_walls = int(parts[0])
-            n_doors = int(parts[1])
-            if (n_walls == -1)  or (n_doors == -1) : return 1
-            elif (n_walls < 0)  or (n_doors < 0): raise Exception("Error: Invalid format file.")
-            walls = []
-            # Get the walls of the labyrinth
-            for i in range(n_walls):
-                ith_line = lines.pop(0)
-                ith_line = ith_line.split(" ")
-                if len(ith_line) != 4: raise Exception("Error: Invalid format file.")
-                x_init = int(ith_line[0])
-                y_init = int(ith_line[1])
-                d_parallel = bool(int(ith_line[2]))
-                t_long = int(ith_line[3])
-                wall = create_wall(x_init, y_init, d_parallel, t_long)
-                walls.append(wall)
-            doors = []
-            #Get the doors of the labyrinth
-            for i in range(n_doors):
-                ith_line = lines.pop(0)
-                ith_line = ith_line.split(" ")
-                if len(ith_line) != 3: raise Exception("Error: Invalid format file.")
-                x_init = int(ith_line[0])
-                y_init = int(ith_line[1])
-                d_parallel = bool(int(ith_line[2]))
-                door = create_door(x_init, y_init, d_parallel)
-                doors.append(door)
-            
-            #Get the minotaurs position
-            minotaurs_line = lines.pop(0)
-            minotaurs_line = minotaurs_line.split(" ")
-            if len(minotaurs_line) != 2: raise Exception("Error: Invalid format file.")
-            m_x = float(minotaurs_line[0])
-            m_y = float(minotaurs_line[1])
-            minotaurs = Point(m_x, m_y)
+    records = queue.Queue(queue_size)
+    results = queue.Queue(queue_size)
+    stop = threading.Event()
+    errors = []
+    parser = threading.Thread(target=_parse_stage, args=(file, records, stop), daemon=True)
+    output = threading.Thread(target=_output_stage, args=(writer, results, errors), daemon=True)
+    parser.start()
+    output.start()
+    try:
+        while not errors:
+            record = records.get()
+            if record is None:
+                break
+            if isinstance(record, Exception):
+                raise record
             #Initialize the Labyrinth
-            labyrinth.eliminate_labyrinth_objs()
-            labyrinth.minotaurs = minotaurs
-            labyrinth.add_labyrinth_objs(walls=walls, doors=doors)
-            
-            labyrinth.print_path_teseo_to_minotaurs()
+            record.apply(labyrinth, auto_size)
+            is_possible, path, number_of_doors_used = labyrinth.teseo_to_minotaurs()
+            results.put(writer.format_result(is_possible, path, number_of_doors_used))
             #labyrinth.print_solution() not because how big are
+    finally:
+        stop.set()
+        results.put(None)
+        output.join()
+        parser.join()
+    if errors:
+        raise errors[0]
+
+def main(filename: str, labyrinth: Labyrinth = None, output_format: str = "text", stream=None,
+         auto_size: bool = False, queue_size: int = 16, engine: str = "astar", batch: bool = False):
+    """
+    Reads a file with the description of various labyriths and resolve each labyrith 
+    and write it in the output (standard output by default) in the given format.
+    See ResultWriter.FORMATS and LabyrinthRecord for the format of the file.
+
+    The file is read, solved and written in a pipeline, see solve_pipeline().
+
+    If auto_size, the labyrinth is clipped to the bounding box of each labyrinth (and grows if needed),
+    see Labyrinth.fit_to_objects()
+
+    The engine is the search used if the labyrinth is not provided, see Labyrinth.ENGINES
+
+    If batch, all the records are solved together with solve_batch() (only the "jsonl" format,
+    the batch doesn't recover the paths)
+    """
+    if batch and output_format != "jsonl":
+        raise ValueError("Error: The batch mode only writes the jsonl format")
+    if labyrinth is None:
+        labyrinth = Labyrinth(teseo=TESEO, max_area=MAX_AREA, engine=engine)
+    with open(filename, 'r') as file, ResultWriter(stream, output_format) as writer:
+        if batch:
+            for is_possible, doors, cells in solve_batch(list(iter_records(file)), labyrinth):
+                writer.write_summary(is_possible, doors, cells)
+        else:
+            solve_pipeline(file, labyrinth, writer, auto_size, queue_size)
+    return 1
                 
                     
 if __name__ == '__main__':
-    labyrinth: Labyrinth = Labyrinth(teseo=TESEO, max_area=MAX_AREA)
-    main("../data_files/input.txt", labyrinth)
+    parser = argparse.ArgumentParser(description="Resolve the labyrinths of the input file")
+    parser.add_argument("filename", nargs="?", default="../data_files/input.txt")
+    parser.add_argument("--format", choices=ResultWriter.FORMATS, default="text", 
+                        help="Format of the output")
+    parser.add_argument("--auto-size", action="store_true",
+                        help="Size each labyrinth to the bounding box of its objects instead of MAX_AREA")
+    parser.add_argument("--engine", choices=["astar"] + list(Labyrinth.ENGINES), default="astar",
+                        help="Search used to solve the labyrinths, same doors and cells but equal paths may differ "
+                             "(numpy uses bitset if NumPy is not installed)")
+    parser.add_argument("--batch", action="store_true",
+                        help="Solve all the labyrinths together with vectorised wavefronts (only --format jsonl)")
+    args = parser.parse_args()
+
+    if args.auto_size:
+        # Starts small and grows with the records
+        labyrinth: Labyrinth = Labyrinth(teseo=TESEO, max_area=2, engine=args.engine)
+    else:
+        labyrinth: Labyrinth = Labyrinth(teseo=TESEO, max_area=MAX_AREA, engine=args.engine)
+    main(args.filename, labyrinth, output_format=args.format, auto_size=args.auto_size, batch=args.batch)
                 
@@ -1,7 +1,32 @@
 from .labyrinth_objects import Door, Wall
 from .two_dimension import Point, Rectangle
 from .graphs import Direction, CellNode, GridCellGraph, PriorityQueue
+from .writer import ResultWriter
+from .path import Path
+from .render import render_cells, render_rows
+from .grid import EdgeGrid, memory_grid
+from .landmarks import Landmarks
+from .stats import SearchStats
+from .bounded import BoundedResult
+from .jps import JumpPointSearch
+from .corridors import CorridorSearch
+from .bitset import BitsetWavefront
+from .parallel import ParallelSearch
+from .frontier import FrontierSearch
+from .columns import ObjectColumns, LONG_DOOR
+from itertools import repeat
+import heapq
 import math
+import sys
+import time
+
+
+def _numpy_wavefront(labyrinth) -> 'NumpyWavefront':
+    """
+    NumpyWavefront of the labyrinth, the module (and NumPy) is imported when the engine is used
+    """
+    from .vectorized import NumpyWavefront
+    return NumpyWavefront(labyrinth)
 
 
 class Labyrinth:
@@ -20,6 +45,8 @@ class Labyrinth:
     The Labyrinth is represented as a cells, a node structure of nodes of the cells of (1u) area,
     So the bigger is the map area of the labyrinth the bigger will be the spatial complexity
     SPATIAL COMPLEXITY: O(MAX_COORD^2)
+    The walls and doors are stored in an EdgeGrid (one byte per edge) and the nodes and the graph
+    structure are created lazily, only for the rows and nodes that are used.
 
     Atributtes:
         minotaurs : Point
@@ -30,10 +57,17 @@ class Labyrinth:
             List with the walls of the Labyrinth
         _doors : 'list[Door]'
             List with the doors of the Labyrinth
-        _labyrinth_nodes: list[list[CellNode]]
-            List with list of nodes in the labyrinth in row order
-        _graph_dictionary: dict[CellNode : GridCellGraph]
-            Dictionary that contains all the graph structure, 
+        _columns: list[ObjectColumns]
+            Walls and doors added as columns (see add_labyrinth_columns())
+        saved_edges: int
+            Edges of length 1 of the columns that were not placed thanks to their normalization
+            (overlapping walls, repeated doors and walls under doors), see add_object_columns()
+        _grid: EdgeGrid
+            Objects in the edges of the cells (EMPTY, DOOR or WALL), built by _grid_factory
+        _rows: list[list[CellNode]]
+            List with list of nodes in the labyrinth in row order, None for the rows not used yet
+        _graphs: dict[CellNode : GridCellGraph]
+            Dictionary that contains the graph structure of the used nodes, 
             each node is associated to its graph structure as pair (key:value)
         MIN_COORD: int
             Represents the min coordenate in the labyrinth map
@@ -49,28 +83,45 @@ class Labyrinth:
             The position of theseo in the labyrinth map
         DOOR_COST: int
             Cost of pass through a door to a another cell in the labyrinth
-            To avoid that heuristic gives better than cross a door the policy is:
-            - Pass through a door should cost the same that the max distance possible in the labyrinth
+            To get first the min number of doors and second the min number of cells the policy is:
+            - Pass through a door should cost more than the longest path of cells in the labyrinth,
+              so it is set per instance to MAX_COORD^2 (and again by resize())
         WALL_COST: int
             Cost of pass through a wall to a another cell in the labyrinth
         EMPTY_COST: int
-            Cost of pass through a empty cell to another cell in the labyrinth
+            Cost of pass to another cell in the labyrinth, each cell used costs 1
+        active_area: int
+            The search only uses the cells with both coordenates lower than active_area,
+            (working region of the labyrinth, see fit_to_objects()), by default MAX_COORD
+        engine: str
+            Search used by teseo_to_minotaurs(), "astar" (A_STAR_SEARCH) or a name of ENGINES
+        ENGINES: dict[str, type]
+            Other searches, classes (or functions) built with the labyrinth with a search(start, goal)
+            method that returns the Path between the (x, y) cells or None
+        MARGIN: int
+            Empty cells added around the bounding box of the objects in fit_to_objects()
     """
     MIN_COORD = 0
                    
     CELL_AREA = 1 # 1 (unit^2), area of sectors, the min area of a cell in the labyrinth map
 
     # Cost of the labyrinth_objects
-    DOOR_COST = 1000 #should be big, because if not the heuristic could defeat it
     WALL_COST = float('inf')
-    EMPTY_COST = 0
+    EMPTY_COST = 1
 
+    MARGIN = 1
+
+    ENGINES = {"jps": JumpPointSearch, "corridors": CorridorSearch, "bitset": BitsetWavefront,
+               "numpy": _numpy_wavefront, "parallel": ParallelSearch,
+               "frontier": FrontierSearch}
 
     def __init__(self, minotaurs: Point = Point(0,0), 
                  teseo: Point = Point(0,0),
                  walls: 'list[Wall]' = [], 
                  doors: 'list[Door]' = [], 
-                 max_area: int = 100):
+                 max_area: int = 100,
+                 grid_factory = EdgeGrid,
+                 engine: str = "astar"):
         """
         Initializes the Labyrinth with the provided data
 
@@ -85,45 +136,151 @@ class Labyrinth:
                 List with the walls of the labyrinth
             doors: 'list[Door]'
                 List with the doors of the labyrinth
+            grid_factory: Callable[[int], EdgeGrid]
+                Builds the storage of the objects for a size, EdgeGrid (in memory) by default,
+                ex: a TiledEdgeGrid for labyrinths bigger than the memory
+            engine: str
+                Search used to find the path, "astar" or a name of ENGINES (ex: "jps")
         """
+        if engine != "astar" and engine not in self.ENGINES:
+            raise ValueError("Error: Unknown search engine " + str(engine))
+        self.engine = engine
         self.minotaurs = minotaurs
+        self._grid_factory = grid_factory
         self._walls = walls
         self._doors = doors
+        self._columns: 'list[ObjectColumns]' = []
+        self.saved_edges = 0
         self.teseo = teseo   # Teseo is in the origin Postion
+        self.stats = SearchStats()
+
+        self._build_grid(max_area)
+        
+        self.add_labyrinth_objs(self._walls, self._doors)
+
+    def _build_grid(self, max_area: int):
+        """
+        Creates the structure of a labyrinth of max_area x max_area cells without the labyrinth objects
+
+        The construction is lazy: only the EdgeGrid (two bytearrays with the objects of the edges)
+        is created, the nodes are created by rows and the graph structure by node
+        the first time they are used (see _row() and _graph_of()).
+        So a labyrinth that only touches a small region only pays for that region.
+        """
         self.MAX_COORD = max_area
+        self.active_area = max_area
+        self._objects_area = 0 # The objects are inside of the _objects_area x _objects_area cells
 
-        # To avoid problems with the heuristic the cost is as big as the max distance
-        self.DOOR_COST = max_area 
-       
+        # A door costs more than any path of cells, so first the doors and second the cells are minimized
+        self.DOOR_COST = max_area * max_area
 
         self.LABYRINTH_COORDS = range(self.MIN_COORD, self.MAX_COORD)
-        
 
-        # Create the structure of the labyrinth without the labyrinth objects
+        # Objects of the edges of the cells, the nodes are built from this structure
+        self._grid = self._grid_factory(max_area)
+        self.landmarks: Landmarks = None
+
         # Structure [ [first_xline_nodes], [second_xline_nodes], [last_xline_node]]
-        self._labyrinth_nodes = self._create_nodes()                         # Create the nodes, list with all the nodes
-        
-        # Structure {CellNode:GridCellGrap} the nodes are keys to its graph structure
-        self._graph_dictionary = self._associate_nodes(self._labyrinth_nodes) # Dictionary contains the graph nodes
+        # each row is None until one of its nodes is used
+        self._rows: 'list[list[CellNode]]' = [None] * max_area
         
-        self.add_labyrinth_objs(self._walls, self._doors)
+        # Structure {CellNode:GridCellGrap} the nodes are keys to its graph structure, filled on demand
+        self._graphs: 'dict[CellNode, GridCellGraph]' = {}
+
+    @property
+    def edge_grid(self) -> EdgeGrid:
+        """
+        Compact structure (EdgeGrid) with the walls and doors of the labyrinth
+        """
+        return self._grid
+
+    @property
+    def _labyrinth_nodes(self) -> 'list[list[CellNode]]':
+        """
+        All the nodes of the labyrinth in row order, creates all the rows not used yet
+        """
+        return [self._row(y) for y in self.LABYRINTH_COORDS]
+
+    @property
+    def _graph_dictionary(self) -> 'dict[CellNode, GridCellGraph]':
+        """
+        Dictionary {CellNode:GridCellGraph} with all the graph structure, creates all the nodes not used yet
+        """
+        for row in self._labyrinth_nodes:
+            for node in row:
+                self._graph_of(node)
+        return self._graphs
+
+    def release_nodes(self):
+        """
+        Drops the nodes and graphs created by the searches, the walls and doors stay in the EdgeGrid
+        and the nodes are built again from it when they are used
+        """
+        self._rows = [None] * self.MAX_COORD
+        self._graphs = {}
+
+    def resize(self, max_area: int):
+        """
+        Rebuilds the labyrinth with max_area x max_area cells, keeping the walls and doors.
+        The working region (active_area) is all the new labyrinth.
+        """
+        self._grid.close()
+        self._build_grid(max_area)
+        self._objects_area = min(self.bounding_area(self._walls, self._doors), self.MAX_COORD)
+        self._add_labyrinth_walls(self._walls)
+        minimal = []
+        for columns in self._columns:
+            self._objects_area = min(max(self._objects_area, self.bounding_area(columns=columns)), self.MAX_COORD)
+            minimal.append(columns.normalized()[0])
+            self._place_columns(EdgeGrid.WALL, minimal[-1].wall_x, minimal[-1].wall_y, minimal[-1].wall_parallel, minimal[-1].wall_length)
+        self._add_labyrinth_doors(self._doors)
+        for columns in minimal:
+            self._place_columns(EdgeGrid.DOOR, columns.door_x, columns.door_y, columns.door_parallel)
+
+    def bounding_area(self, walls: 'list[Wall]' = [], doors: 'list[Door]' = [], columns: ObjectColumns = None) -> int:
+        """
+        Size of the smallest labyrinth that contains the walls, doors, teseo and the minotaurs
+        plus MARGIN empty cells (the labyrinth always starts in MIN_COORD).
+
+        Outside the bounding box of the objects the plane is empty, so any path that leaves
+        the box can be moved into the MARGIN cells without more cells or doors
+        (clamping the cells of the path into the box + margin never crosses a wall or a door),
+        so the min path in the bounding box + margin is the same than in a bigger labyrinth.
+        """
+        max_coord = max(self.teseo.x, self.teseo.y, self.minotaurs.x, self.minotaurs.y)
+        for obj in list(walls) + list(doors):
+            max_coord = max(max_coord, obj.edge1.x, obj.edge1.y, obj.edge2.x, obj.edge2.y)
+        if columns is not None:
+            max_coord = max(max_coord, columns.max_coord())
+        return max(math.ceil(max_coord) + self.MARGIN, 2)
+
+    def fit_to_objects(self, walls: 'list[Wall]' = [], doors: 'list[Door]' = [], columns: ObjectColumns = None):
+        """
+        Clips the working region (active_area) of the labyrinth to the bounding box of the objects,
+        teseo and the minotaurs plus a MARGIN, so the reset and the search only pay for that region.
+
+        The labyrinth grows (see resize()) if the bounding box is bigger than the labyrinth,
+        it never shrinks, so a bigger record after a smaller one doesn't rebuild it.
+        Should be called with the objects before they are added (add_labyrinth_objs() or add_object_columns()).
+        """
+        area = self.bounding_area(walls, doors, columns)
+        if area > self.MAX_COORD:
+            self.resize(area)
+        self.active_area = area
+        self.landmarks = None
                
-    def _create_nodes(self) ->'list[list[CellNode]]':
+    def _row(self, y: int) -> 'list[CellNode]':
         """
-        Creates the nodes of the graph.
+        Gets the nodes of the row y, the row is created the first time is used.
 
         The map of the labyrinth is divided in squares of 1(u^2) and each square is a node,
-        The max and the min coordinates are in the costant self.LABYRINTH_COORDS
-
-        return:
-            A list with the structure:
-                [ [first_xline_nodes], [second_xline_nodes], [last_xline_node]]
+        the objects of the nodes are taken from the EdgeGrid.
         """
-        # The structure of this list is [ [first_xline_nodes], [second_xline_nodes], [last_xline_node]]
-        list_nodes = []
-        for y in self.LABYRINTH_COORDS :
-            sub_list_x = []
-            for x in self.LABYRINTH_COORDS :
+        row = self._rows[y]
+        if row is None:
+            y = y % self.MAX_COORD
+            row = []
+            for x in self.LABYRINTH_COORDS:
 
                 # coords of the 4 edge points of the cell
                 left_bottom = Point(x,y)
@@ -134,107 +291,39 @@ class Labyrinth:
                 cell_area = Rectangle(left_bottom, left_upp, right_bottom, right_upp)
 
                 cell_node = CellNode(cell_area)
-
-                sub_list_x.append(cell_node)
-
-            list_nodes.append(sub_list_x)
-        return list_nodes
-    
-    def _associate_nodes(self, nodes_list: 'list[list[CellNode]]') -> dict:
+                if y < self._objects_area and x < self._objects_area:
+                    for direction in Direction:
+                        self._set_node_obj(cell_node, x, y, direction, self._grid.get_edge(x, y, direction))
+                row.append(cell_node)
+            self._rows[y] = row
+        return row
+
+    def _graph_of(self, node: CellNode) -> GridCellGraph:
         """
-        Associate the nodes with the node that should be its neighbours.
-        Creates the GridCellNode structure of the labyrinth.
-
-        return:
-            Return a Dictionary {CellNode:GridCellGraph}
-
-            The actual node is the key, and the GridCellGraph of that node is the value.
+        Gets the GridCellGraph of the node, the node is associated with the nodes
+        that should be its neighbours the first time is used.
 
         A node is neightbour to its continous nodes, north one, south one, east one, west one.
-        Warning, edge nodes are a especial case
+        The edge nodes of the map have less neighbours.
         """
-
-        graph_dictionary = {}
-        for i in self.LABYRINTH_COORDS:
-            for j in self.LABYRINTH_COORDS:
-                
-                #Case for corners of the map
-                if (i == 0) and (j == 0):
-                    north_node = nodes_list[i+1][j]
-                    south_node = None
-                    west_node = None
-                    east_node = nodes_list[i][j+1]
-
-                elif (i == 0) and (j == self.MAX_COORD-1):
-                    north_node = nodes_list[i+1][j]
-                    south_node = None
-                    west_node = nodes_list[i][j-1]
-                    east_node = None
-
-                elif (i == self.MAX_COORD-1) and (j == 0):
-                    north_node = None
-                    south_node = nodes_list[i-1][j]
-                    west_node = None
-                    east_node = nodes_list[i][j+1]
-
-                elif (i == self.MAX_COORD-1) and ( j == self.MAX_COORD-1):
-                    north_node = None
-                    south_node = nodes_list[i-1][j]
-                    west_node = nodes_list[i][j-1]
-                    east_node = None
-
-                #Case for edge lines
-                elif i == 0:
-                    north_node = nodes_list[i+1][j]
-                    south_node = None
-                    west_node = nodes_list[i][j-1]
-                    east_node = nodes_list[i][j+1]
-
-                elif i == self.MAX_COORD-1:
-                    north_node = None
-                    south_node = nodes_list[i-1][j]
-                    west_node = nodes_list[i][j-1]
-                    east_node = nodes_list[i][j+1]
-
-                elif j == 0:
-                    north_node = nodes_list[i+1][j]
-                    south_node = nodes_list[i-1][j]
-                    west_node = None
-                    east_node = nodes_list[i][j+1]
-
-                elif j == self.MAX_COORD-1:
-                    north_node = nodes_list[i+1][j]
-                    south_node = nodes_list[i-1][j]
-                    west_node = nodes_list[i][j-1]
-                    east_node = None
-
-                #Normal case fo nodes with all neighbours
-                else:
-                    north_node = nodes_list[i+1][j]
-                    south_node = nodes_list[i-1][j]
-                    west_node = nodes_list[i][j-1]
-                    east_node = nodes_list[i][j+1]
-                
-                actual_node = nodes_list[i][j]
-
-                # create the grid graph relations
-                grid_cell_node = GridCellGraph(actual_node=actual_node, 
-                                               north_node=north_node, 
-                                               south_node=south_node, 
-                                               west_node=west_node, 
-                                               east_node=east_node)
-        
-                
-                graph_dictionary[actual_node] = grid_cell_node
-
-        return graph_dictionary
+        graph = self._graphs.get(node)
+        if graph is None:
+            x = int(node.cell.bottom_left.x)
+            y = int(node.cell.bottom_left.y)
+            last = self.MAX_COORD - 1
+            row = self._row(y)
+            graph = GridCellGraph(actual_node=node,
+                                  north_node=self._row(y+1)[x] if y < last else None,
+                                  south_node=self._row(y-1)[x] if y > 0 else None,
+                                  west_node=row[x-1] if x > 0 else None,
+                                  east_node=row[x+1] if x < last else None)
+            self._graphs[node] = graph
+        return graph
 
     def get_node_contains(self, point: Point) -> 'list[CellNode]':
         """
         Gets the nodes that contains this point.
         
-        Requires that the self._labyrinth_nodes is initialized
-
         If a point its in the edges of various nodes, it returns all the nodes
         If the point its not in the coordenates, it returns a empty list
 
@@ -248,7 +337,7 @@ class Labyrinth:
         floor_y = math.floor(point.y)
 
         # Check if the point is in the coordinates
-        if(floor_y > len(self._labyrinth_nodes)) or (floor_x > len(self._labyrinth_nodes[0])):
+        if(floor_y > self.MAX_COORD) or (floor_x > self.MAX_COORD):
             return result
         
         # Case of edge Point the point is shared by 4 nodes: In the edge Point of each node
@@ -260,37 +349,37 @@ class Labyrinth:
             bottom_left = None
 
             if floor_x == 0 and floor_y == 0:
-                upper_right = self._labyrinth_nodes[floor_y][floor_x]
+                upper_right = self._row(floor_y)[floor_x]
 
             elif floor_x == self.MAX_COORD and floor_y == self.MAX_COORD:
-                bottom_left = self._labyrinth_nodes[floor_y-1][floor_x-1]
+                bottom_left = self._row(floor_y-1)[floor_x-1]
 
             elif floor_x == 0 and floor_y == self.MAX_COORD:
-                bottom_right = self._labyrinth_nodes[floor_y-1][floor_x]
+                bottom_right = self._row(floor_y-1)[floor_x]
 
             elif floor_x == self.MAX_COORD and floor_y == 0:
-                upper_left = self._labyrinth_nodes[floor_y][floor_x-1]
+                upper_left = self._row(floor_y)[floor_x-1]
 
             elif floor_x == 0:
-                upper_right = self._labyrinth_nodes[floor_y][floor_x]
-                bottom_right = self._labyrinth_nodes[floor_y-1][floor_x]
+                upper_right = self._row(floor_y)[floor_x]
+                bottom_right = self._row(floor_y-1)[floor_x]
 
             elif floor_y == 0:
-                upper_left = self._labyrinth_nodes[floor_y][floor_x-1]
-                upper_right = self._labyrinth_nodes[floor_y][floor_x]
+                upper_left = self._row(floor_y)[floor_x-1]
+                upper_right = self._row(floor_y)[floor_x]
             
             elif floor_x == self.MAX_COORD:
-                upper_left = self._labyrinth_nodes[floor_y][floor_x-1]
-                bottom_left = self._labyrinth_nodes[floor_y-1][floor_x-1]
+                upper_left = self._row(floor_y)[floor_x-1]
+                bottom_left = self._row(floor_y-1)[floor_x-1]
 
             elif floor_y == self.MAX_COORD:
-                bottom_left = self._labyrinth_nodes[floor_y-1][floor_x-1]
-                bottom_right = self._labyrinth_nodes[floor_y-1][floor_x]
+                bottom_left = self._row(floor_y-1)[floor_x-1]
+                bottom_right = self._row(floor_y-1)[floor_x]
             else:
-                upper_right = self._labyrinth_nodes[floor_y][floor_x]
-                upper_left = self._labyrinth_nodes[floor_y][floor_x-1]
-                bottom_right = self._labyrinth_nodes[floor_y-1][floor_x]
-                bottom_left = self._labyrinth_nodes[floor_y-1][floor_x-1]
+                upper_right = self._row(floor_y)[floor_x]
+                upper_left = self._row(floor_y)[floor_x-1]
+                bottom_right = self._row(floor_y-1)[floor_x]
+                bottom_left = self._row(floor_y-1)[floor_x-1]
 
             result.extend([upper_left, upper_right, bottom_left, bottom_right])
                 
@@ -300,14 +389,14 @@ class Labyrinth:
 
             if floor_y == 0:
                 bottom = None
-                upper = self._labyrinth_nodes[floor_y][floor_x]
+                upper = self._row(floor_y)[floor_x]
 
             elif floor_y == self.MAX_COORD:
-                bottom = self._labyrinth_nodes[floor_y-1][floor_x]
+                bottom = self._row(floor_y-1)[floor_x]
                 upper = None
             else:
-                upper = self._labyrinth_nodes[floor_y][floor_x]
-                bottom = self._labyrinth_nodes[floor_y-1][floor_x]
+                upper = self._row(floor_y)[floor_x]
+                bottom = self._row(floor_y-1)[floor_x]
 
             result.extend([bottom, upper])
 
@@ -315,75 +404,125 @@ class Labyrinth:
         elif (point.x - floor_x) == 0:
             
             if floor_x == 0:
-                right = self._labyrinth_nodes[floor_y][floor_x]
+                right = self._row(floor_y)[floor_x]
                 left = None
 
             if floor_x == self.MAX_COORD:
-                left = self._labyrinth_nodes[floor_y][floor_x-1]
+                left = self._row(floor_y)[floor_x-1]
                 right = None
             else:
-                left = self._labyrinth_nodes[floor_y][floor_x-1]
-                right = self._labyrinth_nodes[floor_y][floor_x]
+                left = self._row(floor_y)[floor_x-1]
+                right = self._row(floor_y)[floor_x]
 
             result.extend([right, left])
 
         # Normal case the point is only inside of a node
         else:
-            result.append(self._labyrinth_nodes[floor_y][floor_x])
+            result.append(self._row(floor_y)[floor_x])
         
         result = list(filter(lambda x: x is not None, result))
         return result
 
+    def get_node(self, x: int, y: int) -> CellNode:
+        """
+        Gets the node of the cell with the left bottom corner in the integer coordinates (x, y)
+
+        raise:
+            IndexError
+                If the cell is not in the labyrinth coordenates
+        """
+        if x not in self.LABYRINTH_COORDS or y not in self.LABYRINTH_COORDS:
+            raise IndexError("Error: cell (" + str(x) + "," + str(y) + ") is not in the labyrinth")
+        return self._row(y)[x]
+
+    def _set_node_obj(self, node: CellNode, x: int, y: int, direction: Direction, kind: int):
+        """
+        Sets in the node the object (Wall or Door of length 1) of the edge in the given direction
+        """
+        obj = None
+        if kind != EdgeGrid.EMPTY:
+            if direction == Direction.NORTH:
+                edges = (Point(x, y + 1), Point(x + 1, y + 1))
+            elif direction == Direction.SOUTH:
+                edges = (Point(x, y), Point(x + 1, y))
+            elif direction == Direction.WEST:
+                edges = (Point(x, y), Point(x, y + 1))
+            else:
+                edges = (Point(x + 1, y), Point(x + 1, y + 1))
+            obj = Door(*edges) if kind == EdgeGrid.DOOR else Wall(*edges)
+
+        if direction == Direction.NORTH: node.north_obj = obj
+        elif direction == Direction.SOUTH: node.south_obj = obj
+        elif direction == Direction.WEST: node.west_obj = obj
+        else: node.east_obj = obj
+
+    def _place_edge(self, x: int, y: int, direction: Direction, kind: int):
+        """
+        Sets the kind of object in the edge of the cell (x, y) in the given direction,
+        and in the nodes that share that edge if they are already created
+        """
+        self._grid.set_edge(x, y, direction, kind)
+        if self._rows[y] is not None:
+            self._set_node_obj(self._rows[y][x], x, y, direction, kind)
+
+        if direction == Direction.NORTH: y, x, direction = y + 1, x, Direction.SOUTH
+        elif direction == Direction.SOUTH: y, x, direction = y - 1, x, Direction.NORTH
+        elif direction == Direction.WEST: y, x, direction = y, x - 1, Direction.EAST
+        else: y, x, direction = y, x + 1, Direction.WEST
+        if self._grid.contains_cell(x, y) and self._rows[y] is not None:
+            self._set_node_obj(self._rows[y][x], x, y, direction, kind)
+
+    def _place_segment(self, first: Point, second: Point, kind: int):
+        """
+        Sets the kind of object in all the edges of the segment between two points,
+        the segment should be parallel to X or Y axis.
+        The edges outside of the labyrinth are ignored.
+        """
+        if first.y == second.y:
+            if first.y != math.floor(first.y):
+                return
+            line_y = int(first.y)
+            start_x = math.floor(min(first.x, second.x))
+            end_x = math.ceil(max(first.x, second.x))
+            for x in range(max(start_x, 0), min(end_x, self.MAX_COORD)):
+                if line_y < self.MAX_COORD:
+                    self._place_edge(x, line_y, Direction.SOUTH, kind)
+                elif line_y == self.MAX_COORD:
+                    self._place_edge(x, line_y - 1, Direction.NORTH, kind)
+
+        elif first.x == second.x:
+            if first.x != math.floor(first.x):
+                return
+            line_x = int(first.x)
+            start_y = math.floor(min(first.y, second.y))
+            end_y = math.ceil(max(first.y, second.y))
+            for y in range(max(start_y, 0), min(end_y, self.MAX_COORD)):
+                if line_x < self.MAX_COORD:
+                    self._place_edge(line_x, y, Direction.WEST, kind)
+                elif line_x == self.MAX_COORD:
+                    self._place_edge(line_x - 1, y, Direction.EAST, kind)
+
     def _add_labyrinth_walls_lenght_1(self, walls: 'list[Wall]'):
         """
-        Add the Wall in the list to the cells that contains it
+        Add the Wall in the list to the edges of the cells that contains it
 
         Wall lenght should be 1.
         
-        Labyrinth nodes must be created before and also associated
-        So requires the self._graph_dictionary initialized
-        
         Arguments:
             walls: list[Wall]
                 list with walls to add into the labyrinth
         """
-        
         for wall in walls:
-                #Get the medium point to get a edge point in onle one edge of the rectangle in the node
-                medium_x = (wall.edge1.x + wall.edge2.x)/2
-                medium_y = (wall.edge1.y + wall.edge2.y)/2
-                medium_p = Point(medium_x, medium_y)
-
-                #Get one of the node that contains the door
-                list_node: list[CellNode] = self.get_node_contains(medium_p)
-                #not node contains the wall
-                if not list_node: 
-                    continue
-
-                
-                if(wall.is_parallel_to_X()):
-                    for node in list_node:
-                        if(node.cell.bottom_line.contains_point(medium_p)):
-                            node.south_obj = wall
-                        elif(node.cell.upper_line.contains_point(medium_p)):
-                            node.north_obj = wall
-
-                elif(wall.is_parallel_to_Y()):
-                    for node in list_node:
-                        if(node.cell.left_line.contains_point(medium_p)):
-                            node.west_obj = wall
-                        elif(node.cell.right_line.contains_point(medium_p)):
-                            node.east_obj = wall
+            kind = EdgeGrid.DOOR if isinstance(wall, Door) else EdgeGrid.WALL
+            self._place_segment(wall.edge1, wall.edge2, kind)
                                
     def _add_labyrinth_walls(self, walls: 'list[Wall]'):
-        
-        # We will divid the walls into walls of length 1 and add it to the labyrinth
-        list_new_walls = []
-        for ith_wall in walls:
-            #ith_wall: Wall
-            list_new_walls.extend(ith_wall.divide_wall_into_1_length())
-        
-        self._add_labyrinth_walls_lenght_1(list_new_walls)
+        """
+        Add the walls to the edges of the cells that contains it,
+        each wall is placed as its edges of length 1 without creating a Wall for each one
+        """
+        for wall in walls:
+            self._place_segment(wall.edge1, wall.edge2, EdgeGrid.WALL)
 
     def _add_labyrinth_doors(self, doors: 'list[Door]'):
         self._add_labyrinth_walls_lenght_1(doors)
@@ -397,40 +536,165 @@ class Labyrinth:
 
         # First the walls, because doors should overwrite walls if they have the same cell
         # Second the doors, to overwrite the walls in the same cell
+        self._objects_area = min(max(self._objects_area, self.bounding_area(walls, doors)), self.MAX_COORD)
         self._add_labyrinth_walls(walls)
         self._add_labyrinth_doors(doors)
+        # Write back the modified objects (disk-backed grids)
+        self._grid.flush()
+        # The distances of the landmarks are not valid with the new objects
+        self.landmarks = None
         self._walls.extend(walls)
         self._doors.extend(doors)
 
+    def add_labyrinth_columns(self, wall_x=(), wall_y=(), wall_parallel=(), wall_length=(),
+                              door_x=(), door_y=(), door_parallel=()):
+        """
+        Add walls and doors given as columns, array('i') or NumPy arrays (or lists) of integers:
+        x, y, parallel (1 to Y axis, 0 to X axis) and length of the walls and x, y and parallel of the doors.
+
+        The columns are validated in bulk and the objects are placed directly in the grid,
+        without a Wall or a Door per object (see ObjectColumns).
+
+        raise:
+            ValueError
+                If the columns are not valid (see ObjectColumns)
+        """
+        self.add_object_columns(ObjectColumns(wall_x, wall_y, wall_parallel, wall_length, door_x, door_y, door_parallel))
+
+    def add_object_columns(self, columns: ObjectColumns):
+        """
+        Add the walls and then the doors of the columns (the doors overwrite the walls in the same edge)
+
+        The columns are normalized first (see ObjectColumns.normalized()): the overlapping walls are merged
+        and the edges with doors are not placed as walls, the edges saved are added to saved_edges.
+        """
+        self._objects_area = min(max(self._objects_area, self.bounding_area(columns=columns)), self.MAX_COORD)
+        self._columns.append(columns)
+        columns, saved = columns.normalized()
+        self.saved_edges += saved
+        self._place_columns(EdgeGrid.WALL, columns.wall_x, columns.wall_y, columns.wall_parallel, columns.wall_length)
+        self._place_columns(EdgeGrid.DOOR, columns.door_x, columns.door_y, columns.door_parallel)
+        self._grid.flush()
+        self.landmarks = None
+
+    def _place_columns(self, kind: int, xs: 'array', ys: 'array', parallels: 'array', lengths: 'array' = None):
+        """
+        Sets the kind of object in the edges of the segments of the columns (LONG_DOOR if there are no lengths),
+        with one slice of the grid per segment, the edges outside of the labyrinth are ignored.
+        The nodes already created that share the edges are updated too (see _place_edge()).
+        """
+        grid = self._grid
+        limit = self.MAX_COORD
+        width = grid.width
+        fast = isinstance(grid, EdgeGrid)
+        rows = self._rows
+        nodes = any(row is not None for row in rows)
+        mark = bytes([kind])
+        for x, y, parallel, length in zip(xs, ys, parallels, lengths if lengths is not None else repeat(LONG_DOOR)):
+            if parallel:
+                # Edges of the line X = x in the rows y .. y + length - 1
+                first, last = max(min(y, y + length), 0), min(max(y, y + length), limit)
+                if not 0 <= x <= limit or first >= last:
+                    continue
+                if fast:
+                    start = first * (width + 1) + x
+                    grid.vertical[start:start + (last - first) * (width + 1):width + 1] = mark * (last - first)
+                else:
+                    for row in range(first, last):
+                        grid.set_vertical(x, row, kind)
+                if nodes:
+                    for row in range(first, last):
+                        if rows[row] is not None:
+                            if x < limit: self._set_node_obj(rows[row][x], x, row, Direction.WEST, kind)
+                            if x > 0: self._set_node_obj(rows[row][x - 1], x - 1, row, Direction.EAST, kind)
+            else:
+                # Edges of the line Y = y in the columns x .. x + length - 1
+                first, last = max(min(x, x + length), 0), min(max(x, x + length), limit)
+                if not 0 <= y <= limit or first >= last:
+                    continue
+                if fast:
+                    grid.horizontal[y * width + first:y * width + last] = mark * (last - first)
+                else:
+                    for column in range(first, last):
+                        grid.set_horizontal(column, y, kind)
+                if nodes:
+                    for column in range(first, last):
+                        if y < limit and rows[y] is not None:
+                            self._set_node_obj(rows[y][column], column, y, Direction.SOUTH, kind)
+                        if y > 0 and rows[y - 1] is not None:
+                            self._set_node_obj(rows[y - 1][column], column, y - 1, Direction.NORTH, kind)
+
+    def labyrinth_objs(self) -> 'tuple[list[Wall], list[Door]]':
+        """
+        All the walls and doors of the labyrinth, the ones added as columns are built as objects
+        """
+        walls = list(self._walls)
+        doors = list(self._doors)
+        for columns in self._columns:
+            walls.extend(columns.walls())
+            doors.extend(columns.doors())
+        return walls, doors
+
     def eliminate_labyrinth_objs(self):
         """
         Eleminate all the walls and doors in the labyrinth
+
+        Only the nodes of the region that contains the objects are cleaned.
         """
-        #iterate throuth the keys that are the nodes
-        for node in self._graph_dictionary:
-            #node: CellNode
-            node.north_obj = None
-            node.south_obj = None
-            node.west_obj = None
-            node.east_obj = None
+        self._grid.clear()
+        #iterate throuth the created nodes of the region with objects
+        for row in self._rows[:self._objects_area]:
+            if row is None:
+                continue
+            for node in row[:self._objects_area]:
+                #node: CellNode
+                node.north_obj = None
+                node.south_obj = None
+                node.west_obj = None
+                node.east_obj = None
         self._walls = []
         self._doors = []
+        self._columns = []
+        self.saved_edges = 0
+        self._objects_area = 0
+        self.landmarks = None
 
     def _cost(self, node: CellNode, direction: Direction) -> float:
         """
         Tells the cost of a node to move in the given direction
         """
-        obj = node.get_obj_in_direction(direction)
+        kind = self._grid.get_edge(int(node.cell.bottom_left.x), int(node.cell.bottom_left.y), direction)
 
-        if isinstance(obj, Door): return self.DOOR_COST
-        elif isinstance(obj, Wall): return self.WALL_COST
+        if kind == EdgeGrid.DOOR: return self.DOOR_COST + self.EMPTY_COST
+        elif kind == EdgeGrid.WALL: return self.WALL_COST
         else: return self.EMPTY_COST
 
+    def build_landmarks(self, count: int = 8) -> Landmarks:
+        """
+        Precomputes the landmarks of the working region for the ALT heuristic (see Landmarks),
+        useful when the same labyrinth is searched many times.
+        The landmarks are discarded when the objects or the working region change.
+
+        raise:
+            MemoryError
+                If the grid is disk-backed and the working region doesn't fit in its memory budget
+        """
+        grid = memory_grid(self._grid, self.active_area, "landmarks")
+        self.landmarks = Landmarks(grid, self.active_area, self.DOOR_COST, count, self.EMPTY_COST)
+        return self.landmarks
+
     def _heuristic(self, node: CellNode, goal: CellNode) -> float:
         """
-        Heuristic uses the manhattan distance between the center of nodes
+        Heuristic uses the manhattan distance between the center of nodes,
+        and the landmarks lower bound if there are landmarks (the max of both)
         """
-        return node.manhattan_distance(goal.cell.center)
+        distance = node.manhattan_distance(goal.cell.center)
+        if self.landmarks is not None:
+            bound = self.landmarks.heuristic(int(node.cell.bottom_left.x), int(node.cell.bottom_left.y),
+                                             int(goal.cell.bottom_left.x), int(goal.cell.bottom_left.y))
+            if bound > distance:
+                return bound
+        return distance
         
     def A_STAR_SEARCH(self, start: CellNode, goal: CellNode) -> list[bool, dict, dict]:
         """
@@ -440,6 +704,8 @@ class Labyrinth:
         f(n) = g(n) + h(n)
         g(n) = cost of (n) node is the cost from the (start) node to (n) node.
         h(n) = heuristic cost, is manhattan distance between centers of nodes.
+
+        Only the nodes in the working region (active_area) are used.
         
         Args:
             start: CellNode
@@ -464,16 +730,24 @@ class Labyrinth:
         cost_so_far: dict[CellNode, float] = {}  # g(n): Dictionary will store the cost to the key node 
         came_from[start] = None # The start is reached from none
         cost_so_far[start] = 0  # Initialize the cost, g(start) = 0
+
+        clipped = self.active_area < self.MAX_COORD
+        active_area = self.active_area
+        stats = self.stats
+        stats.reset("astar")
+        stats.pushed = 1
     
         while not frontier.empty():
             current: CellNode = frontier.get() # Get the node with the best f(n) = g(n) + h(n)
+            stats.expanded += 1
             
             if current is goal:
+                stats.stop()
                 return True, came_from, cost_so_far
                 #break
             
             # Obtain the graph of the current node
-            graph_node: GridCellGraph = self._graph_dictionary[current]
+            graph_node: GridCellGraph = self._graph_of(current)
 
 
             # Check the neighbours of the current node
@@ -482,6 +756,10 @@ class Labyrinth:
                 next_node: CellNode = next[0]
                 direction: Direction = next[1]
 
+                # Outside of the working region
+                if clipped and (next_node.cell.bottom_left.x >= active_area or next_node.cell.bottom_left.y >= active_area):
+                    continue
+
                 # Get the cost of this node g(next_node) = g(current) + cost(next_node)
                 new_cost = cost_so_far[current] + self._cost(current, direction)
                 # If the cost is (inf) => the path is unreachable
@@ -491,15 +769,20 @@ class Labyrinth:
 
                 if next_node not in cost_so_far or new_cost < cost_so_far[next_node]:
 
-                    # Set the g(nex_node)
-                    cost_so_far[next_node] = new_cost
-
                     # Set the f(next_node) = g(next_node) + h(next_node)
                     priority = new_cost + self._heuristic(next_node, goal)
+                    # The heuristic (landmarks) knows that the goal can't be reached from next_node
+                    if priority >= float('inf'):
+                        continue
+
+                    # Set the g(nex_node)
+                    cost_so_far[next_node] = new_cost
                     frontier.put(next_node, priority)
+                    stats.pushed += 1
                     came_from[next_node] = current
 
         #The goal is not reachable
+        stats.stop()
         return False, came_from, cost_so_far
 
     def _reconstruct_path(self, came_from: dict, current_node: CellNode) -> 'list[CellNode]':
@@ -525,9 +808,22 @@ class Labyrinth:
         
         return total_path
 
-    def teseo_to_minotaurs(self):
+    def _engine_path(self, engine: str, start: CellNode, goal: CellNode) -> 'Path | None':
+        """
+        Path between two nodes with a search of ENGINES
+        """
+        search = self.ENGINES.get(engine)
+        if search is None:
+            raise ValueError("Error: Unknown search engine " + str(engine))
+        return search(self).search(Path.node_coords(start), Path.node_coords(goal))
+
+    def teseo_to_minotaurs(self, engine: str = None):
         """
         Get the min path from teseo to the minotaurs
+
+        Args:
+            engine: str
+                Search to use, by default the engine of the labyrinth
         
         return:
             list[0]: bool
@@ -545,6 +841,13 @@ class Labyrinth:
 
         if(teseo_node is None or minotaurs_node is None): 
             raise ValueError("Error: Minotaurs must be in the labyrinth coordenates")
+
+        engine = engine or self.engine
+        if engine != "astar":
+            compact_path = self._engine_path(engine, teseo_node, minotaurs_node)
+            if compact_path is None:
+                return False, path, number_of_doors_used
+            return True, compact_path.to_nodes(self), compact_path.doors
          
         list_search = self.A_STAR_SEARCH(teseo_node, minotaurs_node)
          
@@ -561,24 +864,361 @@ class Labyrinth:
 
         return is_possible, path, number_of_doors_used
     
-    def print_path_teseo_to_minotaurs(self):
+    def teseo_to_minotaurs_path(self, engine: str = None) -> 'Path | None':
+        """
+        Get the min path from teseo to the minotaurs as a compact Path
+
+        Same search than teseo_to_minotaurs() but the path is run-length-encoded,
+        see Path, len(path) is the number of cells used and path.doors the number of doors.
+
+        Args:
+            engine: str
+                Search to use, by default the engine of the labyrinth
+
+        return:
+            The Path from teseo to the minotaurs or None if is not possible to reach them
+        """
+        teseo_node: CellNode = self.get_node_contains(self.teseo)[0]
+        minotaurs_node: CellNode = self.get_node_contains(self.minotaurs)[0]
+
+        engine = engine or self.engine
+        if engine != "astar":
+            return self._engine_path(engine, teseo_node, minotaurs_node)
+
+        is_possible, came_from, costs = self.A_STAR_SEARCH(teseo_node, minotaurs_node)
+        if not is_possible:
+            return None
+        number_of_doors_used = int( costs[minotaurs_node]/ self.DOOR_COST )
+        return self._reconstruct_compact_path(came_from, minotaurs_node, number_of_doors_used)
+
+    def _reconstruct_compact_path(self, came_from: dict, current_node: CellNode, doors: int = 0) -> Path:
+        """
+        Same backtracking than _reconstruct_path() but the path is built as a compact Path,
+        without creating the list with all the nodes.
+        """
+        reverse_runs = []
+        current = Path.node_coords(current_node)
+        while came_from.get(current_node):
+            current_node = came_from[current_node]
+            parent = Path.node_coords(current_node)
+            direction = Path._direction_between(parent, current)
+            if reverse_runs and reverse_runs[-1][0] is direction:
+                reverse_runs[-1][1] += 1
+            else:
+                reverse_runs.append([direction, 1])
+            current = parent
+        return Path(current, reverse_runs[::-1], doors)
+
+    def _path_cost(self, path: Path) -> float:
+        """
+        Cost of moving along the path (doors * DOOR_COST + cells moved)
+        """
+        cost = 0
+        cells = iter(path)
+        previous = next(cells)
+        for current in cells:
+            kind = self._grid.get_edge(previous[0], previous[1], Path._direction_between(previous, current))
+            cost += self.DOOR_COST + self.EMPTY_COST if kind == EdgeGrid.DOOR else self.EMPTY_COST
+            previous = current
+        return cost
+
+    def BOUNDED_SEARCH(self, start: CellNode, goal: CellNode, epsilon: float, max_expansions: int = None,
+                       time_budget: float = None, first_solution: bool = False):
+        """
+        Anytime weighted A* (bounded-suboptimal search) from start to goal.
+
+        The frontier is ordered by f'(n) = g(n) + (1 + epsilon) * h(n), so the first path found
+        costs at most (1 + epsilon) times the optimal cost. After the first path the search goes on
+        to improve it: the nodes with g(n) + h(n) >= cost of the best path are pruned and the
+        nodes reached with a lower cost are opened again, when the frontier is empty the best path is optimal.
+
+        The search is a generator, it yields a BoundedResult each time the budget (max_expansions
+        nodes expanded or time_budget seconds) runs out, and the search continues with a new
+        budget when the next result is requested. The last result has finished = True.
+
+        The cost is the one of the search, doors * DOOR_COST + cells moved, so with epsilon > 0
+        a path can have more doors than the optimal one if the bound allows it.
+
+        Args:
+            start: CellNode
+                Start node of the path
+            goal: CellNode
+                Goal node to reach from the start node
+            epsilon: float
+                Weight of the heuristic is 1 + epsilon, 0 is the A* search
+            max_expansions: int
+                Nodes expanded before yielding the best path found, None for no limit
+            time_budget: float
+                Seconds before yielding the best path found, None for no limit
+            first_solution: bool
+                Ends the search with the first path found (weighted A*)
+        """
+        if epsilon < 0:
+            raise ValueError("Error: epsilon must be positive")
+        weight = 1.0 + epsilon
+        infinite = float('inf')
+
+        frontier = PriorityQueue()
+        frontier.put(start, 0)
+        came_from: dict[CellNode, CellNode] = {start: None}
+        cost_so_far: dict[CellNode, float] = {start: 0}
+        # Nodes in the frontier not expanded since their cost was improved
+        opened: set[CellNode] = {start}
+        best: Path = None
+        best_cost = infinite
+
+        clipped = self.active_area < self.MAX_COORD
+        active_area = self.active_area
+        stats = self.stats
+        stats.reset("anytime" if not first_solution else "weighted")
+        stats.pushed = 1
+        budget_expansions = stats.expanded + max_expansions if max_expansions is not None else None
+        deadline = time.perf_counter() + time_budget if time_budget is not None else None
+
+        while not frontier.empty():
+            current: CellNode = frontier.get()
+            if current not in opened:
+                # Old entry of a node already expanded with its last cost
+                continue
+            opened.discard(current)
+            current_cost = cost_so_far[current]
+            if current_cost + self._heuristic(current, goal) >= best_cost:
+                continue
+            stats.expanded += 1
+
+            if current is goal:
+                best = self._reconstruct_compact_path(came_from, goal)
+                best_cost = self._path_cost(best)
+                best.doors = int(best_cost // self.DOOR_COST)
+                if first_solution:
+                    break
+                continue
+
+            for next_node, direction in self._graph_of(current).get_neighbours():
+                if clipped and (next_node.cell.bottom_left.x >= active_area or next_node.cell.bottom_left.y >= active_area):
+                    continue
+                new_cost = current_cost + self._cost(current, direction)
+                if new_cost >= infinite:
+                    continue
+                if next_node not in cost_so_far or new_cost < cost_so_far[next_node]:
+                    heuristic = self._heuristic(next_node, goal)
+                    # Can't improve the best path (or can't reach the goal)
+                    if new_cost + heuristic >= best_cost:
+                        continue
+                    cost_so_far[next_node] = new_cost
+                    came_from[next_node] = current
+                    opened.add(next_node)
+                    frontier.put(next_node, new_cost + weight * heuristic)
+                    stats.pushed += 1
+
+            if ((budget_expansions is not None and stats.expanded >= budget_expansions) or
+                    (deadline is not None and time.perf_counter() >= deadline)):
+                stats.stop()
+                yield self._bounded_result(best, best_cost, goal, opened, cost_so_far, False)
+                budget_expansions = stats.expanded + max_expansions if max_expansions is not None else None
+                deadline = time.perf_counter() + time_budget if time_budget is not None else None
+
+        stats.stop()
+        yield self._bounded_result(best, best_cost, goal, opened, cost_so_far, True)
+
+    def _bounded_result(self, best: Path, best_cost: float, goal: CellNode, opened: 'set[CellNode]',
+                        cost_so_far: dict, finished: bool) -> BoundedResult:
+        """
+        Result of BOUNDED_SEARCH(), the lower bound of the optimal cost is the lowest
+        g(n) + h(n) of the frontier (or the best cost if it is lower)
+        """
+        lower_bound = best_cost
+        for node in opened:
+            estimate = cost_so_far[node] + self._heuristic(node, goal)
+            if estimate < lower_bound:
+                lower_bound = estimate
+        if best is None:
+            # No path, it is proved that there is no one if the frontier is empty
+            bound = 1.0 if lower_bound == float('inf') else float('inf')
+        elif lower_bound >= best_cost:
+            bound = 1.0
+        else:
+            bound = best_cost / lower_bound if lower_bound > 0 else float('inf')
+        return BoundedResult(best, best_cost, bound, finished, self.stats.expanded)
+
+    def teseo_to_minotaurs_weighted(self, epsilon: float = 0.5) -> BoundedResult:
+        """
+        Get a path from teseo to the minotaurs with a cost at most (1 + epsilon) times the optimal,
+        with the weighted A* search (see BOUNDED_SEARCH()), faster than the optimal search in big labyrinths.
+
+        return:
+            BoundedResult with the path and its achieved suboptimality bound (<= 1 + epsilon)
+        """
+        teseo_node: CellNode = self.get_node_contains(self.teseo)[0]
+        minotaurs_node: CellNode = self.get_node_contains(self.minotaurs)[0]
+        if(teseo_node is None or minotaurs_node is None):
+            raise ValueError("Error: Minotaurs must be in the labyrinth coordenates")
+        return next(self.BOUNDED_SEARCH(teseo_node, minotaurs_node, epsilon, first_solution=True))
+
+    def teseo_to_minotaurs_anytime(self, epsilon: float = 1.0, max_expansions: int = None,
+                                   time_budget: float = None):
+        """
+        Anytime search from teseo to the minotaurs (see BOUNDED_SEARCH()), a generator with the
+        best path found each time the budget runs out, each result is better or equal than the previous one.
+        Ex: the first result is the answer within a deadline,
+
+            result = next(labyrinth.teseo_to_minotaurs_anytime(time_budget=0.05))
+
+        and the generator keeps improving it until the last result (finished, the optimal path).
+
+        Args:
+            epsilon: float
+                The first path found costs at most (1 + epsilon) times the optimal
+            max_expansions: int
+                Nodes expanded by each step of the search, None for no limit
+            time_budget: float
+                Seconds of each step of the search, None for no limit
+        """
+        if epsilon < 0:
+            raise ValueError("Error: epsilon must be positive")
+        teseo_node: CellNode = self.get_node_contains(self.teseo)[0]
+        minotaurs_node: CellNode = self.get_node_contains(self.minotaurs)[0]
+        if(teseo_node is None or minotaurs_node is None):
+            raise ValueError("Error: Minotaurs must be in the labyrinth coordenates")
+        return self.BOUNDED_SEARCH(teseo_node, minotaurs_node, epsilon, max_expansions, time_budget)
+
+    def MULTI_GOAL_SEARCH(self, start: CellNode, goals: 'list[CellNode]', all_goals: bool = False) -> 'list[dict, dict, dict]':
+        """
+        A* search from the start to the nearest of various goals (or to all of them)
+
+        The heuristic is the min of the heuristic to the goals not reached yet, when a goal is reached
+        and there are more goals to reach, the priorities of the frontier are updated with the new heuristic.
+        A goal is reached when it is taken from the frontier, so it has its min cost.
+
+        Args:
+            start: CellNode
+                Start node of the paths
+            goals: list[CellNode]
+                Goal nodes
+            all_goals: bool
+                Search until all the goals are reached (or can't be reached), if not the search
+                stops in the first goal reached (the nearest)
+        Return:
+            A list
+            list[0]: dict
+                Dictionary came_from of the search
+            list[1]: dict
+                Dictionary cost_so_far of the search
+            list[2]: dict
+                The goals reached {goal node: cost}, in the order they were reached
+        """
+        remaining = list(dict.fromkeys(goals, None))
+        reached: dict[CellNode, float] = {}
+
+        def heuristic(node: CellNode) -> float:
+            return min(self._heuristic(node, goal) for goal in remaining)
+
+        frontier = PriorityQueue()
+        frontier.put(start, 0)
+        came_from: dict[CellNode, CellNode] = {start: None}
+        cost_so_far: dict[CellNode, float] = {start: 0}
+
+        clipped = self.active_area < self.MAX_COORD
+        active_area = self.active_area
+        stats = self.stats
+        stats.reset("multigoal")
+        stats.pushed = 1
+
+        while not frontier.empty():
+            current: CellNode = frontier.get()
+            stats.expanded += 1
+
+            if current not in reached and any(current is goal for goal in remaining):
+                reached[current] = cost_so_far[current]
+                remaining = [goal for goal in remaining if goal is not current]
+                if not remaining or not all_goals:
+                    break
+                # The heuristic of the rest of the goals is higher, update the priorities
+                frontier.elements = [(cost_so_far[node] + heuristic(node), node) for _, node in frontier.elements]
+                heapq.heapify(frontier.elements)
+
+            for next_node, direction in self._graph_of(current).get_neighbours():
+                if clipped and (next_node.cell.bottom_left.x >= active_area or next_node.cell.bottom_left.y >= active_area):
+                    continue
+                new_cost = cost_so_far[current] + self._cost(current, direction)
+                if new_cost >= float('inf'):
+                    continue
+                if next_node not in cost_so_far or new_cost < cost_so_far[next_node]:
+                    priority = new_cost + heuristic(next_node)
+                    if priority >= float('inf'):
+                        continue
+                    cost_so_far[next_node] = new_cost
+                    frontier.put(next_node, priority)
+                    stats.pushed += 1
+                    came_from[next_node] = current
+
+        stats.stop()
+        return came_from, cost_so_far, reached
+
+    def teseo_to_nearest(self, targets: 'list[Point]', all_costs: bool = False):
+        """
+        Get the min path from teseo to the nearest of various targets (minotaurs, exits...) in one search
+
+        Args:
+            targets: list[Point]
+                Positions of the targets
+            all_costs: bool
+                Also get the doors and cells of the min path to each target (the search
+                continues until all the targets are reached)
+
+        return:
+            list[0]: int | None
+                Index of the nearest target (min doors and then min cells), None if no target can be reached
+            list[1]: Path | None
+                The min path from teseo to the nearest target
+            list[2]: list[tuple[int, int] | None] | None
+                If all_costs, the (doors, cells) of the min path to each target, None for the targets
+                that can't be reached
+        """
+        teseo_node: CellNode = self.get_node_contains(self.teseo)[0]
+        target_nodes: 'list[CellNode]' = []
+        for target in targets:
+            nodes = self.get_node_contains(target)
+            if not nodes or nodes[0] is None:
+                raise ValueError("Error: Targets must be in the labyrinth coordenates")
+            target_nodes.append(nodes[0])
+        if not target_nodes:
+            return None, None, [] if all_costs else None
+
+        came_from, _, reached = self.MULTI_GOAL_SEARCH(teseo_node, target_nodes, all_costs)
+
+        nearest, path = None, None
+        if reached:
+            nearest_node, cost = next(iter(reached.items()))
+            nearest = next(index for index, node in enumerate(target_nodes) if node is nearest_node)
+            path = self._reconstruct_compact_path(came_from, nearest_node, int(cost // self.DOOR_COST))
+        costs = None
+        if all_costs:
+            costs = []
+            for node in target_nodes:
+                cost = reached.get(node)
+                costs.append(None if cost is None else (int(cost // self.DOOR_COST), int(cost % self.DOOR_COST) // self.EMPTY_COST + 1))
+        return nearest, path, costs
+
+    def print_path_teseo_to_minotaurs(self, writer: ResultWriter = None):
         """
         Print basic information from the resolution of reach the minotaurs
+
+        Args:
+            writer: ResultWriter
+                Writer where the result is written, if it is not provided
+                the result is written in the standard output in "text" format
         """
         result = self.teseo_to_minotaurs()
         is_possible = result[0]
         number_of_doors_used = result[2]
         path = result[1]
 
-        print("---------------------------------------")
-        print("Is possible to resolve?:", is_possible)
-        print("Number of doors used:", number_of_doors_used)
-        print("Number of cells used:", len(path))
-        print("---------------------------------------")
-        print("\nPath:")
-        if is_possible:
-            for i in path:
-                print(i)
+        if writer is None:
+            with ResultWriter() as writer:
+                writer.write_result(is_possible, path, number_of_doors_used)
+        else:
+            writer.write_result(is_possible, path, number_of_doors_used)
             
 
     def _get_labyrinth_matrix_no_info(self, list_nodes:'list[CellNode]' =[]) -> 'list[list[str]]':
@@ -590,112 +1230,51 @@ class Labyrinth:
         Minotaurs is represented as M
         Provided nodes are represented as #
         """
-        result = []
-        reverse = self._labyrinth_nodes[::-1]
-        for i in reverse:
-            sub = []
-            j: CellNode
-
-            for j in i:
-                j: CellNode
-                #check middle
-                if j.contains(self.teseo) and j.contains(self.minotaurs):
-                    middle = "[T/M]"
-                elif j.contains(self.teseo):
-                    middle = "[T]"
-                elif j.contains(self.minotaurs):
-                    middle = "[M]"
-                elif j in list_nodes:
-                    middle = "[#]"
-                else: 
-                    middle = "[ ]"
-
-                sub.append(middle)
-            result.append(sub)
-        return result
+        return list(render_cells(self, list_nodes))
 
     def _get_labyrinth_matrix_info(self, list_nodes:'list[CellNode]' =[]) -> 'list[list[str]]':
         """
         Return a basic matrix with the labyrinth representated
         
-        No doors or walls are represented.
-        Teseo is represented as T
-        Minotaurs is represented as M
+        Walls are represented.
         Provided nodes are represented as #
         """
-        result = []
-        reverse = self._labyrinth_nodes[::-1]
-        for i in reverse:
-            sub = []
-            j: CellNode
-
-            for j in i:
-                j: CellNode
-                #check middle
-                middle:str =" "
-                left:str= " "
-                right:str= " "
-
-                if j in list_nodes: 
-                    sub.append("[ # ]")
-                    continue
+        return list(render_cells(self, list_nodes, use_info=True))
 
-                if isinstance(j.north_obj, Wall) and not(isinstance(j.north_obj, Door)):
-                    if isinstance(j.south_obj, Wall) and not(isinstance(j.south_obj, Door)):
-                        middle = "="
-                    else:
-                        middle = "\u203E"
-                elif isinstance(j.south_obj, Wall) and not(isinstance(j.south_obj, Door)):
-                    middle = "_"
-                
-                if isinstance(j.west_obj, Wall) and not(isinstance(j.west_obj, Door)):
-                    left = "|"
-                if isinstance(j.east_obj, Wall) and not(isinstance(j.east_obj, Door)):
-                    right = "|"
+    def iter_rows(self, path=None, viewport: 'tuple[int, int, int, int]' = None, use_info: bool = False):
+        """
+        Generator with the rows of the labyrinth (top to bottom) as strings
 
-                sub.append("["+left + middle + right+"]")
-            result.append(sub)
-        return result
+        Args:
+            path: list[CellNode] | Path
+                Nodes of the path to represent
+            viewport: tuple[int, int, int, int]
+                (x, y, width, height) region of cells to represent, by default all the labyrinth
+            use_info: bool
+                Represent the walls of the cells
+        """
+        return render_rows(self, path, viewport, use_info)
     
-    def _print_labyrith(self, list_nodes:'list[CellNode]' =[], use_info:bool= False):
+    def _print_labyrith(self, list_nodes:'list[CellNode]' =[], use_info:bool= False, viewport: 'tuple[int, int, int, int]' = None):
         """
         Prints in the standar output the labyrinth
-        Usefull for small labyrinths
-        """
-        if use_info:
-            martix = self._get_labyrinth_matrix_info(list_nodes)
-            for list in martix:
-                for i in list:
-                    print(i, end="")
-                print()
-        else:
-            martix = self._get_labyrinth_matrix_no_info(list_nodes)
-            for list in martix:
-                for i in list:
-                    print(i, end="")
-                print()
-        
-
-    def print_solution(self, use_info:bool = False):
-        """Print in the standard output a graphic basic resolution of the labyrinth"""
-
-        
-        if use_info: 
-            print("\nLabyrinth:")  
-            self._print_labyrith(use_info=True)
-
-            print("\nSolution:")
-            self._print_labyrith(self.teseo_to_minotaurs()[1], use_info=True)
-        else:
-            print("\nLabyrinth:")  
-            self._print_labyrith()
+        Usefull for small labyrinths or small viewports of big labyrinths
+        """
+        for row in self.iter_rows(list_nodes, viewport, use_info):
+            sys.stdout.write(row + "\n")
 
-            print("\nSolution:")
-            self._print_labyrith(self.teseo_to_minotaurs()[1])
-           
+    def print_solution(self, use_info:bool = False, viewport: 'tuple[int, int, int, int]' = None):
+        """
+        Print in the standard output a graphic basic resolution of the labyrinth
 
-        
+        Args:
+            use_info: bool
+                Represent the walls of the cells
+            viewport: tuple[int, int, int, int]
+                (x, y, width, height) region of cells to print, by default all the labyrinth
+        """
+        print("\nLabyrinth:")  
+        self._print_labyrith(use_info=use_info, viewport=viewport)
 
-                
-         
-        
+        print("\nSolution:")
+        self._print_labyrith(self.teseo_to_minotaurs_path(), use_info=use_info, viewport=viewport)
@@ -0,0 +1,139 @@
+## Solving of many small labyrinths at once with stacked NumPy arrays
+from .grid import EdgeGrid
+from .path import Path
+from .Labyrinth import Labyrinth
+from .bitset import BitsetWavefront
+from .vectorized import numpy, passable_arrays, shift
+
+
+def _spread(cells: 'np.ndarray', passable: 'tuple[np.ndarray, ...]') -> 'np.ndarray':
+    north, south, west, east = shift(cells, passable)
+    return north | south | west | east
+
+
+def _stack(prepared: list, size: int) -> 'tuple':
+    """
+    Arrays (B, size, size) of the edges of the labyrinths of a batch, padded with walls
+    """
+    np = numpy()
+    batch = len(prepared)
+    empty = [np.zeros((batch, size, size), dtype=bool) for _ in range(4)]
+    doors = [np.zeros((batch, size, size), dtype=bool) for _ in range(4)]
+    for index, (area, empty_edges, door_edges, _, _) in enumerate(prepared):
+        for stacked, edges in zip(empty + doors, empty_edges + door_edges):
+            stacked[index, :area, :area] = edges
+    starts = np.array([item[3] for item in prepared], dtype=np.intp).reshape(batch, 2)
+    goals = np.array([item[4] for item in prepared], dtype=np.intp).reshape(batch, 2)
+    return tuple(empty), tuple(doors), starts, goals
+
+
+def _solve_stack(empty: tuple, doors: tuple, starts: 'np.ndarray', goals: 'np.ndarray') -> 'tuple[np.ndarray, np.ndarray]':
+    """
+    One wavefront search (see NumpyWavefront) for all the labyrinths of the stack,
+    a labyrinth stops (its cells are masked out) when its goal is reached
+
+    return:
+        doors and cells of each labyrinth, -1 doors if the goal can't be reached
+    """
+    np = numpy()
+    batch, size = empty[0].shape[0], empty[0].shape[1]
+    labyrinths = np.arange(batch)
+    result_doors = np.full(batch, -1, dtype=np.int64)
+    result_cells = np.zeros(batch, dtype=np.int64)
+    active = np.ones(batch, dtype=bool)
+    unvisited = np.ones((batch, size, size), dtype=bool)
+
+    first = np.zeros((batch, size, size), dtype=bool)
+    first[labyrinths, starts[:, 1], starts[:, 0]] = True
+    level = 0
+    seeds = {0: first}
+    while seeds and active.any():
+        door_seeds = {}
+        frontier = None
+        moves = 0
+        while frontier is not None or seeds:
+            if frontier is None:
+                moves = min(seeds)
+                wavefront = np.zeros((batch, size, size), dtype=bool)
+            else:
+                wavefront = _spread(frontier, empty)
+            if moves in seeds:
+                wavefront |= seeds.pop(moves)
+            wavefront &= unvisited
+            wavefront &= active[:, None, None]
+            if not wavefront.any():
+                frontier = None
+                continue
+            unvisited &= ~wavefront
+
+            reached = wavefront[labyrinths, goals[:, 1], goals[:, 0]]
+            if reached.any():
+                result_doors[reached] = level
+                result_cells[reached] = moves + 1
+                active &= ~reached
+                wavefront &= active[:, None, None]
+
+            through_doors = _spread(wavefront, doors) & unvisited
+            if through_doors.any():
+                if moves + 1 in door_seeds:
+                    door_seeds[moves + 1] |= through_doors
+                else:
+                    door_seeds[moves + 1] = through_doors
+            frontier = wavefront if wavefront.any() else None
+            moves += 1
+        seeds = door_seeds
+        level += 1
+    return result_doors, result_cells
+
+
+def solve_batch(records: 'list[LabyrinthRecord]', labyrinth: Labyrinth = None, granularity: int = 8,
+                max_batch: int = 256) -> 'list[tuple[bool, int, int]]':
+    """
+    Solves many labyrinths with one vectorised wavefront per batch of labyrinths of similar size.
+
+    Each record is placed (auto sized, see Labyrinth.fit_to_objects()) in the labyrinth and its
+    edges are copied as boolean arrays. The records are grouped by their size rounded up to
+    granularity cells, so the padding of each batch is small, and the arrays of each group are
+    stacked in (B, size, size) blocks of at most max_batch labyrinths.
+
+    Without NumPy the records are solved one by one with BitsetWavefront.
+
+    Args:
+        records: list[LabyrinthRecord]
+            Labyrinths to solve
+        labyrinth: Labyrinth
+            Labyrinth used to place the objects of the records, a new one by default
+        granularity: int
+            The sizes of the batches are multiples of granularity
+        max_batch: int
+            Max labyrinths in a batch
+
+    return:
+        (is_possible, doors, cells) of each record, in the order of the records
+    """
+    if labyrinth is None:
+        labyrinth = Labyrinth(walls=[], doors=[], max_area=2)
+    vectorised = numpy() is not None
+    results: list = [None] * len(records)
+    groups: dict[int, list] = {}
+    for index, record in enumerate(records):
+        record.apply(labyrinth, auto_size=True)
+        start = Path.node_coords(labyrinth.get_node_contains(labyrinth.teseo)[0])
+        goal = Path.node_coords(labyrinth.get_node_contains(labyrinth.minotaurs)[0])
+        if not vectorised:
+            path = BitsetWavefront(labyrinth).search(start, goal)
+            results[index] = (True, path.doors, len(path)) if path is not None else (False, 0, 0)
+            continue
+        area = labyrinth.active_area
+        prepared = (area, passable_arrays(labyrinth.edge_grid, area, EdgeGrid.EMPTY),
+                    passable_arrays(labyrinth.edge_grid, area, EdgeGrid.DOOR), start, goal)
+        size = -(-area // granularity) * granularity
+        groups.setdefault(size, []).append((index, prepared))
+
+    for size, group in groups.items():
+        for first in range(0, len(group), max_batch):
+            batch = group[first:first + max_batch]
+            result_doors, result_cells = _solve_stack(*_stack([prepared for _, prepared in batch], size))
+            for (index, _), doors, cells in zip(batch, result_doors.tolist(), result_cells.tolist()):
+                results[index] = (True, doors, cells) if doors >= 0 else (False, 0, 0)
+    return results
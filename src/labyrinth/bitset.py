@@ -0,0 +1,163 @@
+## Bit-parallel wavefront search with one integer bitset per row of the labyrinth
+from .graphs import Direction
+from .grid import EdgeGrid, memory_grid
+from .path import Path
+
+# Kinds of the edges to the characters of the bits ("1" if the edge can be passed)
+_EMPTY_BITS = bytes.maketrans(bytes([EdgeGrid.EMPTY, EdgeGrid.DOOR, EdgeGrid.WALL]), b"100")
+_DOOR_BITS = bytes.maketrans(bytes([EdgeGrid.EMPTY, EdgeGrid.DOOR, EdgeGrid.WALL]), b"010")
+
+_STEPS = {Direction.NORTH: (0, 1), Direction.SOUTH: (0, -1), Direction.WEST: (-1, 0), Direction.EAST: (1, 0)}
+
+
+def _row_bits(edges: bytes, table: bytes) -> int:
+    """
+    Integer with the bit x set if the edge x can be passed (table _EMPTY_BITS or _DOOR_BITS)
+    """
+    return int(edges.translate(table)[::-1] or b"0", 2)
+
+
+class BitsetWavefront:
+    """
+    Search engine that expands whole wavefronts with the big integers of Python,
+    each row of cells is an integer with the bit x for the cell (x, y).
+
+    The edges of each row are bitsets too (built from the grid with the walls and doors):
+        east[y]: bit x if the edge between (x, y) and (x+1, y) is empty (west is the same edge)
+        north[y]: bit x if the edge between (x, y) and (x, y+1) is empty (south of the row y+1)
+    and east_doors[y], north_doors[y] for the doors.
+
+    The wavefront of the cells reached with d doors and m moves is moved one cell with
+    shifts, ands and ors of each row (the cells not visited yet):
+        ((row & east) << 1) | ((row >> 1) & east)  in the same row, row & north to the next row, ...
+    The cells reached through the doors are the seeds of the wavefronts with d+1 doors,
+    so the first wavefront with the goal has the min doors and then the min cells.
+    The path is recovered going back through the wavefronts.
+
+    The edges are read from an in-memory grid, a disk-backed grid (TiledEdgeGrid) is copied
+    tile by tile if the working region fits in its memory budget (see grid.memory_grid()).
+
+    Atributtes:
+        area: int
+            The search only uses the cells with both coordenates lower than area
+        stats: SearchStats
+            Statistics of the search (the expanded nodes are the cells reached, there is no heap)
+    """
+
+    def __init__(self, labyrinth):
+        grid = memory_grid(labyrinth.edge_grid, labyrinth.active_area, "bitset")
+        self._grid = grid
+        area = self.area = labyrinth.active_area
+        self.stats = labyrinth.stats
+        width = grid.width
+
+        self._east, self._east_doors = [], []
+        self._north, self._north_doors = [], []
+        for y in range(area):
+            # Inner vertical edges of the row (lines X = 1 .. area-1)
+            edges = bytes(grid.vertical[y * (width + 1) + 1:y * (width + 1) + area])
+            self._east.append(_row_bits(edges, _EMPTY_BITS))
+            self._east_doors.append(_row_bits(edges, _DOOR_BITS))
+            # Horizontal edges in the line Y = y+1 (none over the last row of the area)
+            edges = bytes(grid.horizontal[(y + 1) * width:(y + 1) * width + area]) if y + 1 < area else b""
+            self._north.append(_row_bits(edges, _EMPTY_BITS))
+            self._north_doors.append(_row_bits(edges, _DOOR_BITS))
+
+    def _spread(self, frontier: 'dict[int, int]', east: 'list[int]', north: 'list[int]') -> 'dict[int, int]':
+        """
+        Cells next to the cells of the frontier (rows {y: bits}) through the edges of the bitsets
+        """
+        spread: dict[int, int] = {}
+        last = self.area - 1
+        for y, row in frontier.items():
+            side = east[y]
+            bits = ((row & side) << 1) | ((row >> 1) & side)
+            if bits:
+                spread[y] = spread.get(y, 0) | bits
+            if y < last:
+                bits = row & north[y]
+                if bits:
+                    spread[y + 1] = spread.get(y + 1, 0) | bits
+            if y > 0:
+                bits = row & north[y - 1]
+                if bits:
+                    spread[y - 1] = spread.get(y - 1, 0) | bits
+        return spread
+
+    def search(self, start: 'tuple[int, int]', goal: 'tuple[int, int]') -> 'Path | None':
+        """
+        Min path (doors first and then cells) from the start cell to the goal cell
+
+        return:
+            The Path or None if the goal can't be reached
+        """
+        stats = self.stats
+        stats.reset("bitset")
+        goal_x, goal_y = goal
+        unvisited = [(1 << self.area) - 1] * self.area
+        # Wavefront of each (doors, moves)
+        history: dict[tuple[int, int], dict[int, int]] = {}
+
+        doors = 0
+        seeds: dict[int, dict[int, int]] = {0: {start[1]: 1 << start[0]}}
+        while seeds:
+            door_seeds: dict[int, dict[int, int]] = {}
+            frontier: dict[int, int] = {}
+            moves = 0
+            while frontier or seeds:
+                if not frontier:
+                    moves = min(seeds)
+                wavefront = self._spread(frontier, self._east, self._north)
+                for y, bits in seeds.pop(moves, {}).items():
+                    wavefront[y] = wavefront.get(y, 0) | bits
+                frontier = {}
+                for y, bits in wavefront.items():
+                    bits &= unvisited[y]
+                    if bits:
+                        unvisited[y] ^= bits
+                        frontier[y] = bits
+                        stats.expanded += bits.bit_count()
+                if not frontier:
+                    continue
+                history[(doors, moves)] = frontier
+
+                if (frontier.get(goal_y, 0) >> goal_x) & 1:
+                    stats.stop()
+                    return self._reconstruct(history, start, goal, doors, moves)
+
+                through_doors = self._spread(frontier, self._east_doors, self._north_doors)
+                if through_doors:
+                    next_seeds = door_seeds.setdefault(moves + 1, {})
+                    for y, bits in through_doors.items():
+                        next_seeds[y] = next_seeds.get(y, 0) | bits
+                moves += 1
+            seeds = door_seeds
+            doors += 1
+
+        stats.stop()
+        return None
+
+    def _reconstruct(self, history: dict, start: 'tuple[int, int]', goal: 'tuple[int, int]',
+                     doors: int, moves: int) -> Path:
+        """
+        Path going back from the goal through the wavefronts, each cell has a neighbour
+        in the wavefront of one move less (through an empty edge, or through a door with one door less)
+        """
+        x, y = goal
+        reverse_runs = []
+        level = doors
+        for step in range(moves, 0, -1):
+            for direction, (delta_x, delta_y) in _STEPS.items():
+                previous_x = x - delta_x
+                previous_y = y - delta_y
+                if not (0 <= previous_x < self.area and 0 <= previous_y < self.area):
+                    continue
+                kind = self._grid.get_edge(previous_x, previous_y, direction)
+                previous_level = level - 1 if kind == EdgeGrid.DOOR else level
+                if kind == EdgeGrid.WALL or previous_level < 0:
+                    continue
+                if (history.get((previous_level, step - 1), {}).get(previous_y, 0) >> previous_x) & 1:
+                    break
+            reverse_runs.append((direction, 1))
+            x, y, level = previous_x, previous_y, previous_level
+        return Path(start, reverse_runs[::-1], doors)
@@ -0,0 +1,51 @@
+## Results of the bounded-suboptimal (weighted and anytime) searches
+from .path import Path
+
+
+class BoundedResult:
+    """
+    Best path found by a bounded-suboptimal search and how far it can be from the optimal one.
+
+    The cost is the cost of the search (doors * DOOR_COST + cells moved), the bound is the
+    achieved suboptimality: cost <= bound * optimal cost. It is the cost divided by the
+    lowest f(n) = g(n) + h(n) of the frontier, a lower bound of the optimal cost.
+
+    Atributtes:
+        path: Path | None
+            Best path found, None if no path is found yet (or the minotaurs can't be reached)
+        cost: float
+            Cost of the path, inf without path
+        bound: float
+            Achieved suboptimality bound, 1.0 if the path is optimal, inf if there is no path yet
+        finished: bool
+            If the search has ended (the path is the final one of the search)
+        expanded: int
+            Nodes expanded by the search so far
+    """
+
+    def __init__(self, path: 'Path | None', cost: float, bound: float, finished: bool, expanded: int):
+        self.path = path
+        self.cost = cost
+        self.bound = bound
+        self.finished = finished
+        self.expanded = expanded
+
+    @property
+    def is_possible(self) -> bool:
+        return self.path is not None
+
+    @property
+    def doors(self) -> int:
+        return self.path.doors if self.path is not None else 0
+
+    @property
+    def cells(self) -> int:
+        return len(self.path) if self.path is not None else 0
+
+    @property
+    def optimal(self) -> bool:
+        return self.bound == 1.0
+
+    def __repr__(self) -> str:
+        return "".join(["BoundedResult(doors=", str(self.doors), ", cells=", str(self.cells),
+                        ", bound=", "%.4f" % self.bound, ", finished=", str(self.finished), ")"])
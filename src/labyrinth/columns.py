@@ -0,0 +1,175 @@
+## Walls and doors of a labyrinth as columns of integers (bulk ingestion without objects)
+from .labyrinth_objects import Wall, Door
+from .two_dimension import Point
+from array import array
+from bisect import bisect_left
+
+LONG_DOOR = 1
+
+
+def _column(values, name: str) -> 'array':
+    """
+    Column of int32 from an array('i'), a NumPy array or any iterable of integers
+    """
+    if isinstance(values, array) and values.typecode == 'i':
+        return values
+    if hasattr(values, "tolist"):
+        values = values.tolist()
+    try:
+        return array('i', values)
+    except (TypeError, OverflowError):
+        raise ValueError("Error: the column " + name + " should have 32 bits integers")
+
+
+class ObjectColumns:
+    """
+    Walls and doors as columns of integers, validated in bulk, so they can be placed
+    in the grid of a labyrinth without a Wall or a Door (two Points and a FiniteLine) per object.
+
+    Same fields than the lines of the input (see records.create_wall() and records.create_door()),
+    parallel is 1 (any non zero) if the object is parallel to Y axis and 0 if it is parallel to X axis,
+    the length of the doors is always LONG_DOOR (a wall with a negative length ends before its start point).
+
+    Atributtes:
+        wall_x, wall_y, wall_parallel, wall_length: array('i')
+            Columns of the walls (start point, orientation and length)
+        door_x, door_y, door_parallel: array('i')
+            Columns of the doors (start point and orientation)
+    """
+
+    def __init__(self, wall_x=(), wall_y=(), wall_parallel=(), wall_length=(),
+                 door_x=(), door_y=(), door_parallel=()):
+        """
+        raise:
+            ValueError
+                If the columns of the walls or of the doors don't have the same length
+                or the values are not integers
+        """
+        self.wall_x = _column(wall_x, "wall_x")
+        self.wall_y = _column(wall_y, "wall_y")
+        self.wall_parallel = _column(wall_parallel, "wall_parallel")
+        self.wall_length = _column(wall_length, "wall_length")
+        self.door_x = _column(door_x, "door_x")
+        self.door_y = _column(door_y, "door_y")
+        self.door_parallel = _column(door_parallel, "door_parallel")
+
+        if not (len(self.wall_x) == len(self.wall_y) == len(self.wall_parallel) == len(self.wall_length)):
+            raise ValueError("Error: the columns of the walls should have the same length")
+        if not (len(self.door_x) == len(self.door_y) == len(self.door_parallel)):
+            raise ValueError("Error: the columns of the doors should have the same length")
+
+    @classmethod
+    def from_objects(cls, walls: 'list[Wall]' = (), doors: 'list[Door]' = ()) -> 'ObjectColumns':
+        """
+        Columns of Wall and Door objects (parallel to X or Y axis, integer coordinates)
+        """
+        columns = cls()
+        for wall in walls:
+            parallel = wall.edge1.x == wall.edge2.x
+            columns.wall_x.append(int(wall.edge1.x))
+            columns.wall_y.append(int(wall.edge1.y))
+            columns.wall_parallel.append(int(parallel))
+            columns.wall_length.append(int(wall.edge2.y - wall.edge1.y if parallel else wall.edge2.x - wall.edge1.x))
+        for door in doors:
+            columns.door_x.append(int(door.edge1.x))
+            columns.door_y.append(int(door.edge1.y))
+            columns.door_parallel.append(int(door.edge1.x == door.edge2.x))
+        return columns
+
+    def max_coord(self) -> int:
+        """
+        Max coordinate of the ends of the walls and doors (0 without objects)
+        """
+        end = 0
+        for x, y, parallel, length in zip(self.wall_x, self.wall_y, self.wall_parallel, self.wall_length):
+            end = max(end, x, y, y + length) if parallel else max(end, x, x + length, y)
+        for x, y, parallel in zip(self.door_x, self.door_y, self.door_parallel):
+            end = max(end, x, y + LONG_DOOR) if parallel else max(end, x + LONG_DOOR, y)
+        return end
+
+    def unit_edges(self) -> int:
+        """
+        Number of edges of length 1 placed by the walls and doors (overlaps counted once per object)
+        """
+        return sum(map(abs, self.wall_length)) + len(self.door_x) * LONG_DOOR
+
+    def normalized(self) -> 'tuple[ObjectColumns, int]':
+        """
+        Minimal columns that place the same objects in the grid: the segments are sorted by axis
+        and line, the overlapping or adjacent walls of a line are merged in one wall, the repeated
+        doors are removed and the edges of a wall with a door are removed from the wall (the doors
+        overwrite the walls, so the wall is split around the doors).
+        The walls of length 0 are removed, they don't place any edge.
+
+        return:
+            (normalized columns, unit edges saved)
+        """
+        # (axis, line, first, last) of the walls, axis 1 parallel to Y (line X = x), 0 parallel to X (line Y = y)
+        intervals = []
+        for x, y, parallel, length in zip(self.wall_x, self.wall_y, self.wall_parallel, self.wall_length):
+            line, start = (x, y) if parallel else (y, x)
+            if length:
+                intervals.append((1 if parallel else 0, line, min(start, start + length), max(start, start + length)))
+        intervals.sort()
+
+        # Positions of the doors of each line, sorted
+        door_lines: dict[tuple[int, int], list[int]] = {}
+        for x, y, parallel in set((x, y, 1 if parallel else 0) for x, y, parallel in zip(self.door_x, self.door_y, self.door_parallel)):
+            if parallel:
+                door_lines.setdefault((1, x), []).append(y)
+            else:
+                door_lines.setdefault((0, y), []).append(x)
+        for positions in door_lines.values():
+            positions.sort()
+
+        merged: list[list[int]] = []
+        for axis, line, first, last in intervals:
+            if merged and merged[-1][0] == axis and merged[-1][1] == line and first <= merged[-1][3]:
+                merged[-1][3] = max(merged[-1][3], last)
+            else:
+                merged.append([axis, line, first, last])
+
+        columns = ObjectColumns()
+        for axis, line, first, last in merged:
+            positions = door_lines.get((axis, line), ())
+            index = bisect_left(positions, first)
+            # Pieces of the wall between the doors of the line
+            while first < last:
+                end = positions[index] if index < len(positions) and positions[index] < last else last
+                if end > first:
+                    columns.wall_x.append(line if axis else first)
+                    columns.wall_y.append(first if axis else line)
+                    columns.wall_parallel.append(axis)
+                    columns.wall_length.append(end - first)
+                first = end + LONG_DOOR
+                index += 1
+        for (axis, line), positions in sorted(door_lines.items()):
+            for position in positions:
+                columns.door_x.append(line if axis else position)
+                columns.door_y.append(position if axis else line)
+                columns.door_parallel.append(axis)
+        return columns, self.unit_edges() - columns.unit_edges()
+
+    def walls(self) -> 'list[Wall]':
+        """
+        Wall objects of the columns
+        """
+        walls = []
+        for x, y, parallel, length in zip(self.wall_x, self.wall_y, self.wall_parallel, self.wall_length):
+            walls.append(Wall(Point(x, y), Point(x, y + length) if parallel else Point(x + length, y)))
+        return walls
+
+    def doors(self) -> 'list[Door]':
+        """
+        Door objects of the columns
+        """
+        doors = []
+        for x, y, parallel in zip(self.door_x, self.door_y, self.door_parallel):
+            doors.append(Door(Point(x, y), Point(x, y + LONG_DOOR) if parallel else Point(x + LONG_DOOR, y)))
+        return doors
+
+    def __len__(self) -> int:
+        return len(self.wall_x) + len(self.door_x)
+
+    def __repr__(self) -> str:
+        return "".join(["ObjectColumns(walls=", str(len(self.wall_x)), ", doors=", str(len(self.door_x)), ")"])
@@ -0,0 +1,180 @@
+## Dead-end and corridor reduction of the grid of the labyrinth
+from .graphs import Direction
+from .grid import EdgeGrid
+from .path import Path
+import heapq
+
+_MOVES = ((Direction.NORTH, 0, 1), (Direction.SOUTH, 0, -1), (Direction.WEST, -1, 0), (Direction.EAST, 1, 0))
+
+
+class ReducedGraph:
+    """
+    Graph of the labyrinth without dead ends and with the corridors collapsed in weighted edges.
+
+    The reduction is made with the walls placed in the grid:
+        1. Dead ends: the cells with three (or four) walled sides are removed, iteratively,
+           so a dead-end corridor is removed from its end to the cell where it starts
+        2. Corridors: the chains of cells with two neighbours are collapsed in one edge between
+           the cells at their ends (junctions), the edge has the doors and cells of the chain
+    The protected cells (teseo and the minotaurs) are never removed or collapsed.
+
+    The search runs on the junctions and the paths are expanded back to cells.
+
+    Atributtes:
+        area: int
+            The graph has the cells with both coordenates lower than area
+        dead_ends: int
+            Number of cells removed as dead ends
+        corridor_cells: int
+            Number of cells collapsed in the edges
+        edges: dict[int, list[tuple[int, int, int, list]]]
+            Edges of each junction (index y * area + x): (junction, doors, cells moved, runs of moves)
+        stats: SearchStats
+            Statistics of the search (the expanded nodes are junctions)
+    """
+
+    def __init__(self, labyrinth, protected: 'list[tuple[int, int]]' = ()):
+        grid = labyrinth.edge_grid
+        area = self.area = labyrinth.active_area
+        self.door_cost = labyrinth.DOOR_COST
+        self.empty_cost = labyrinth.EMPTY_COST
+        self.stats = labyrinth.stats
+        protected = {y * area + x for x, y in protected}
+
+        # Passable neighbours of each cell: (neighbour, direction, kind of the edge)
+        neighbours = []
+        for y in range(area):
+            for x in range(area):
+                cell_neighbours = []
+                for direction, delta_x, delta_y in _MOVES:
+                    next_x = x + delta_x
+                    next_y = y + delta_y
+                    if 0 <= next_x < area and 0 <= next_y < area:
+                        kind = grid.get_edge(x, y, direction)
+                        if kind != EdgeGrid.WALL:
+                            cell_neighbours.append((next_y * area + next_x, direction, kind))
+                neighbours.append(cell_neighbours)
+
+        # 1. Dead ends
+        alive = bytearray(b"\x01") * (area * area)
+        degree = [len(cell_neighbours) for cell_neighbours in neighbours]
+        pending = [cell for cell in range(area * area) if degree[cell] <= 1 and cell not in protected]
+        self.dead_ends = 0
+        while pending:
+            cell = pending.pop()
+            if not alive[cell]:
+                continue
+            alive[cell] = 0
+            self.dead_ends += 1
+            for neighbour, _, _ in neighbours[cell]:
+                if alive[neighbour]:
+                    degree[neighbour] -= 1
+                    if degree[neighbour] <= 1 and neighbour not in protected:
+                        pending.append(neighbour)
+
+        # 2. Corridors, walked from each junction to the junction at the other end
+        def is_corridor(cell: int) -> bool:
+            return degree[cell] == 2 and cell not in protected
+
+        self.edges: dict[int, list] = {}
+        corridor_cells = set()
+        for cell in range(area * area):
+            if not alive[cell] or is_corridor(cell):
+                continue
+            cell_edges = self.edges[cell] = []
+            for neighbour, direction, kind in neighbours[cell]:
+                if not alive[neighbour]:
+                    continue
+                previous, current = cell, neighbour
+                doors = int(kind == EdgeGrid.DOOR)
+                moves = 1
+                runs = [[direction, 1]]
+                while is_corridor(current):
+                    corridor_cells.add(current)
+                    for next_cell, next_direction, next_kind in neighbours[current]:
+                        if alive[next_cell] and next_cell != previous:
+                            break
+                    previous, current = current, next_cell
+                    doors += next_kind == EdgeGrid.DOOR
+                    moves += 1
+                    if runs[-1][0] is next_direction:
+                        runs[-1][1] += 1
+                    else:
+                        runs.append([next_direction, 1])
+                cell_edges.append((current, doors, moves, runs))
+        self.corridor_cells = len(corridor_cells)
+
+    @property
+    def junctions(self) -> int:
+        return len(self.edges)
+
+    def search(self, start: 'tuple[int, int]', goal: 'tuple[int, int]') -> 'Path | None':
+        """
+        Min path (doors first and then cells) between two protected cells
+
+        return:
+            The Path or None if the goal can't be reached
+        """
+        area = self.area
+        first = start[1] * area + start[0]
+        last = goal[1] * area + goal[0]
+        if first not in self.edges or last not in self.edges:
+            raise ValueError("Error: the start and the goal must be protected cells of the reduced graph")
+        goal_x, goal_y = goal
+        stats = self.stats
+        stats.reset("corridors")
+
+        cost_so_far = {first: 0}
+        came_from = {first: None}
+        frontier = [(0, 0, first)]
+        stats.pushed = 1
+        while frontier:
+            _, negative_cost, cell = heapq.heappop(frontier)
+            current_cost = cost_so_far[cell]
+            if -negative_cost > current_cost:
+                continue
+            stats.expanded += 1
+            if cell == last:
+                stats.stop()
+                return self._expand(came_from, cell, start, int(current_cost // self.door_cost))
+
+            for edge in self.edges[cell]:
+                next_cell, doors, moves = edge[0], edge[1], edge[2]
+                new_cost = current_cost + doors * self.door_cost + moves * self.empty_cost
+                if next_cell not in cost_so_far or new_cost < cost_so_far[next_cell]:
+                    cost_so_far[next_cell] = new_cost
+                    came_from[next_cell] = (cell, edge)
+                    next_y, next_x = divmod(next_cell, area)
+                    priority = new_cost + self.empty_cost * (abs(goal_x - next_x) + abs(goal_y - next_y))
+                    heapq.heappush(frontier, (priority, -new_cost, next_cell))
+                    stats.pushed += 1
+
+        stats.stop()
+        return None
+
+    @staticmethod
+    def _expand(came_from: dict, cell: int, start: 'tuple[int, int]', doors: int) -> Path:
+        """
+        Path of the cells of the edges used from the start to the cell
+        """
+        reverse_edges = []
+        while came_from[cell] is not None:
+            cell, edge = came_from[cell]
+            reverse_edges.append(edge)
+        runs = [(direction, count) for edge in reversed(reverse_edges) for direction, count in edge[3]]
+        return Path(start, runs, doors)
+
+
+class CorridorSearch:
+    """
+    Search engine of the labyrinth (see Labyrinth.ENGINES) with the reduced graph,
+    the graph is built for the start and goal cells of each search
+    """
+
+    def __init__(self, labyrinth):
+        self._labyrinth = labyrinth
+        self.graph: ReducedGraph = None
+
+    def search(self, start: 'tuple[int, int]', goal: 'tuple[int, int]') -> 'Path | None':
+        self.graph = ReducedGraph(self._labyrinth, [start, goal])
+        return self.graph.search(start, goal)
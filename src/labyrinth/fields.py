@@ -0,0 +1,67 @@
+## Precomputed fields of the cells of a labyrinth (components and distances)
+from .graphs import Direction
+from .grid import EdgeGrid
+from array import array
+from collections import deque
+import heapq
+
+_MOVES = ((Direction.NORTH, 0, 1), (Direction.SOUTH, 0, -1), (Direction.WEST, -1, 0), (Direction.EAST, 1, 0))
+
+
+def connected_components(grid: EdgeGrid, area: int) -> 'array':
+    """
+    Label of the connected component of each cell of the area x area region (index y * area + x),
+    cells with the same label can reach each other (walls block, doors can be passed)
+    """
+    labels = array('i', [-1]) * (area * area)
+    label = 0
+    for first in range(area * area):
+        if labels[first] != -1:
+            continue
+        labels[first] = label
+        queue = deque([first])
+        while queue:
+            index = queue.popleft()
+            y, x = divmod(index, area)
+            for direction, delta_x, delta_y in _MOVES:
+                next_x = x + delta_x
+                next_y = y + delta_y
+                if not (0 <= next_x < area and 0 <= next_y < area):
+                    continue
+                next_index = next_y * area + next_x
+                if labels[next_index] == -1 and grid.get_edge(x, y, direction) != EdgeGrid.WALL:
+                    labels[next_index] = label
+                    queue.append(next_index)
+        label += 1
+    return labels
+
+
+def distance_field(grid: EdgeGrid, origin: 'tuple[int, int]', area: int, door_cost: int,
+                   empty_cost: int = 1) -> 'array':
+    """
+    Cost of the min path (doors * door_cost + moves * empty_cost) from the origin cell to each cell
+    of the area x area region (index y * area + x), -1 if the cell can't be reached
+    """
+    costs = array('q', [-1]) * (area * area)
+    start = origin[1] * area + origin[0]
+    costs[start] = 0
+    frontier = [(0, start)]
+    while frontier:
+        cost, index = heapq.heappop(frontier)
+        if cost > costs[index]:
+            continue
+        y, x = divmod(index, area)
+        for direction, delta_x, delta_y in _MOVES:
+            next_x = x + delta_x
+            next_y = y + delta_y
+            if not (0 <= next_x < area and 0 <= next_y < area):
+                continue
+            kind = grid.get_edge(x, y, direction)
+            if kind == EdgeGrid.WALL:
+                continue
+            new_cost = cost + empty_cost + (door_cost if kind == EdgeGrid.DOOR else 0)
+            next_index = next_y * area + next_x
+            if costs[next_index] == -1 or new_cost < costs[next_index]:
+                costs[next_index] = new_cost
+                heapq.heappush(frontier, (new_cost, next_index))
+    return costs
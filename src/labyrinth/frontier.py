@@ -0,0 +1,203 @@
+## Memory-bounded frontier search with divide and conquer reconstruction of the path
+from .graphs import Direction
+from .grid import EdgeGrid, memory_grid
+from .path import Path
+
+_STEPS = ((Direction.NORTH, 0, 1), (Direction.SOUTH, 0, -1), (Direction.WEST, -1, 0), (Direction.EAST, 1, 0))
+
+
+class _Overflow(Exception):
+    """
+    The search needs to store more cells than the cap
+    """
+
+
+class FrontierSearch:
+    """
+    Search engine with a cap on the cells stored by the search (exact results with bounded memory).
+
+    The cells are reached by door levels and by moves in each level (the order of the costs, like
+    BitsetWavefront), the search only keeps the frontier: the cells of the current (doors, moves),
+    the cells of the next moves and the cells through the doors (seeds of the next level). The cells
+    already reached are one bit each in a bitmap (there is no came_from nor cost_so_far, and no heap
+    with stale entries), the bitmap is 8 times smaller than the edges of the grid.
+
+    The path is recovered with divide and conquer: if the search with the parents of the cells fits
+    in the cap the path is read from them, if not the search is done again carrying the relay of each
+    cell (the cell of its path with half of the moves to the goal), so the relay of the goal is a cell
+    of a min path and the path is the min path from the start to the relay and from the relay to the goal
+    (solved in the same way, each half needs less cells).
+
+    The cap is on the search, the grid is in memory: a TiledEdgeGrid is copied (working region only)
+    and MemoryError is raised if the copy is bigger than its memory budget (see grid.memory_grid()).
+
+    Atributtes:
+        area: int
+            The search only uses the cells with both coordenates lower than area
+        max_nodes: int
+            Max cells stored by the search (frontier and parents), the bitmap of reached cells is not counted
+        peak: int
+            Max cells stored by the last search
+        stats: SearchStats
+            Statistics of the search (the expanded nodes are the cells reached by all the searches of
+            the divide and conquer, there is no heap)
+    """
+    MAX_NODES = 1 << 20
+
+    def __init__(self, labyrinth, max_nodes: int = None):
+        grid = memory_grid(labyrinth.edge_grid, labyrinth.active_area, "frontier")
+        self._grid = grid
+        self.area = labyrinth.active_area
+        self.max_nodes = max_nodes if max_nodes is not None else self.MAX_NODES
+        if self.max_nodes < 1:
+            raise ValueError("Error: max_nodes must be positive")
+        self.peak = 0
+        self.stats = labyrinth.stats
+
+    def search(self, start: 'tuple[int, int]', goal: 'tuple[int, int]') -> 'Path | None':
+        """
+        Min path (doors first and then cells) from the start cell to the goal cell
+
+        raise:
+            MemoryError
+                If the frontier alone needs more than max_nodes cells
+
+        return:
+            The Path or None if the goal can't be reached
+        """
+        self.stats.reset("frontier")
+        self.peak = 0
+        area = self.area
+        source = start[1] * area + start[0]
+        target = goal[1] * area + goal[0]
+        cells = self._cells(source, target)
+        self.stats.stop()
+        if cells is None:
+            return None
+
+        runs = []
+        doors = 0
+        for previous, current in zip(cells, cells[1:]):
+            direction = Path._direction_between((previous % area, previous // area), (current % area, current // area))
+            doors += self._grid.get_edge(previous % area, previous // area, direction) == EdgeGrid.DOOR
+            if runs and runs[-1][0] == direction:
+                runs[-1] = (direction, runs[-1][1] + 1)
+            else:
+                runs.append((direction, 1))
+        return Path(start, runs, doors)
+
+    def _cells(self, source: int, target: int) -> 'list[int] | None':
+        """
+        Cells of a min path from the source to the target (divide and conquer), None if there is no path
+        """
+        if source == target:
+            return [source]
+        parents: dict[int, int] = {}
+        try:
+            reached = self._frontier(source, target, parents=parents)
+        except _Overflow:
+            reached = False
+        if reached is None:
+            return None
+        if reached:
+            cells = [target]
+            while cells[-1] != source:
+                cells.append(parents[cells[-1]])
+            return cells[::-1]
+        parents = None
+
+        try:
+            reached = self._frontier(source, target)
+            if reached is None:
+                return None
+            _, moves, _ = reached
+            if moves <= 1:
+                return [source, target]
+            _, _, relay = self._frontier(source, target, relay_moves=moves // 2)
+        except _Overflow:
+            raise MemoryError("Error: the frontier of the search needs more than " + str(self.max_nodes) + " cells")
+        return self._cells(source, relay) + self._cells(relay, target)[1:]
+
+    def _frontier(self, source: int, target: int, parents: dict = None, relay_moves: int = None):
+        """
+        Frontier search from the source to the target, the value of each cell of the frontier
+        is its parent (if parents is given, the parents of the reached cells are stored in it)
+        or its relay (the cell of its path with relay_moves moves)
+
+        return:
+            (doors, moves, value of the target) or None if the target can't be reached
+        """
+        area = self.area
+        grid = self._grid
+        stats = self.stats
+        visited = bytearray((area * area + 7) // 8)
+
+        level = 0
+        seeds: dict[int, dict[int, int]] = {0: {source: source}}
+        pending = 1
+        while seeds:
+            # Cells through the doors of this level (seeds of the next level), by moves
+            door_seeds: dict[int, dict[int, int]] = {}
+            door_pending = 0
+            frontier: dict[int, int] = {}
+            moves = 0
+            while frontier or seeds:
+                if frontier:
+                    moves += 1
+                    wave = seeds.pop(moves, {})
+                    pending -= len(wave)
+                    for cell, value in frontier.items():
+                        y, x = divmod(cell, area)
+                        if parents is not None:
+                            value = cell
+                        for direction, delta_x, delta_y in _STEPS:
+                            next_x = x + delta_x
+                            next_y = y + delta_y
+                            if not (0 <= next_x < area and 0 <= next_y < area):
+                                continue
+                            next_cell = next_y * area + next_x
+                            if visited[next_cell >> 3] & (1 << (next_cell & 7)):
+                                continue
+                            kind = grid.get_edge(x, y, direction)
+                            if kind == EdgeGrid.EMPTY:
+                                wave.setdefault(next_cell, value)
+                            elif kind == EdgeGrid.DOOR:
+                                next_seeds = door_seeds.setdefault(moves, {})
+                                if next_cell not in next_seeds:
+                                    next_seeds[next_cell] = value
+                                    door_pending += 1
+                        self._check(len(frontier) + len(wave) + pending + door_pending, parents)
+                else:
+                    moves = min(seeds)
+                    wave = seeds.pop(moves)
+                    pending -= len(wave)
+
+                frontier = {}
+                for cell, value in wave.items():
+                    if visited[cell >> 3] & (1 << (cell & 7)):
+                        continue
+                    visited[cell >> 3] |= 1 << (cell & 7)
+                    stats.expanded += 1
+                    if parents is not None:
+                        if cell != source:
+                            parents[cell] = value
+                    elif moves == relay_moves:
+                        value = cell
+                    frontier[cell] = value
+                self._check(len(frontier) + pending + door_pending, parents)
+                if target in frontier:
+                    return level, moves, frontier[target]
+            seeds = door_seeds
+            pending = door_pending
+            level += 1
+        return None
+
+    def _check(self, stored: int, parents: 'dict | None'):
+        """
+        Updates the peak of stored cells, raises _Overflow if they are more than max_nodes
+        """
+        if parents is not None:
+            stored += len(parents)
+        if stored > self.max_nodes:
+            raise _Overflow()
+        self.peak = max(self.peak, stored)
@@ -0,0 +1,135 @@
+## Compact storage of the walls and doors of the labyrinth
+from .graphs import Direction
+
+
+class EdgeGrid:
+    """
+    Compact representation of the objects in the edges of the cells of a labyrinth
+
+    The labyrinth has width x height cells of 1u^2, each edge between two cells (and each edge
+    of the border) is one byte with the kind of object in that edge: EMPTY, DOOR or WALL.
+    The cell (x, y) is the cell with the left bottom corner in the point (x, y).
+
+    Both cells that share an edge see the same object, so there is no need to keep
+    the object in the two cells.
+
+    Atributtes:
+        width: int
+            Number of cells in the X axis
+        height: int
+            Number of cells in the Y axis
+        vertical: bytearray
+            Edges parallel to Y axis, (width + 1) per row, vertical[y * (width + 1) + x]
+            is the edge in the line X = x of the row y (west edge of the cell (x, y))
+        horizontal: bytearray
+            Edges parallel to X axis, width per line, horizontal[y * width + x]
+            is the edge in the line Y = y of the column x (south edge of the cell (x, y))
+    """
+    EMPTY = 0
+    DOOR = 1
+    WALL = 2
+
+    def __init__(self, width: int, height: int = None):
+        if height is None:
+            height = width
+        self.width = width
+        self.height = height
+        self.vertical = bytearray((width + 1) * height)
+        self.horizontal = bytearray(width * (height + 1))
+
+    def contains_cell(self, x: int, y: int) -> bool:
+        """
+        Tells if the cell (x, y) is inside of the grid
+        """
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def get_vertical(self, x: int, y: int) -> int:
+        """
+        Kind of the edge in the line X = x of the row y
+        """
+        return self.vertical[y * (self.width + 1) + x]
+
+    def set_vertical(self, x: int, y: int, kind: int):
+        self.vertical[y * (self.width + 1) + x] = kind
+
+    def get_horizontal(self, x: int, y: int) -> int:
+        """
+        Kind of the edge in the line Y = y of the column x
+        """
+        return self.horizontal[y * self.width + x]
+
+    def set_horizontal(self, x: int, y: int, kind: int):
+        self.horizontal[y * self.width + x] = kind
+
+    def get_edge(self, x: int, y: int, direction: Direction) -> int:
+        """
+        Kind of the object in the edge of the cell (x, y) in the given direction
+        """
+        if direction == Direction.NORTH:
+            return self.get_horizontal(x, y + 1)
+        elif direction == Direction.SOUTH:
+            return self.get_horizontal(x, y)
+        elif direction == Direction.WEST:
+            return self.get_vertical(x, y)
+        else:
+            return self.get_vertical(x + 1, y)
+
+    def set_edge(self, x: int, y: int, direction: Direction, kind: int):
+        """
+        Sets the kind of the object in the edge of the cell (x, y) in the given direction,
+        the neighbour cell in that direction shares the edge
+        """
+        if direction == Direction.NORTH:
+            self.set_horizontal(x, y + 1, kind)
+        elif direction == Direction.SOUTH:
+            self.set_horizontal(x, y, kind)
+        elif direction == Direction.WEST:
+            self.set_vertical(x, y, kind)
+        else:
+            self.set_vertical(x + 1, y, kind)
+
+    def clear(self):
+        """
+        Removes all the objects of the grid
+        """
+        self.vertical[:] = bytes(len(self.vertical))
+        self.horizontal[:] = bytes(len(self.horizontal))
+
+    def flush(self):
+        """
+        Nothing to write, the grid is in memory (same interface than the disk-backed grids)
+        """
+
+    def close(self):
+        """
+        Nothing to release, the grid is in memory
+        """
+
+    def __eq__(self, other: 'EdgeGrid') -> bool:
+        if not(isinstance(other, EdgeGrid)): return False
+        return (self.width == other.width and self.height == other.height
+                and self.vertical == other.vertical and self.horizontal == other.horizontal)
+
+    def __repr__(self) -> str:
+        return "".join(["EdgeGrid(", str(self.width), "x", str(self.height), ")"])
+
+
+def memory_grid(grid, area: int, engine: str) -> EdgeGrid:
+    """
+    In-memory EdgeGrid of the area x area cells of the working region, for the engines that read
+    all the edges as bytearrays. An EdgeGrid is used as it is, a disk-backed grid (TiledEdgeGrid)
+    is copied tile by tile (see TiledEdgeGrid.to_edge_grid()) if the copy fits in its memory budget.
+
+    raise:
+        MemoryError
+            If the copy of the working region is bigger than the memory budget of the grid
+    """
+    if isinstance(grid, EdgeGrid):
+        return grid
+    size = (area + 1) * area * 2
+    budget = getattr(grid, "memory_budget", None)
+    if budget is not None and size > budget:
+        raise MemoryError("".join(["Error: the ", engine, " engine needs the ", str(area), "x", str(area),
+                                   " cells in memory (", str(size), " bytes), more than the memory budget of the grid (",
+                                   str(budget), " bytes), use the astar or jps engine"]))
+    return grid.to_edge_grid(area)
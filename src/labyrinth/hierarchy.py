@@ -0,0 +1,304 @@
+## Contraction hierarchy of the cells of a labyrinth for fast repeated queries
+from .graphs import Direction
+from .grid import EdgeGrid, memory_grid
+from .path import Path
+from .snapshot import _little_endian, _padding
+from array import array
+import heapq
+import struct
+import sys
+
+HIERARCHY_MAGIC = b"LABCH\0\0\0"
+HIERARCHY_VERSION = 1
+
+# magic, version, area, door cost, empty cost, number of upward edges
+_HEADER = struct.Struct("<8sIIqqI")
+
+_STEPS = {Direction.NORTH: (0, 1), Direction.SOUTH: (0, -1), Direction.WEST: (-1, 0), Direction.EAST: (1, 0)}
+
+
+class ContractionHierarchy:
+    """
+    Contraction hierarchy (CH) of the cells of the working region of a labyrinth.
+
+    The cells are contracted one by one (the least important first: cells of corridors and
+    rooms with few shortcuts), when a cell is contracted its neighbours are connected with a
+    shortcut if there isn't another path as good (witness search). The weight of the edges is
+    doors * DOOR_COST + cells moved, so the min path has the min doors and then the min cells.
+
+    Each cell keeps only its upward edges (to the cells contracted after it), a query is a
+    bidirectional Dijkstra over the upward edges from the start and from the goal that only
+    settles a few hundred cells, and the shortcuts of the path are unpacked to cells with the
+    middle cell of each shortcut.
+
+    The hierarchy can be saved in a binary file (save()) and loaded without the labyrinth (load()).
+
+    build() reads the edges in memory, a TiledEdgeGrid is only accepted if the working region
+    fits in its memory budget (see grid.memory_grid()).
+
+    Atributtes:
+        area: int
+            Cells of the hierarchy are the area x area cells of the labyrinth (index y * area + x)
+        door_cost: int
+        empty_cost: int
+            Costs of the labyrinth (see Labyrinth)
+        shortcuts: int
+            Number of shortcuts added by the contraction
+        settled: int
+            Cells settled by the last query
+    """
+
+    def __init__(self, area: int, door_cost: int, empty_cost: int, offsets: 'array', targets: 'array',
+                 weights: 'array', middles: 'array', shortcuts: int = 0):
+        self.area = area
+        self.door_cost = door_cost
+        self.empty_cost = empty_cost
+        # Upward edges of the cell c: targets[offsets[c]:offsets[c + 1]] (CSR), middle -1 if not a shortcut
+        self._offsets = offsets
+        self._targets = targets
+        self._weights = weights
+        self._middles = middles
+        self.shortcuts = shortcuts
+        self.settled = 0
+
+    @classmethod
+    def build(cls, labyrinth, witness_limit: int = 64) -> 'ContractionHierarchy':
+        """
+        Builds the hierarchy of the working region of the labyrinth (offline preprocessing)
+
+        Args:
+            labyrinth: Labyrinth
+                Labyrinth with the walls and doors
+            witness_limit: int
+                Max cells settled by each witness search, more cells, less shortcuts
+        """
+        grid = memory_grid(labyrinth.edge_grid, labyrinth.active_area, "contraction hierarchy")
+        area = labyrinth.active_area
+        door_cost = labyrinth.DOOR_COST
+        empty_cost = labyrinth.EMPTY_COST
+        cells = area * area
+
+        # Overlay graph of the cells not contracted yet: {neighbour: (weight, middle)}
+        graph: list[dict[int, tuple[int, int]]] = [{} for _ in range(cells)]
+        for y in range(area):
+            for x in range(area):
+                for direction, (delta_x, delta_y) in _STEPS.items():
+                    next_x = x + delta_x
+                    next_y = y + delta_y
+                    if 0 <= next_x < area and 0 <= next_y < area:
+                        kind = grid.get_edge(x, y, direction)
+                        if kind != EdgeGrid.WALL:
+                            weight = door_cost + empty_cost if kind == EdgeGrid.DOOR else empty_cost
+                            graph[y * area + x][next_y * area + next_x] = (weight, -1)
+
+        deleted_neighbours = [0] * cells
+        upward: list[list[tuple[int, int, int]]] = [[] for _ in range(cells)]
+        shortcuts = 0
+
+        def needed_shortcuts(cell: int) -> 'list[tuple[int, int, int]]':
+            """
+            Shortcuts (u, w, weight) between the neighbours of the cell that are needed if it is contracted
+            """
+            neighbours = list(graph[cell].items())
+            needed = []
+            for index, (first, (first_weight, _)) in enumerate(neighbours):
+                others = {second: first_weight + second_weight for second, (second_weight, _) in neighbours[index + 1:]}
+                if not others:
+                    continue
+                distances = cls._witness_search(graph, first, cell, max(others.values()), witness_limit)
+                for second, weight in others.items():
+                    if distances.get(second, weight + 1) > weight:
+                        needed.append((first, second, weight))
+            return needed
+
+        def importance(cell: int) -> int:
+            return len(needed_shortcuts(cell)) - len(graph[cell]) + deleted_neighbours[cell]
+
+        queue = [(importance(cell), cell) for cell in range(cells)]
+        heapq.heapify(queue)
+        while queue:
+            _, cell = heapq.heappop(queue)
+            # Lazy update: the importance could have changed with the cells contracted
+            current = importance(cell)
+            if queue and current > queue[0][0]:
+                heapq.heappush(queue, (current, cell))
+                continue
+
+            for first, second, weight in needed_shortcuts(cell):
+                if second not in graph[first] or graph[first][second][0] > weight:
+                    graph[first][second] = (weight, cell)
+                    graph[second][first] = (weight, cell)
+                    shortcuts += 1
+            for neighbour, (weight, middle) in graph[cell].items():
+                upward[cell].append((neighbour, weight, middle))
+                del graph[neighbour][cell]
+                deleted_neighbours[neighbour] += 1
+            graph[cell] = {}
+
+        offsets = array('i', [0])
+        targets, weights, middles = array('i'), array('q'), array('i')
+        for edges in upward:
+            for target, weight, middle in edges:
+                targets.append(target)
+                weights.append(weight)
+                middles.append(middle)
+            offsets.append(len(targets))
+        return cls(area, door_cost, empty_cost, offsets, targets, weights, middles, shortcuts)
+
+    @staticmethod
+    def _witness_search(graph: list, source: int, avoid: int, max_weight: int, limit: int) -> 'dict[int, int]':
+        """
+        Dijkstra from the source without the avoided cell, until max_weight or limit cells settled
+        """
+        distances = {source: 0}
+        frontier = [(0, source)]
+        settled = 0
+        while frontier and settled < limit:
+            distance, cell = heapq.heappop(frontier)
+            if distance > distances[cell]:
+                continue
+            if distance > max_weight:
+                break
+            settled += 1
+            for neighbour, (weight, _) in graph[cell].items():
+                if neighbour == avoid:
+                    continue
+                new_distance = distance + weight
+                if new_distance < distances.get(neighbour, new_distance + 1):
+                    distances[neighbour] = new_distance
+                    heapq.heappush(frontier, (new_distance, neighbour))
+        return distances
+
+    def _upward(self, cell: int):
+        for index in range(self._offsets[cell], self._offsets[cell + 1]):
+            yield self._targets[index], self._weights[index], self._middles[index]
+
+    def _middle(self, lower: int, upper: int) -> int:
+        for target, _, middle in self._upward(lower):
+            if target == upper:
+                return middle
+        raise ValueError("Error: corrupted contraction hierarchy")
+
+    def _unpack(self, first: int, second: int, middle: int, cells: 'list[int]'):
+        """
+        Appends the cells of the edge from first to second (without first), unpacking the shortcuts
+        """
+        if middle < 0:
+            cells.append(second)
+            return
+        self._unpack(first, middle, self._middle(middle, first), cells)
+        self._unpack(middle, second, self._middle(middle, second), cells)
+
+    def query(self, start: 'tuple[int, int]', goal: 'tuple[int, int]') -> 'Path | None':
+        """
+        Min path (doors first and then cells) between two cells of the hierarchy
+
+        return:
+            The Path or None if the goal can't be reached
+        """
+        area = self.area
+        for x, y in (start, goal):
+            if not (0 <= x < area and 0 <= y < area):
+                raise ValueError("Error: the cells must be in the area of the hierarchy")
+        source = start[1] * area + start[0]
+        target = goal[1] * area + goal[0]
+
+        # Forward (0) and backward (1) searches: distances and parents {cell: (parent, middle)}
+        distances = ({source: 0}, {target: 0})
+        parents = ({source: None}, {target: None})
+        frontiers = ([(0, source)], [(0, target)])
+        best, meeting = float('inf'), None
+        settled = 0
+        while frontiers[0] or frontiers[1]:
+            side = 0 if not frontiers[1] or (frontiers[0] and frontiers[0][0][0] <= frontiers[1][0][0]) else 1
+            distance, cell = heapq.heappop(frontiers[side])
+            if distance > distances[side][cell]:
+                continue
+            if distance >= best:
+                # The rest of this side can't improve the path
+                frontiers[side].clear()
+                continue
+            settled += 1
+            other = distances[1 - side].get(cell)
+            if other is not None and distance + other < best:
+                best, meeting = distance + other, cell
+            for neighbour, weight, middle in self._upward(cell):
+                new_distance = distance + weight
+                if new_distance < distances[side].get(neighbour, new_distance + 1):
+                    distances[side][neighbour] = new_distance
+                    parents[side][neighbour] = (cell, middle)
+                    heapq.heappush(frontiers[side], (new_distance, neighbour))
+        self.settled = settled
+        if meeting is None:
+            return None
+
+        # Upward path from the start to the meeting cell and from the meeting cell down to the goal
+        chain = []
+        cell = meeting
+        while parents[0][cell] is not None:
+            parent, middle = parents[0][cell]
+            chain.append((parent, cell, middle))
+            cell = parent
+        cells = [source]
+        for first, second, middle in reversed(chain):
+            self._unpack(first, second, middle, cells)
+        cell = meeting
+        while parents[1][cell] is not None:
+            parent, middle = parents[1][cell]
+            self._unpack(cell, parent, middle, cells)
+            cell = parent
+
+        runs = []
+        for previous, current in zip(cells, cells[1:]):
+            direction = Path._direction_between((previous % area, previous // area), (current % area, current // area))
+            runs.append((direction, 1))
+        return Path(start, runs, int(best // self.door_cost))
+
+    def save(self, filename: str):
+        """
+        Writes the hierarchy in a binary file (little endian, version HIERARCHY_VERSION):
+        header (see _HEADER), offsets (int32), targets (int32), weights (int64) and middles (int32)
+        of the upward edges, each section padded to 8 bytes
+        """
+        header = _HEADER.pack(HIERARCHY_MAGIC, HIERARCHY_VERSION, self.area, self.door_cost,
+                              self.empty_cost, len(self._targets))
+        with open(filename, "wb") as file:
+            for section in (header, _little_endian(self._offsets), _little_endian(self._targets),
+                            _little_endian(self._weights), _little_endian(self._middles)):
+                file.write(section)
+                file.write(_padding(len(section)))
+
+    @classmethod
+    def load(cls, filename: str) -> 'ContractionHierarchy':
+        """
+        Reads a hierarchy written by save()
+
+        raise:
+            ValueError
+                If the file is not a hierarchy or its version is not supported
+        """
+        with open(filename, "rb") as file:
+            data = file.read()
+        try:
+            magic, version, area, door_cost, empty_cost, edges = _HEADER.unpack_from(data, 0)
+        except struct.error:
+            raise ValueError("Error: " + filename + " is not a contraction hierarchy")
+        if magic != HIERARCHY_MAGIC:
+            raise ValueError("Error: " + filename + " is not a contraction hierarchy")
+        if version != HIERARCHY_VERSION:
+            raise ValueError("Error: unsupported contraction hierarchy version " + str(version))
+
+        offset = _HEADER.size + len(_padding(_HEADER.size))
+        sections = []
+        for typecode, length in (('i', area * area + 1), ('i', edges), ('q', edges), ('i', edges)):
+            values = array(typecode)
+            size = length * values.itemsize
+            if offset + size > len(data):
+                raise ValueError("Error: truncated contraction hierarchy")
+            values.frombytes(data[offset:offset + size])
+            if sys.byteorder != "little":
+                values.byteswap()
+            sections.append(values)
+            offset += size + len(_padding(size))
+        return cls(area, door_cost, empty_cost, *sections)
+
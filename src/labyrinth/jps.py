@@ -0,0 +1,200 @@
+## Jump Point Search on the 4-connected grid of the labyrinth
+from .graphs import Direction
+from .grid import EdgeGrid
+from .path import Path
+import heapq
+
+_STEPS = {Direction.NORTH: (0, 1), Direction.SOUTH: (0, -1), Direction.WEST: (-1, 0), Direction.EAST: (1, 0)}
+_VERTICAL = (Direction.NORTH, Direction.SOUTH)
+_HORIZONTAL = (Direction.WEST, Direction.EAST)
+
+
+class JumpPointSearch:
+    """
+    Jump Point Search (JPS) adapted to the 4-connected grid, the walls and the doors of the labyrinth.
+
+    Canonical paths: of all the min paths, the search only follows the ones that move horizontally
+    before moving vertically, a vertical move is followed by a horizontal one only if the
+    horizontal move before the vertical one is not possible with the same cost (forced neighbour),
+    ex: moving north from (x, y-1) to (x, y), turning east is forced if the edge (x, y-1) -> (x+1, y-1)
+    or (x+1, y-1) -> (x+1, y) is not empty (a wall corner).
+
+    So the empty runs are crossed with jumps, only the jump points are put in the frontier:
+        - vertical jumps stop in the cells with a forced neighbour
+        - horizontal jumps stop in the cells where a vertical jump finds a jump point
+        - both stop in the goal and in the cells with a door (crossing a door is always a stop,
+          the cells with doors expand the four directions)
+    The number of doors and cells of the path are the same than in the A* search.
+
+    Atributtes:
+        area: int
+            The search only uses the cells with both coordenates lower than area
+        door_cost: int
+            Cost of pass through a door (see Labyrinth.DOOR_COST)
+        empty_cost: int
+            Cost of each cell moved
+        stats: SearchStats
+            Statistics of the search (the pushed nodes are the jump points)
+    """
+
+    def __init__(self, labyrinth):
+        self._grid = labyrinth.edge_grid
+        self.area = labyrinth.active_area
+        self.door_cost = labyrinth.DOOR_COST
+        self.empty_cost = labyrinth.EMPTY_COST
+        self.stats = labyrinth.stats
+        self._door_cells: dict[tuple[int, int], bool] = {}
+        self._vertical_jumps: dict[tuple[int, int, Direction], tuple] = {}
+        self._goal: tuple[int, int] = None
+
+    def _edge(self, x: int, y: int, direction: Direction) -> int:
+        """
+        Kind of the edge of the cell in the direction, the border of the area is a wall
+        """
+        delta_x, delta_y = _STEPS[direction]
+        if not (0 <= x + delta_x < self.area and 0 <= y + delta_y < self.area):
+            return EdgeGrid.WALL
+        return self._grid.get_edge(x, y, direction)
+
+    def _is_door_cell(self, x: int, y: int) -> bool:
+        door_cell = self._door_cells.get((x, y))
+        if door_cell is None:
+            door_cell = any(self._edge(x, y, direction) == EdgeGrid.DOOR for direction in _STEPS)
+            self._door_cells[(x, y)] = door_cell
+        return door_cell
+
+    def _forced(self, x: int, y: int, direction: Direction, side: Direction) -> bool:
+        """
+        Tells if turning to the side in (x, y), after a vertical move in the direction, is forced:
+        the side move is possible and the same cells can't be reached moving first to the side
+        """
+        if self._edge(x, y, side) != EdgeGrid.EMPTY:
+            return False
+        previous_y = y - _STEPS[direction][1]
+        return not (self._edge(x, previous_y, side) == EdgeGrid.EMPTY and
+                    self._edge(x + _STEPS[side][0], previous_y, direction) == EdgeGrid.EMPTY)
+
+    def _step_cost(self, kind: int) -> int:
+        return self.door_cost + self.empty_cost if kind == EdgeGrid.DOOR else self.empty_cost
+
+    def _is_stop(self, x: int, y: int) -> bool:
+        return (x, y) == self._goal or self._is_door_cell(x, y)
+
+    def _jump_vertical(self, x: int, y: int, direction: Direction) -> 'tuple[int, int, int] | None':
+        """
+        Jump from (x, y) in a vertical direction, return the jump point (x, y, cost) or None
+        """
+        key = (x, y, direction)
+        if key in self._vertical_jumps:
+            return self._vertical_jumps[key]
+        delta_y = _STEPS[direction][1]
+        cost = 0
+        jump = None
+        while True:
+            kind = self._edge(x, y, direction)
+            if kind == EdgeGrid.WALL:
+                break
+            cost += self._step_cost(kind)
+            y += delta_y
+            if self._is_stop(x, y) or self._forced(x, y, direction, Direction.WEST) or self._forced(x, y, direction, Direction.EAST):
+                jump = (x, y, cost)
+                break
+        self._vertical_jumps[key] = jump
+        return jump
+
+    def _jump_horizontal(self, x: int, y: int, direction: Direction) -> 'tuple[int, int, int] | None':
+        """
+        Jump from (x, y) in a horizontal direction, return the jump point (x, y, cost) or None
+        """
+        delta_x = _STEPS[direction][0]
+        cost = 0
+        while True:
+            kind = self._edge(x, y, direction)
+            if kind == EdgeGrid.WALL:
+                return None
+            cost += self._step_cost(kind)
+            x += delta_x
+            if (self._is_stop(x, y) or self._jump_vertical(x, y, Direction.NORTH) is not None or
+                    self._jump_vertical(x, y, Direction.SOUTH) is not None):
+                return (x, y, cost)
+
+    def _successors(self, x: int, y: int, arrival: 'Direction | None') -> 'list[Direction]':
+        """
+        Directions of the canonical paths from a jump point reached moving in the arrival direction
+        """
+        if arrival is None:
+            return list(_STEPS)
+        if arrival in _HORIZONTAL:
+            return [arrival, Direction.NORTH, Direction.SOUTH]
+        return [arrival] + [side for side in _HORIZONTAL if self._forced(x, y, arrival, side)]
+
+    def search(self, start: 'tuple[int, int]', goal: 'tuple[int, int]') -> 'Path | None':
+        """
+        Min path (doors first and then cells) from the start cell to the goal cell
+
+        return:
+            The Path or None if the goal can't be reached
+        """
+        goal = tuple(goal)
+        if goal != self._goal:
+            # The vertical jumps stop in the goal, the ones of other goals are not valid
+            self._vertical_jumps.clear()
+            self._goal = goal
+        stats = self.stats
+        stats.reset("jps")
+        goal_x, goal_y = goal
+        empty_cost = self.empty_cost
+
+        # States are (x, y, arrival direction), None in the start and in the cells with doors
+        first = (start[0], start[1], None)
+        cost_so_far = {first: 0}
+        came_from = {first: None}
+        frontier = [(0, 0, 0, first)]
+        stats.pushed = 1
+        counter = 1
+        while frontier:
+            _, negative_cost, _, state = heapq.heappop(frontier)
+            current_cost = cost_so_far[state]
+            if -negative_cost > current_cost:
+                # Old entry, the state was reached later with a lower cost
+                continue
+            x, y, arrival = state
+            stats.expanded += 1
+            if (x, y) == goal:
+                stats.stop()
+                return self._reconstruct(came_from, state, int(current_cost // self.door_cost))
+
+            for direction in self._successors(x, y, arrival):
+                if direction in _VERTICAL:
+                    jump = self._jump_vertical(x, y, direction)
+                else:
+                    jump = self._jump_horizontal(x, y, direction)
+                if jump is None:
+                    continue
+                next_x, next_y, jump_cost = jump
+                next_state = (next_x, next_y, None if self._is_door_cell(next_x, next_y) else direction)
+                new_cost = current_cost + jump_cost
+                if next_state not in cost_so_far or new_cost < cost_so_far[next_state]:
+                    cost_so_far[next_state] = new_cost
+                    came_from[next_state] = state
+                    priority = new_cost + empty_cost * (abs(goal_x - next_x) + abs(goal_y - next_y))
+                    heapq.heappush(frontier, (priority, -new_cost, counter, next_state))
+                    counter += 1
+                    stats.pushed += 1
+
+        stats.stop()
+        return None
+
+    @staticmethod
+    def _reconstruct(came_from: dict, state: tuple, doors: int) -> Path:
+        """
+        Path of the straight jumps from the start to the state
+        """
+        reverse_runs = []
+        while came_from[state] is not None:
+            parent = came_from[state]
+            direction = Path._direction_between(parent[:2], (parent[0] + (state[0] > parent[0]) - (state[0] < parent[0]),
+                                                             parent[1] + (state[1] > parent[1]) - (state[1] < parent[1])))
+            reverse_runs.append((direction, abs(state[0] - parent[0]) + abs(state[1] - parent[1])))
+            state = parent
+        return Path(state[:2], reverse_runs[::-1], doors)
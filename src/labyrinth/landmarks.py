@@ -0,0 +1,111 @@
+## Landmarks for the ALT (A*, Landmarks, Triangle inequality) heuristic
+from .grid import EdgeGrid
+from .fields import distance_field
+from array import array
+
+
+class Landmarks:
+    """
+    Landmark cells with the cost of the min path from each landmark to all the cells.
+
+    For any landmark L and cells n, g: cost(n, g) >= |cost(L, g) - cost(L, n)| (triangle inequality,
+    the costs are the same in both directions), so the max of this bound over the landmarks is
+    an admissible and consistent heuristic that knows the walls and the doors of the labyrinth.
+    The costs are doors * door_cost + moves, the same costs than Labyrinth.A_STAR_SEARCH.
+
+    The landmarks are the 4 corners of the area and then the cells farthest from the
+    landmarks already chosen (farthest-point sampling).
+    Memory: one array of 8 bytes per cell and landmark.
+
+    Atributtes:
+        area: int
+            The distances are of the area x area cells (index y * area + x)
+        cells: list[tuple[int, int]]
+            Coordinates of the landmarks
+        tables: list[array]
+            Cost from each landmark to each cell, -1 if the cell can't be reached
+    """
+
+    def __init__(self, grid: EdgeGrid, area: int, door_cost: int, count: int = 8, empty_cost: int = 1):
+        """
+        Chooses the landmarks and computes their distance tables
+
+        Args:
+            grid: EdgeGrid
+                Objects of the labyrinth
+            area: int
+                Only the area x area cells are used (working region of the labyrinth)
+            door_cost: int
+                Cost of passing a door (without the cost of the move)
+            count: int
+                Number of landmarks
+            empty_cost: int
+                Cost of a move
+        """
+        self.area = area
+        self.cells: 'list[tuple[int, int]]' = []
+        self.tables: 'list[array]' = []
+        self._goal: 'tuple[int, int]' = None
+        self._goal_costs: 'list[int]' = []
+
+        corners = [(0, 0), (area - 1, area - 1), (area - 1, 0), (0, area - 1)]
+        nearest = None # cost from each cell to its nearest landmark
+        while len(self.cells) < count:
+            if corners:
+                cell = corners.pop(0)
+                if cell in self.cells:
+                    continue
+            else:
+                cell = self._farthest(nearest)
+                if cell is None:
+                    break
+            table = distance_field(grid, cell, area, door_cost, empty_cost)
+            self.cells.append(cell)
+            self.tables.append(table)
+            if nearest is None:
+                nearest = array('q', table)
+            else:
+                for index, cost in enumerate(table):
+                    if cost >= 0 and (nearest[index] < 0 or cost < nearest[index]):
+                        nearest[index] = cost
+
+    def _farthest(self, nearest: 'array') -> 'tuple[int, int] | None':
+        """
+        Reachable cell farthest from its nearest landmark, None if all the cells are landmarks
+        """
+        best = 0
+        best_index = -1
+        for index, cost in enumerate(nearest):
+            if cost > best:
+                best = cost
+                best_index = index
+        if best_index < 0:
+            return None
+        y, x = divmod(best_index, self.area)
+        return (x, y)
+
+    def heuristic(self, x: int, y: int, goal_x: int, goal_y: int) -> float:
+        """
+        Lower bound of the cost from the cell (x, y) to the goal cell,
+        inf if the landmarks show that the goal can't be reached
+        """
+        area = self.area
+        if not (0 <= x < area and 0 <= y < area and 0 <= goal_x < area and 0 <= goal_y < area):
+            return 0
+        if self._goal != (goal_x, goal_y):
+            # Costs of the goal are the same during a search
+            self._goal = (goal_x, goal_y)
+            self._goal_costs = [table[goal_y * area + goal_x] for table in self.tables]
+        index = y * area + x
+        best = 0
+        for table, goal_cost in zip(self.tables, self._goal_costs):
+            cost = table[index]
+            if cost < 0 or goal_cost < 0:
+                if (cost < 0) != (goal_cost < 0):
+                    # One of them is in the component of the landmark and the other not
+                    return float('inf')
+                continue
+            bound = cost - goal_cost if cost > goal_cost else goal_cost - cost
+            if bound > best:
+                best = bound
+        return best
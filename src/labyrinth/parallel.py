@@ -0,0 +1,286 @@
+## Parallel search of one path in worker processes (delta-stepping over the door levels)
+from .graphs import Direction
+from .grid import EdgeGrid, memory_grid
+from .path import Path
+from multiprocessing import shared_memory
+import multiprocessing
+import os
+import time
+
+# Codes of the parent directions (direction of the move that reaches the cell), 0 is no parent
+_DIRECTIONS = (None, Direction.NORTH, Direction.SOUTH, Direction.WEST, Direction.EAST)
+_NORTH, _SOUTH, _WEST, _EAST = 1, 2, 3, 4
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Before python 3.13 the block is always tracked, the workers share
+        # the resource tracker of the owner, so it is only released once
+        return shared_memory.SharedMemory(name=name)
+
+
+def _worker(connection, name: str, area: int, width: int, height: int, workers: int, index: int, door_cost: int, goal: int):
+    """
+    Loop of a worker process: owns the rows of its stripe, for each step (doors, moves) of the coordinator
+    marks the cells of its stripe reached in the step (shared costs and parents) and sends the next cells
+    to the coordinator, grouped by the worker that owns them
+    """
+    memory = _attach(name)
+    cells = area * area
+    costs = memory.buf[:cells * 8].cast('q')
+    parents = memory.buf[cells * 8:cells * 9]
+    edges = cells * 9
+    vertical_size = (width + 1) * height
+    vertical = memory.buf[edges:edges + vertical_size]
+    horizontal = memory.buf[edges + vertical_size:edges + vertical_size + width * (height + 1)]
+    try:
+        level = 0
+        seeds: dict[int, list] = {}
+        door_seeds: dict[int, list] = {}
+        local, local_moves = [], None
+        while True:
+            message = connection.recv()
+            if message is None:
+                break
+            step_level, moves, arriving, door_arriving = message
+            for seed_moves, cell, code in door_arriving:
+                door_seeds.setdefault(seed_moves, []).append((cell, code))
+            if step_level != level:
+                level = step_level
+                seeds, door_seeds = door_seeds, {}
+                local, local_moves = [], None
+
+            candidates = arriving + seeds.pop(moves, [])
+            if local_moves == moves:
+                candidates += local
+            local, local_moves = [], moves + 1
+            cost = level * door_cost + moves
+            frontier = []
+            for cell, code in candidates:
+                if costs[cell] < 0:
+                    costs[cell] = cost
+                    parents[cell] = code
+                    frontier.append(cell)
+
+            # Next cells: (owner, cell, code) with an empty edge (moves + 1) or with a door (next level)
+            outgoing: dict[int, list] = {}
+            outgoing_doors: dict[int, list] = {}
+            for cell in frontier:
+                y, x = divmod(cell, area)
+                moves_out = []
+                if y + 1 < area:
+                    moves_out.append((cell + area, _NORTH, horizontal[(y + 1) * width + x]))
+                if y > 0:
+                    moves_out.append((cell - area, _SOUTH, horizontal[y * width + x]))
+                if x > 0:
+                    moves_out.append((cell - 1, _WEST, vertical[y * (width + 1) + x]))
+                if x + 1 < area:
+                    moves_out.append((cell + 1, _EAST, vertical[y * (width + 1) + x + 1]))
+                for next_cell, code, kind in moves_out:
+                    if kind == EdgeGrid.WALL or costs[next_cell] >= 0:
+                        continue
+                    owner = (next_cell // area) * workers // area
+                    if kind == EdgeGrid.DOOR:
+                        if owner == index:
+                            door_seeds.setdefault(moves + 1, []).append((next_cell, code))
+                        else:
+                            outgoing_doors.setdefault(owner, []).append((moves + 1, next_cell, code))
+                    elif owner == index:
+                        local.append((next_cell, code))
+                    else:
+                        outgoing.setdefault(owner, []).append((next_cell, code))
+
+            connection.send((goal in frontier, len(frontier), outgoing, outgoing_doors, bool(local),
+                             min(seeds, default=None), min(door_seeds, default=None)))
+    finally:
+        for view in (costs, parents, vertical, horizontal):
+            view.release()
+        memory.close()
+        connection.close()
+
+
+class ParallelSearch:
+    """
+    Search engine that splits one search between worker processes (parallel delta-stepping).
+
+    The costs (doors * DOOR_COST + moves) and the parents of the cells are arrays in shared memory,
+    each worker owns a stripe of rows of the labyrinth and it is the only one that writes its cells.
+    The buckets of the delta-stepping are the (doors, moves) of the cells, in the order of the door
+    levels and the moves in each level (like BitsetWavefront), the coordinator runs one synchronous
+    step per bucket: the workers mark the cells of the bucket in their stripes and send back the cells
+    of the next buckets, that the coordinator sends to the workers that own them in the next step.
+
+    Termination: the buckets are processed in order of cost, so the search ends in the step that
+    reaches the goal (min doors and then min cells), or when no worker has cells in the next buckets
+    (the goal can't be reached). Then the workers are stopped and the path is recovered from the parents.
+
+    The edges are copied to the shared block, so a TiledEdgeGrid is read in memory first
+    (MemoryError if the working region doesn't fit in its memory budget, see grid.memory_grid()).
+
+    Atributtes:
+        area: int
+            The search only uses the cells with both coordenates lower than area
+        workers: int
+            Number of worker processes (the number of CPUs by default)
+        stats: SearchStats
+            Statistics of the search (the expanded nodes are the cells reached, there is no heap)
+    """
+
+    def __init__(self, labyrinth, workers: int = None):
+        grid = memory_grid(labyrinth.edge_grid, labyrinth.active_area, "parallel")
+        self._grid = grid
+        self.area = labyrinth.active_area
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.stats = labyrinth.stats
+        self._door_cost = labyrinth.DOOR_COST
+
+    def search(self, start: 'tuple[int, int]', goal: 'tuple[int, int]') -> 'Path | None':
+        """
+        Min path (doors first and then cells) from the start cell to the goal cell
+
+        return:
+            The Path or None if the goal can't be reached
+        """
+        stats = self.stats
+        stats.reset("parallel")
+        area = self.area
+        cells = area * area
+        width = self._grid.width
+        workers = self.workers
+        vertical_size = len(self._grid.vertical)
+        horizontal_size = len(self._grid.horizontal)
+
+        # Shared block: costs (int64, -1 not reached), parents (int8) and the edges of the grid
+        memory = shared_memory.SharedMemory(create=True, size=cells * 9 + vertical_size + horizontal_size)
+        costs = memory.buf[:cells * 8].cast('q')
+        parents = memory.buf[cells * 8:cells * 9]
+        costs[:] = memoryview(b"\xff" * (cells * 8)).cast('q')
+        parents[:] = bytes(cells)
+        edges = cells * 9
+        memory.buf[edges:edges + vertical_size] = bytes(self._grid.vertical)
+        memory.buf[edges + vertical_size:edges + vertical_size + horizontal_size] = bytes(self._grid.horizontal)
+
+        source = start[1] * area + start[0]
+        target = goal[1] * area + goal[0]
+        connections, processes = [], []
+        try:
+            for index in range(workers):
+                parent_end, child_end = multiprocessing.Pipe()
+                process = multiprocessing.Process(target=_worker, daemon=True,
+                                                  args=(child_end, memory.name, area, width, self._grid.height,
+                                                        workers, index, self._door_cost, target))
+                process.start()
+                child_end.close()
+                connections.append(parent_end)
+                processes.append(process)
+
+            found = self._coordinate(connections, source, area)
+            for connection in connections:
+                connection.send(None)
+            for process in processes:
+                process.join()
+
+            stats.stop()
+            if not found:
+                return None
+            doors = costs[target] // self._door_cost
+            return self._reconstruct(parents, start, goal, doors)
+        finally:
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+            for connection in connections:
+                connection.close()
+            costs.release()
+            parents.release()
+            memory.close()
+            memory.unlink()
+
+    def _coordinate(self, connections: list, source: int, area: int) -> bool:
+        """
+        Synchronous steps of the workers until the goal is reached (True) or there are no more cells (False)
+        """
+        workers = len(connections)
+        arriving = [[] for _ in range(workers)]
+        door_arriving = [[] for _ in range(workers)]
+        arriving[(source // area) * workers // area].append((source, 0))
+        level, moves = 0, 0
+        while True:
+            for connection, cells, doors in zip(connections, arriving, door_arriving):
+                connection.send((level, moves, cells, doors))
+            arriving = [[] for _ in range(workers)]
+            door_arriving = [[] for _ in range(workers)]
+            found = False
+            pending = False
+            next_seeds, next_door_seeds = [], []
+            for connection in connections:
+                reached, frontier, outgoing, outgoing_doors, has_local, seeds, door_seeds = connection.recv()
+                found |= reached
+                self.stats.expanded += frontier
+                for owner, cells in outgoing.items():
+                    arriving[owner].extend(cells)
+                    pending = True
+                for owner, cells in outgoing_doors.items():
+                    door_arriving[owner].extend(cells)
+                    next_door_seeds.append(min(seed_moves for seed_moves, _, _ in cells))
+                pending |= has_local
+                if seeds is not None:
+                    next_seeds.append(seeds)
+                if door_seeds is not None:
+                    next_door_seeds.append(door_seeds)
+            if found:
+                return True
+
+            if pending:
+                moves += 1
+            elif next_seeds:
+                moves = min(next_seeds)
+            elif next_door_seeds:
+                level += 1
+                moves = min(next_door_seeds)
+            else:
+                return False
+
+    def _reconstruct(self, parents: memoryview, start: 'tuple[int, int]', goal: 'tuple[int, int]', doors: int) -> Path:
+        """
+        Path following the parent directions from the goal to the start
+        """
+        area = self.area
+        x, y = goal
+        reverse_runs = []
+        while (x, y) != tuple(start):
+            direction = _DIRECTIONS[parents[y * area + x]]
+            reverse_runs.append((direction, 1))
+            delta_x, delta_y = Path.OFFSETS[direction]
+            x -= delta_x
+            y -= delta_y
+        return Path(start, reverse_runs[::-1], doors)
+
+
+def scaling_benchmark(labyrinth, start: 'tuple[int, int]', goal: 'tuple[int, int]',
+                      workers: 'tuple[int, ...]' = (1, 2, 4, 8, 16), repeat: int = 1) -> 'list[tuple[int, float]]':
+    """
+    Seconds of the parallel search of the same path with each number of workers (best of repeat runs)
+
+    raise:
+        ValueError
+            If a number of workers finds a different number of doors or cells (the search must be exact)
+    """
+    results = []
+    expected = None
+    for count in workers:
+        engine = ParallelSearch(labyrinth, count)
+        best = float('inf')
+        for _ in range(repeat):
+            begin = time.perf_counter()
+            path = engine.search(start, goal)
+            best = min(best, time.perf_counter() - begin)
+        summary = None if path is None else (path.doors, len(path))
+        if not results:
+            expected = summary
+        elif summary != expected:
+            raise ValueError("Error: the parallel search with " + str(count) + " workers found a different path")
+        results.append((count, best))
+    return results
@@ -0,0 +1,185 @@
+## Compact representation of the paths in the labyrinth
+from .graphs import CellNode, Direction
+from array import array
+import re
+
+
+class Path:
+    """
+    Compact path in the labyrinth: start cell and a run-length-encoded sequence of moves.
+
+    Instead of a list with all the CellNodes of the path, the path is stored as the
+    (x, y) integer coordinates of the start cell (left bottom corner of the cell) and
+    the runs of moves [(Direction, times), ...], ex: start=(0,0), runs E4 N3 W1.
+
+    Memory is O(number of turns) and not O(number of cells), and a Path is cheap to
+    pickle, send to other processes or keep in caches.
+
+    Atributtes:
+        start: tuple[int, int]
+            Coordinates of the start cell of the path
+        doors: int
+            Number of doors used in the path
+        _directions: bytes
+            Direction.value of each run
+        _counts: array('I')
+            Number of moves of each run
+    """
+    __slots__ = ("start", "doors", "_directions", "_counts")
+
+    OFFSETS = {Direction.NORTH: (0, 1), Direction.SOUTH: (0, -1),
+               Direction.WEST: (-1, 0), Direction.EAST: (1, 0)}
+    LETTERS = {Direction.NORTH: "N", Direction.SOUTH: "S",
+               Direction.WEST: "W", Direction.EAST: "E"}
+
+    def __init__(self, start: 'tuple[int, int]', runs: 'list[tuple[Direction, int]]' = (), doors: int = 0):
+        """
+        Initialices the path, consecutive runs with the same direction are merged
+
+        Args:
+            start: tuple[int, int]
+                Coordinates of the start cell
+            runs: list[tuple[Direction, int]]
+                Moves of the path as (direction, number of moves)
+            doors: int
+                Number of doors used in the path
+        """
+        self.start = (int(start[0]), int(start[1]))
+        self.doors = doors
+        directions = bytearray()
+        counts = array('I')
+        for direction, count in runs:
+            if count <= 0:
+                continue
+            if directions and directions[-1] == direction.value:
+                counts[-1] += count
+            else:
+                directions.append(direction.value)
+                counts.append(count)
+        self._directions = bytes(directions)
+        self._counts = counts
+
+    @classmethod
+    def from_nodes(cls, nodes: 'list[CellNode]', doors: int = 0) -> 'Path':
+        """
+        Create the compact path from a list of adjacent nodes (ex: path of teseo_to_minotaurs)
+        """
+        if not nodes:
+            raise ValueError("Error: a path needs at least one node")
+        start = cls.node_coords(nodes[0])
+        runs = []
+        previous = start
+        for node in nodes[1:]:
+            current = cls.node_coords(node)
+            runs.append((cls._direction_between(previous, current), 1))
+            previous = current
+        return cls(start, runs, doors)
+
+    @classmethod
+    def decode(cls, start: 'tuple[int, int]', encoded: str, doors: int = 0) -> 'Path':
+        """
+        Create the path from the string returned by Path.encode(), ex: "E4N3W1"
+        """
+        letters = {letter: direction for direction, letter in cls.LETTERS.items()}
+        if encoded == "-":
+            encoded = ""
+        if not re.fullmatch(r"([NSWE][0-9]+)*", encoded):
+            raise ValueError("Error: Invalid encoded path " + repr(encoded))
+        runs = [(letters[letter], int(count)) for letter, count in re.findall(r"([NSWE])([0-9]+)", encoded)]
+        return cls(start, runs, doors)
+
+    @staticmethod
+    def node_coords(node: CellNode) -> 'tuple[int, int]':
+        """
+        Integer coordinates (x, y) of a node, its left bottom corner
+        """
+        return (int(node.cell.bottom_left.x), int(node.cell.bottom_left.y))
+
+    @staticmethod
+    def _direction_between(previous: 'tuple[int, int]', current: 'tuple[int, int]') -> Direction:
+        delta_x = current[0] - previous[0]
+        delta_y = current[1] - previous[1]
+        if abs(delta_x) + abs(delta_y) != 1:
+            raise ValueError("Error: nodes of the path should be adjacent")
+        if delta_x > 0: return Direction.EAST
+        elif delta_x < 0: return Direction.WEST
+        elif delta_y > 0: return Direction.NORTH
+        else: return Direction.SOUTH
+
+    def runs(self):
+        """
+        Iterate the runs of the path as (Direction, number of moves)
+        """
+        for value, count in zip(self._directions, self._counts):
+            yield Direction(value), count
+
+    def end(self) -> 'tuple[int, int]':
+        """
+        Coordinates of the last cell of the path
+        """
+        x, y = self.start
+        for direction, count in self.runs():
+            delta_x, delta_y = self.OFFSETS[direction]
+            x += delta_x * count
+            y += delta_y * count
+        return (x, y)
+
+    def encode(self) -> str:
+        """
+        Return the moves as a string with the letter of the direction and the number of moves "E4N3W1"
+        """
+        return "".join(self.LETTERS[direction] + str(count) for direction, count in self.runs())
+
+    def to_nodes(self, labyrinth) -> 'list[CellNode]':
+        """
+        Return the path as the list of CellNodes of the labyrinth
+        """
+        return [labyrinth.get_node(x, y) for x, y in self]
+
+    def __iter__(self):
+        """
+        Iterate lazily the (x, y) coordinates of all the cells of the path
+        """
+        x, y = self.start
+        yield (x, y)
+        for direction, count in self.runs():
+            delta_x, delta_y = self.OFFSETS[direction]
+            for _ in range(count):
+                x += delta_x
+                y += delta_y
+                yield (x, y)
+
+    def __len__(self) -> int:
+        """
+        Number of cells of the path (the start cell included)
+        """
+        return 1 + sum(self._counts)
+
+    def __eq__(self, other: 'Path') -> bool:
+        if not(isinstance(other, Path)): return False
+        return (self.start == other.start and self.doors == other.doors
+                and self._directions == other._directions and self._counts == other._counts)
+
+    def __hash__(self) -> int:
+        return hash((self.start, self.doors, self._directions, self._counts.tobytes()))
+
+    def __reduce__(self):
+        # Pickled as the start, the encoded moves and the doors
+        return (_path_from_state, (self.start, self._directions, self._counts.tobytes(), self.doors))
+
+    def __repr__(self) -> str:
+        return "".join(["Path(start=", repr(self.start), ", moves=", self.encode() or "-",
+                        ", doors=", str(self.doors), ")"])
+
+
+def _path_from_state(start: 'tuple[int, int]', directions: bytes, counts: bytes, doors: int) -> Path:
+    """
+    Rebuild a pickled Path without decoding the runs again
+    """
+    path = Path.__new__(Path)
+    path.start = start
+    path.doors = doors
+    path._directions = directions
+    path._counts = array('I')
+    path._counts.frombytes(counts)
+    return path
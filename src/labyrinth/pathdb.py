@@ -0,0 +1,317 @@
+## Compressed path database: first move of the min path between any two cells
+from .graphs import Direction
+from .grid import EdgeGrid, memory_grid
+from .path import Path
+from .snapshot import _little_endian, _padding
+from array import array
+from bisect import bisect_right
+import mmap
+import multiprocessing
+import struct
+
+PATHDB_MAGIC = b"LABPDB\0\0"
+PATHDB_VERSION = 1
+
+# magic, version, area, door cost, number of runs
+_HEADER = struct.Struct("<8sIIqQ")
+
+# Codes of the first moves (1 N, 2 S, 3 W, 4 E, plus 4 if the move passes a door), 0 is no move
+_DIRECTIONS = (None, Direction.NORTH, Direction.SOUTH, Direction.WEST, Direction.EAST)
+_MOVES = ((1, 0, 1, Direction.NORTH), (2, 0, -1, Direction.SOUTH), (3, -1, 0, Direction.WEST), (4, 1, 0, Direction.EAST))
+_DOOR_MOVE = 4
+
+
+def hilbert_order(area: int) -> 'array':
+    """
+    Position of each cell of the area x area region (index y * area + x) in a Hilbert curve,
+    cells near in the labyrinth are near in the curve (positions 0 .. area*area - 1)
+    """
+    size = 1
+    while size < area:
+        size *= 2
+    keys = []
+    for index in range(area * area):
+        y, x = divmod(index, area)
+        key = 0
+        step = size // 2
+        while step > 0:
+            right = 1 if x & step else 0
+            up = 1 if y & step else 0
+            key += step * step * ((3 * right) ^ up)
+            if up == 0:
+                if right == 1:
+                    x = size - 1 - x
+                    y = size - 1 - y
+                x, y = y, x
+            step //= 2
+        keys.append(key)
+    order = array('i', bytes(4 * area * area))
+    for position, index in enumerate(sorted(range(area * area), key=keys.__getitem__)):
+        order[index] = position
+    return order
+
+
+def _neighbours(grid: EdgeGrid, area: int) -> 'list[list[tuple[int, int, bool]]]':
+    """
+    (next cell, move code, door) of the cells that can be reached from each cell in one move
+    """
+    neighbours = []
+    for index in range(area * area):
+        y, x = divmod(index, area)
+        cell = []
+        for code, delta_x, delta_y, direction in _MOVES:
+            next_x = x + delta_x
+            next_y = y + delta_y
+            if 0 <= next_x < area and 0 <= next_y < area:
+                kind = grid.get_edge(x, y, direction)
+                if kind != EdgeGrid.WALL:
+                    cell.append((next_y * area + next_x, code, kind == EdgeGrid.DOOR))
+        neighbours.append(cell)
+    return neighbours
+
+
+def _first_moves(neighbours: list, source: int) -> bytearray:
+    """
+    Code of the first move of a min path (doors first and then cells) from the source to each cell,
+    the cells are reached by door levels and by moves in each level (like BitsetWavefront)
+    """
+    first = bytearray(len(neighbours))
+    reached = bytearray(len(neighbours))
+    seeds: dict[int, list] = {0: [(source, 0)]}
+    while seeds:
+        # Cells through the doors of this level (first of the next level), by moves from the source
+        door_seeds: dict[int, list] = {}
+        frontier: list[int] = []
+        moves = 0
+        while frontier or seeds:
+            if frontier:
+                moves += 1
+                wave = seeds.pop(moves, [])
+                for cell in frontier:
+                    code = first[cell]
+                    for next_cell, move, door in neighbours[cell]:
+                        if reached[next_cell]:
+                            continue
+                        if door:
+                            door_seeds.setdefault(moves, []).append((next_cell, code or move + _DOOR_MOVE))
+                        else:
+                            wave.append((next_cell, code or move))
+            else:
+                moves = min(seeds)
+                wave = seeds.pop(moves)
+            frontier = []
+            for cell, code in wave:
+                if not reached[cell]:
+                    reached[cell] = 1
+                    first[cell] = code
+                    frontier.append(cell)
+        seeds = door_seeds
+    return first
+
+
+def _compress(first: bytearray, curve: 'list[int]') -> 'tuple[array, bytes]':
+    """
+    Runs (position in the curve where the run starts, move code) of the first moves in the curve order
+    """
+    starts = array('i')
+    codes = bytearray()
+    previous = -1
+    for position, cell in enumerate(curve):
+        code = first[cell]
+        if code != previous:
+            starts.append(position)
+            codes.append(code)
+            previous = code
+    return starts, bytes(codes)
+
+
+# Graph of each worker process of the build
+_worker_neighbours: list = None
+_worker_curve: 'list[int]' = None
+
+
+def _init_worker(neighbours: list, curve: 'list[int]'):
+    global _worker_neighbours, _worker_curve
+    _worker_neighbours = neighbours
+    _worker_curve = curve
+
+
+def _compress_row(source: int) -> 'tuple[array, bytes]':
+    return _compress(_first_moves(_worker_neighbours, source), _worker_curve)
+
+
+def build_path_database(labyrinth, filename: str, workers: int = None, chunksize: int = 64):
+    """
+    Writes the compressed path database of the working region of the labyrinth in a binary file.
+
+    For each source cell the first move of a min path to every target cell is stored as a row
+    in the order of a Hilbert curve (see hilbert_order()), the rows are run-length compressed
+    (long runs, the first move is the same for the targets near in the labyrinth).
+
+    Format (little endian, version PATHDB_VERSION), each section padded to 8 bytes:
+        header (see _HEADER), position of each cell in the curve (int32), first run of each
+        source (int64, cells + 1), start of each run in the curve (int32) and code of each run (uint8)
+
+    Args:
+        labyrinth: Labyrinth
+            Labyrinth with the walls and doors
+        filename: str
+            File of the database
+        workers: int
+            Number of worker processes for the rows, by default the number of CPUs (1 builds in this process)
+        chunksize: int
+            Number of rows sent to a worker at once
+
+    raise:
+        MemoryError
+            If the grid is disk-backed and the working region doesn't fit in its memory budget (see grid.memory_grid())
+    """
+    grid = memory_grid(labyrinth.edge_grid, labyrinth.active_area, "path database")
+    area = labyrinth.active_area
+    cells = area * area
+    neighbours = _neighbours(grid, area)
+    order = hilbert_order(area)
+    curve = [0] * cells
+    for index, position in enumerate(order):
+        curve[position] = index
+
+    if workers == 1:
+        _init_worker(neighbours, curve)
+        rows = map(_compress_row, range(cells))
+        pool = None
+    else:
+        pool = multiprocessing.Pool(workers, initializer=_init_worker, initargs=(neighbours, curve))
+        rows = pool.imap(_compress_row, range(cells), chunksize)
+    try:
+        offsets = array('q', [0])
+        starts = array('i')
+        codes = bytearray()
+        for row_starts, row_codes in rows:
+            starts.extend(row_starts)
+            codes.extend(row_codes)
+            offsets.append(len(starts))
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    header = _HEADER.pack(PATHDB_MAGIC, PATHDB_VERSION, area, labyrinth.DOOR_COST, len(starts))
+    with open(filename, "wb") as file:
+        for section in (header, _little_endian(order), _little_endian(offsets), _little_endian(starts), bytes(codes)):
+            file.write(section)
+            file.write(_padding(len(section)))
+
+
+class PathDatabase:
+    """
+    Compressed path database mapped from a file written by build_path_database().
+
+    A query is a walk of the table: the first move from the current cell to the goal
+    (binary search of the position of the goal in the runs of the row of the current cell)
+    until the goal, there is no search.
+
+    Atributtes:
+        version: int
+            Version of the format of the file
+        area: int
+            The database has the area x area cells of the labyrinth (index y * area + x)
+        door_cost: int
+            Cost of the doors of the labyrinth
+        runs: int
+            Number of runs of all the rows
+    """
+
+    def __init__(self, filename: str):
+        with open(filename, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        view = self._view = memoryview(self._map)
+        try:
+            magic, self.version, self.area, self.door_cost, self.runs = _HEADER.unpack_from(view, 0)
+        except struct.error:
+            raise ValueError("Error: " + filename + " is not a path database")
+        if magic != PATHDB_MAGIC:
+            raise ValueError("Error: " + filename + " is not a path database")
+        if self.version != PATHDB_VERSION:
+            raise ValueError("Error: unsupported path database version " + str(self.version))
+        self._offset = _HEADER.size + len(_padding(_HEADER.size))
+
+        cells = self.area * self.area
+        self._order = self._section(view, cells * 4).cast('i')
+        self._rows = self._section(view, (cells + 1) * 8).cast('q')
+        self._starts = self._section(view, self.runs * 4).cast('i')
+        self._codes = self._section(view, self.runs)
+
+    def _section(self, view: memoryview, size: int) -> memoryview:
+        section = view[self._offset:self._offset + size]
+        if len(section) != size:
+            raise ValueError("Error: truncated path database")
+        self._offset += size + len(_padding(size))
+        return section
+
+    def first_move(self, source: 'tuple[int, int]', target: 'tuple[int, int]') -> 'tuple[Direction | None, bool]':
+        """
+        Direction of the first move of a min path from the source cell to the target cell
+        and if the move passes a door, (None, False) if the target is the source or can't be reached
+        """
+        area = self.area
+        for x, y in (source, target):
+            if not (0 <= x < area and 0 <= y < area):
+                raise ValueError("Error: the cells must be in the area of the path database")
+        row = source[1] * area + source[0]
+        position = self._order[target[1] * area + target[0]]
+        run = bisect_right(self._starts, position, self._rows[row], self._rows[row + 1]) - 1
+        code = self._codes[run]
+        if code > _DOOR_MOVE:
+            return _DIRECTIONS[code - _DOOR_MOVE], True
+        return _DIRECTIONS[code], False
+
+    def query(self, start: 'tuple[int, int]', goal: 'tuple[int, int]') -> 'Path | None':
+        """
+        Min path (doors first and then cells) from the start cell to the goal cell
+
+        return:
+            The Path or None if the goal can't be reached
+        """
+        x, y = start
+        goal = tuple(goal)
+        runs = []
+        doors = 0
+        while (x, y) != goal:
+            direction, door = self.first_move((x, y), goal)
+            if direction is None:
+                return None
+            doors += door
+            if runs and runs[-1][0] == direction:
+                runs[-1] = (direction, runs[-1][1] + 1)
+            else:
+                runs.append((direction, 1))
+            delta_x, delta_y = Path.OFFSETS[direction]
+            x += delta_x
+            y += delta_y
+        return Path(start, runs, doors)
+
+    def close(self):
+        """
+        Releases the mapped file
+        """
+        for section in (self._order, self._rows, self._starts, self._codes):
+            section.release()
+        self._view.release()
+        self._map.close()
+
+    def __enter__(self) -> 'PathDatabase':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def load_path_database(filename: str) -> PathDatabase:
+    """
+    Maps a path database written by build_path_database()
+
+    raise:
+        ValueError
+            If the file is not a path database or its version is not supported
+    """
+    return PathDatabase(filename)
@@ -0,0 +1,189 @@
+## Records of labyrinths: text and json formats of the input
+from .labyrinth_objects import Wall, Door
+from .two_dimension import Point
+from .columns import ObjectColumns, LONG_DOOR
+from array import array
+
+END_OF_RECORDS = -1
+
+
+def create_wall(point_x: int, point_y: int, parallel: bool, longitude: int) -> Wall:
+    """
+    Create a wall from a start point, the line longitude and if its parallel to (x or y) axes
+    """
+    first_point = Point(point_x, point_y)
+    if parallel :
+        #parallel to (y) axis
+        second_point = Point(point_x, point_y + longitude)
+    else:
+        #parallel to (x) axis
+        second_point = Point(point_x+ longitude, point_y )
+
+    return Wall(first_point, second_point)
+
+def create_door(point_x: int, point_y: int, parallel: bool) -> Door:
+    """
+    Create a door from a start point, the line longitude is 1 and if its parallel to (x or y) axes
+    """
+    first_point = Point(point_x, point_y)
+    if parallel :
+        #parallel to (y) axis
+        second_point = Point(point_x, point_y + LONG_DOOR)
+    else:
+        #parallel to (x) axis
+        second_point = Point(point_x + LONG_DOOR, point_y )
+
+    return Door(first_point, second_point)
+
+
+class LabyrinthRecord:
+    """
+    One labyrinth of the input: its walls, doors and the position of the minotaurs
+
+    Text format (input.txt):
+        M N                     number of walls and doors (-1 -1 ends the input)
+        x y parallel longitude  M lines, one per wall (parallel 1 to Y axis, 0 to X axis)
+        x y parallel            N lines, one per door
+        x y                     position of the minotaurs
+
+    Json format (one object per record):
+        {"walls": [[x, y, parallel, longitude], ...], "doors": [[x, y, parallel], ...], "minotaurs": [x, y]}
+
+    Atributtes:
+        columns: ObjectColumns
+            Walls and doors of the record as columns (placed without objects, see Labyrinth.add_object_columns())
+        walls: list[Wall]
+            Wall objects of the columns (built when they are used)
+        doors: list[Door]
+            Door objects of the columns (built when they are used)
+        minotaurs: Point
+    """
+
+    def __init__(self, walls: 'list[Wall]', doors: 'list[Door]', minotaurs: Point, columns: ObjectColumns = None):
+        self.columns = columns if columns is not None else ObjectColumns.from_objects(walls, doors)
+        self.minotaurs = minotaurs
+
+    @classmethod
+    def from_columns(cls, columns: ObjectColumns, minotaurs: Point) -> 'LabyrinthRecord':
+        """
+        Record of the walls and doors in columns
+        """
+        return cls((), (), minotaurs, columns)
+
+    @property
+    def walls(self) -> 'list[Wall]':
+        return self.columns.walls()
+
+    @property
+    def doors(self) -> 'list[Door]':
+        return self.columns.doors()
+
+    @classmethod
+    def from_json(cls, data: dict) -> 'LabyrinthRecord':
+        """
+        Record from the json object of the record (already decoded)
+
+        raise:
+            ValueError
+                If the object is not a valid record
+        """
+        try:
+            columns = ObjectColumns()
+            for x, y, parallel, longitude in data.get("walls", []):
+                columns.wall_x.append(int(x))
+                columns.wall_y.append(int(y))
+                columns.wall_parallel.append(int(bool(int(parallel))))
+                columns.wall_length.append(int(longitude))
+            for x, y, parallel in data.get("doors", []):
+                columns.door_x.append(int(x))
+                columns.door_y.append(int(y))
+                columns.door_parallel.append(int(bool(int(parallel))))
+            m_x, m_y = data["minotaurs"]
+            return cls.from_columns(columns, Point(float(m_x), float(m_y)))
+        except (KeyError, TypeError, ValueError, AttributeError):
+            raise ValueError("Error: Invalid json record.")
+
+    def to_json(self) -> dict:
+        """
+        Json object of the record (see from_json())
+        """
+        columns = self.columns
+        walls = [list(wall) for wall in zip(columns.wall_x, columns.wall_y, columns.wall_parallel, columns.wall_length)]
+        doors = [list(door) for door in zip(columns.door_x, columns.door_y, columns.door_parallel)]
+        return {"walls": walls, "doors": doors, "minotaurs": [self.minotaurs.x, self.minotaurs.y]}
+
+    def apply(self, labyrinth, auto_size: bool = False):
+        """
+        Replaces the objects and the minotaurs of the labyrinth with the ones of the record
+
+        If auto_size, the labyrinth is clipped to the bounding box of the record (and grows if needed),
+        see Labyrinth.fit_to_objects()
+        """
+        labyrinth.eliminate_labyrinth_objs()
+        labyrinth.minotaurs = self.minotaurs
+        if auto_size:
+            labyrinth.fit_to_objects(columns=self.columns)
+        labyrinth.add_object_columns(self.columns)
+
+
+def _fields(line: str, number: int) -> 'list[str]':
+    parts = line.strip().split(" ")
+    if len(parts) != number: raise Exception("Error: Invalid format file.")
+    return parts
+
+
+def read_record(lines) -> 'LabyrinthRecord | None':
+    """
+    Reads the next record in text format from an iterator of lines
+
+    return:
+        The record, or None at the end of the records (-1 -1 line or end of the lines)
+    raise:
+        Exception
+            If the format of the record is not valid
+    """
+    first_line = next(lines, None)
+    if first_line is None:
+        return None
+    parts = _fields(first_line, 2)      # Get the two variables
+    n_walls = int(parts[0])
+    n_doors = int(parts[1])
+    if (n_walls == END_OF_RECORDS) or (n_doors == END_OF_RECORDS): return None
+    elif (n_walls < 0) or (n_doors < 0): raise Exception("Error: Invalid format file.")
+    # The objects are read as columns, they are placed in the grid without a Wall or a Door per object
+    wall_x, wall_y, wall_parallel, wall_length = array('i'), array('i'), array('i'), array('i')
+    door_x, door_y, door_parallel = array('i'), array('i'), array('i')
+    try:
+        # Get the walls of the labyrinth
+        for i in range(n_walls):
+            x_init, y_init, d_parallel, t_long = _fields(next(lines), 4)
+            wall_x.append(int(x_init))
+            wall_y.append(int(y_init))
+            wall_parallel.append(int(bool(int(d_parallel))))
+            wall_length.append(int(t_long))
+        #Get the doors of the labyrinth
+        for i in range(n_doors):
+            x_init, y_init, d_parallel = _fields(next(lines), 3)
+            door_x.append(int(x_init))
+            door_y.append(int(y_init))
+            door_parallel.append(int(bool(int(d_parallel))))
+
+        #Get the minotaurs position
+        m_x, m_y = _fields(next(lines), 2)
+    except StopIteration:
+        raise Exception("Error: Invalid format file.")
+    columns = ObjectColumns(wall_x, wall_y, wall_parallel, wall_length, door_x, door_y, door_parallel)
+    return LabyrinthRecord.from_columns(columns, Point(float(m_x), float(m_y)))
+
+
+def iter_records(lines):
+    """
+    Generator with the records in text format of an iterable of lines (a file),
+    the lines are read when the records are needed.
+    """
+    lines = iter(lines)
+    while True:
+        record = read_record(lines)
+        if record is None:
+            return
+        yield record
@@ -0,0 +1,124 @@
+## ASCII representation of the labyrinth, row by row
+from .labyrinth_objects import Door, Wall
+from .graphs import CellNode
+from .two_dimension import Point
+import math
+
+
+def path_cells(path) -> 'set[tuple[int, int]]':
+    """
+    Return the set of (x, y) coordinates of the cells of a path
+
+    Args:
+        path: list[CellNode] | Path | iterable of (x, y)
+            Cells of the path, None is an empty path
+    """
+    if path is None:
+        return set()
+    cells = set()
+    for cell in path:
+        if isinstance(cell, CellNode):
+            cells.add((int(cell.cell.bottom_left.x), int(cell.cell.bottom_left.y)))
+        else:
+            cells.add((int(cell[0]), int(cell[1])))
+    return cells
+
+
+def cells_containing(point: Point) -> 'set[tuple[int, int]]':
+    """
+    Return the (x, y) coordinates of the cells that contain the point (edges included),
+    a point in the edge of the cells is contained by 2 or 4 cells.
+    """
+    floor_x = math.floor(point.x)
+    floor_y = math.floor(point.y)
+    xs = [floor_x - 1, floor_x] if point.x == floor_x else [floor_x]
+    ys = [floor_y - 1, floor_y] if point.y == floor_y else [floor_y]
+    return {(x, y) for x in xs for y in ys}
+
+
+def _is_only_wall(obj) -> bool:
+    return isinstance(obj, Wall) and not(isinstance(obj, Door))
+
+
+def _cell_info(node: CellNode) -> str:
+    """
+    Representation of the walls of a cell "[|_|]"
+    """
+    middle = " "
+    left = " "
+    right = " "
+    if _is_only_wall(node.north_obj):
+        if _is_only_wall(node.south_obj):
+            middle = "="
+        else:
+            middle = "\u203E"
+    elif _is_only_wall(node.south_obj):
+        middle = "_"
+
+    if _is_only_wall(node.west_obj):
+        left = "|"
+    if _is_only_wall(node.east_obj):
+        right = "|"
+    return "[" + left + middle + right + "]"
+
+
+def render_cells(labyrinth, path=None, viewport: 'tuple[int, int, int, int]' = None, use_info: bool = False):
+    """
+    Generator with the rows of the labyrinth from top to bottom, each row is a list with the cell strings.
+
+    The membership of the path is checked with a set, so the cost is O(cells of the viewport + path length).
+
+    Args:
+        labyrinth: Labyrinth
+            Labyrinth to represent
+        path: list[CellNode] | Path | iterable of (x, y)
+            Cells represented as #
+        viewport: tuple[int, int, int, int]
+            Region (x, y, width, height) of cells to represent, (x, y) is its left bottom cell.
+            By default the whole labyrinth, the region is clipped to the labyrinth
+        use_info: bool
+            If True, the walls of the cells are represented and the path is "[ # ]",
+            if False Teseo is T, Minotaurs is M and the path is "[#]"
+    """
+    if viewport is None:
+        viewport = (labyrinth.MIN_COORD, labyrinth.MIN_COORD, labyrinth.MAX_COORD, labyrinth.MAX_COORD)
+    x, y, width, height = viewport
+    first_x = max(x, labyrinth.MIN_COORD)
+    last_x = min(x + width, labyrinth.MAX_COORD)
+    first_y = max(y, labyrinth.MIN_COORD)
+    last_y = min(y + height, labyrinth.MAX_COORD)
+
+    in_path = path_cells(path)
+    teseo = cells_containing(labyrinth.teseo)
+    minotaurs = cells_containing(labyrinth.minotaurs)
+
+    for row in range(last_y - 1, first_y - 1, -1):
+        sub = []
+        for column in range(first_x, last_x):
+            cell = (column, row)
+            if use_info:
+                if cell in in_path:
+                    sub.append("[ # ]")
+                else:
+                    sub.append(_cell_info(labyrinth.get_node(column, row)))
+            elif cell in teseo and cell in minotaurs:
+                sub.append("[T/M]")
+            elif cell in teseo:
+                sub.append("[T]")
+            elif cell in minotaurs:
+                sub.append("[M]")
+            elif cell in in_path:
+                sub.append("[#]")
+            else:
+                sub.append("[ ]")
+        yield sub
+
+
+def render_rows(labyrinth, path=None, viewport: 'tuple[int, int, int, int]' = None, use_info: bool = False):
+    """
+    Generator with the rows of the labyrinth from top to bottom as joined strings.
+
+    See render_cells() for the arguments.
+    """
+    for sub in render_cells(labyrinth, path, viewport, use_info):
+        yield "".join(sub)
@@ -0,0 +1,266 @@
+## Asyncio service that solves labyrinths for other local processes
+from .Labyrinth import Labyrinth
+from .records import LabyrinthRecord, read_record
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import asyncio
+import json
+import os
+
+# Labyrinth of each worker process, reused (and resized) for all its records
+_worker_labyrinth: Labyrinth = None
+
+
+def _init_worker():
+    global _worker_labyrinth
+    _worker_labyrinth = Labyrinth(walls=[], doors=[], max_area=2)
+
+
+def _warm_up():
+    return None
+
+
+def _solve_record(record: LabyrinthRecord) -> dict:
+    """
+    Solves a record in the labyrinth of the worker, the labyrinth is sized to the record
+    """
+    record.apply(_worker_labyrinth, auto_size=True)
+    path = _worker_labyrinth.teseo_to_minotaurs_path()
+    if path is None:
+        return {"is_possible": False, "doors": 0, "cells": 0, "path": "-"}
+    return {"is_possible": True, "doors": path.doors, "cells": len(path), "path": path.encode() or "-"}
+
+
+class SolveService:
+    """
+    Asyncio server that solves labyrinth records in a pool of warm worker processes.
+
+    Protocol (one connection can send many records):
+        request:  records in the text format of the input file (see LabyrinthRecord),
+                  or one json object per line; a "-1 -1" line ends the requests of the connection
+        response: one json line per record, in the order of the requests
+                  {"record": 0, "is_possible": true, "doors": 5, "cells": 13, "path": "E4N3W1S1W2S1"}
+                  or {"record": 0, "error": "..."} if the record is invalid or its timeout expires
+
+    Each connection has a queue of max_queue pending records, when it is full the service
+    stops reading the connection (backpressure) until the first results are sent.
+    At most max_concurrency records (of all the connections) are in the workers at the same time,
+    a record whose timeout expires keeps its slot until the worker finishes it.
+
+    Atributtes:
+        host: str
+            Host of the TCP socket (if path is None)
+        port: int
+            Port of the TCP socket, 0 for any free port (the port is updated by start())
+        path: str
+            Path of the Unix socket, if it is not None the service listens in it instead of TCP
+        workers: int
+            Number of worker processes
+        max_queue: int
+            Max pending records per connection
+        max_concurrency: int
+            Max records solving at the same time, by default the number of workers
+        timeout: float
+            Seconds to solve a record, the worker finishes the record (holding its slot) but its result is discarded
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, path: str = None, workers: int = 2,
+                 max_queue: int = 64, max_concurrency: int = None, timeout: float = 30.0):
+        self.host = host
+        self.port = port
+        self.path = path
+        self.workers = workers
+        self.max_queue = max_queue
+        self.max_concurrency = max_concurrency if max_concurrency is not None else workers
+        self.timeout = timeout
+        self._executor: ProcessPoolExecutor = None
+        self._server: asyncio.AbstractServer = None
+        self._slots: asyncio.Semaphore = None
+
+    async def start(self):
+        """
+        Starts the workers and listens in the socket
+        """
+        self._executor = ProcessPoolExecutor(self.workers, initializer=_init_worker)
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+        # All the workers are started before listening, a worker forked later would
+        # inherit the sockets of the connections and they would not be closed
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*[loop.run_in_executor(self._executor, _warm_up) for _ in range(self.workers)])
+        if self.path is not None:
+            self._server = await asyncio.start_unix_server(self._handle, path=self.path)
+        else:
+            self._server = await asyncio.start_server(self._handle, self.host, self.port)
+            self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        await self._server.serve_forever()
+
+    async def close(self):
+        """
+        Stops listening and stops the workers
+        """
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+            if self.path is not None and os.path.exists(self.path):
+                os.unlink(self.path)
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    async def __aenter__(self) -> 'SolveService':
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def _solve(self, record: LabyrinthRecord) -> dict:
+        """
+        Result of the record in a worker, or {"error": ...} if the timeout expires or the record fails.
+        The slot is released when the worker finishes the record (also after a timeout)
+        """
+        await self._slots.acquire()
+        future = asyncio.get_running_loop().run_in_executor(self._executor, _solve_record, record)
+        future.add_done_callback(self._release)
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), self.timeout)
+        except asyncio.TimeoutError:
+            return {"error": "timeout"}
+        except Exception as error:
+            return {"error": str(error) or type(error).__name__}
+
+    def _release(self, future: asyncio.Future):
+        if not future.cancelled():
+            # Retrieved, so the errors of the records after a timeout are not logged
+            future.exception()
+        self._slots.release()
+
+    async def _read_records(self, reader: asyncio.StreamReader, pending: asyncio.Queue):
+        """
+        Reads the records of the connection and puts their tasks in the queue,
+        the put waits while the queue is full
+        """
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                line = line.decode().strip()
+                if not line:
+                    continue
+                if line.startswith("{"):
+                    try:
+                        record = LabyrinthRecord.from_json(json.loads(line))
+                    except ValueError as error:
+                        await pending.put(self._error(str(error)))
+                        continue
+                else:
+                    try:
+                        record = read_record(await self._record_lines(line, reader))
+                    except Exception as error:
+                        # The rest of the connection can't be parsed
+                        await pending.put(self._error(str(error)))
+                        break
+                    if record is None:
+                        break
+                await pending.put(asyncio.ensure_future(self._solve(record)))
+        finally:
+            await pending.put(None)
+
+    @staticmethod
+    async def _record_lines(first_line: str, reader: asyncio.StreamReader):
+        """
+        Lines of a record in text format (the number of lines is in the first line)
+        """
+        lines = [first_line]
+        parts = first_line.split(" ")
+        if len(parts) == 2 and all(part.lstrip("-").isdigit() for part in parts):
+            n_walls, n_doors = int(parts[0]), int(parts[1])
+            if n_walls >= 0 and n_doors >= 0:
+                for _ in range(n_walls + n_doors + 1):
+                    line = await reader.readline()
+                    if not line:
+                        break
+                    lines.append(line.decode().strip())
+        return iter(lines)
+
+    @staticmethod
+    def _error(message: str) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        future.set_result({"error": message})
+        return future
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        pending = asyncio.Queue(self.max_queue)
+        reading = asyncio.ensure_future(self._read_records(reader, pending))
+        record = 0
+        try:
+            while True:
+                task = await pending.get()
+                if task is None:
+                    break
+                result = {"record": record}
+                result.update(await task)
+                writer.write((json.dumps(result) + "\n").encode())
+                await writer.drain()
+                record += 1
+        except ConnectionError:
+            reading.cancel()
+        finally:
+            writer.close()
+
+
+async def solve_remote(records: 'list[LabyrinthRecord | str]', host: str = "127.0.0.1", port: int = None,
+                       path: str = None) -> 'list[dict]':
+    """
+    Client of the SolveService, sends the records and returns the results (in the same order)
+
+    Args:
+        records: list[LabyrinthRecord | str]
+            Records to solve, LabyrinthRecord are sent as json, strings are sent as they are (text format)
+        host: str
+        port: int
+            Address of the TCP socket of the service
+        path: str
+            Path of the Unix socket of the service (instead of host and port)
+    """
+    if path is not None:
+        reader, writer = await asyncio.open_unix_connection(path)
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+    for record in records:
+        if isinstance(record, LabyrinthRecord):
+            record = json.dumps(record.to_json())
+        writer.write((record.strip() + "\n").encode())
+    writer.write(b"-1 -1\n")
+    await writer.drain()
+
+    results = []
+    while True:
+        line = await reader.readline()
+        if not line:
+            break
+        results.append(json.loads(line))
+    writer.close()
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Service that solves labyrinths")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", default=None, help="Path of a Unix socket (instead of TCP)")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--max-queue", type=int, default=64, help="Max pending records per connection")
+    parser.add_argument("--max-concurrency", type=int, default=None, help="Max records solving at the same time")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Seconds to solve a record")
+    args = parser.parse_args()
+
+    service = SolveService(args.host, args.port, args.unix, args.workers, args.max_queue,
+                           args.max_concurrency, args.timeout)
+    asyncio.run(service.serve_forever())
@@ -0,0 +1,158 @@
+## Grid of the labyrinth in shared memory for parallel queries in worker processes
+from .grid import EdgeGrid, memory_grid
+from .Labyrinth import Labyrinth
+from multiprocessing import shared_memory
+import multiprocessing
+
+
+class SharedEdgeGrid(EdgeGrid):
+    """
+    EdgeGrid with the vertical and horizontal edges in one block of shared memory
+    (multiprocessing.shared_memory), other processes attach to the block by its name
+    without copying the maze.
+
+    Use create() or from_grid() in the process that owns the block and attach() in the workers.
+    The owner must call unlink() when the block is no longer needed.
+
+    Atributtes:
+        name: str
+            Name of the shared memory block
+        readonly: bool
+            If the edges can't be modified (attached by the workers)
+    """
+
+    def __init__(self, memory: shared_memory.SharedMemory, width: int, height: int, readonly: bool = False):
+        self._memory = memory
+        self.name = memory.name
+        self.width = width
+        self.height = height
+        self.readonly = readonly
+        buffer = memory.buf.toreadonly() if readonly else memory.buf
+        vertical_size = (width + 1) * height
+        self.vertical = buffer[:vertical_size]
+        self.horizontal = buffer[vertical_size:vertical_size + width * (height + 1)]
+
+    @staticmethod
+    def _size(width: int, height: int) -> int:
+        return (width + 1) * height + width * (height + 1)
+
+    @classmethod
+    def create(cls, width: int, height: int = None) -> 'SharedEdgeGrid':
+        """
+        Creates an empty grid in a new block of shared memory,
+        can be used as grid_factory of a Labyrinth
+        """
+        if height is None:
+            height = width
+        memory = shared_memory.SharedMemory(create=True, size=max(cls._size(width, height), 1))
+        grid = cls(memory, width, height)
+        grid.clear()
+        return grid
+
+    @classmethod
+    def from_grid(cls, grid: EdgeGrid) -> 'SharedEdgeGrid':
+        """
+        Copies an in-memory grid into a new block of shared memory, the block is destroyed if the copy fails
+        """
+        shared = cls.create(grid.width, grid.height)
+        try:
+            shared.vertical[:] = grid.vertical
+            shared.horizontal[:] = grid.horizontal
+        except BaseException:
+            shared.unlink()
+            raise
+        return shared
+
+    @classmethod
+    def attach(cls, name: str, width: int, height: int = None, readonly: bool = True) -> 'SharedEdgeGrid':
+        """
+        Attaches to the block of shared memory of a grid created by other process (read-only by default)
+        """
+        if height is None:
+            height = width
+        try:
+            memory = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            # Before python 3.13 the block is always tracked, the workers of a Pool share
+            # the resource tracker of the owner, so it is only released once
+            memory = shared_memory.SharedMemory(name=name)
+        return cls(memory, width, height, readonly)
+
+    def close(self):
+        """
+        Detaches this process from the block, the grid can't be used after
+        """
+        if self._memory is not None:
+            self.vertical.release()
+            self.horizontal.release()
+            self._memory.close()
+            self._memory = None
+
+    def unlink(self):
+        """
+        Detaches and destroys the block of shared memory (only the owner)
+        """
+        memory = self._memory
+        self.close()
+        if memory is not None:
+            memory.unlink()
+
+    def __repr__(self) -> str:
+        return "".join(["SharedEdgeGrid(", str(self.width), "x", str(self.height), ", ", self.name, ")"])
+
+
+# Labyrinth of each worker process, attached to the shared grid
+_worker_labyrinth: Labyrinth = None
+
+
+def _init_worker(name: str, max_area: int, active_area: int):
+    global _worker_labyrinth
+    grid = SharedEdgeGrid.attach(name, max_area)
+    _worker_labyrinth = Labyrinth(walls=[], doors=[], max_area=max_area, grid_factory=lambda size: grid)
+    _worker_labyrinth.active_area = active_area
+    _worker_labyrinth._objects_area = max_area
+
+
+def _solve_query(query: 'tuple[Point, Point]') -> 'Path | None':
+    _worker_labyrinth.teseo, _worker_labyrinth.minotaurs = query
+    try:
+        return _worker_labyrinth.teseo_to_minotaurs_path()
+    finally:
+        # Only the shared edges are kept between queries, the nodes are built again by the next search
+        _worker_labyrinth.release_nodes()
+
+
+def solve_parallel(labyrinth: Labyrinth, queries: 'list[tuple[Point, Point]]', workers: int = None,
+                   chunksize: int = 16) -> 'list[Path | None]':
+    """
+    Solves many (teseo, minotaurs) queries on the same labyrinth in worker processes.
+
+    The grid of the labyrinth is in shared memory (copied once if it is not a SharedEdgeGrid,
+    a TiledEdgeGrid only if the working region fits in its memory budget, see grid.memory_grid()),
+    so there is only one copy of the maze for all the workers. Each worker only keeps the
+    search state of the query it is solving, the nodes are released after each query.
+
+    Args:
+        labyrinth: Labyrinth
+            Labyrinth with the walls and doors
+        queries: list[tuple[Point, Point]]
+            Pairs of (teseo, minotaurs) positions
+        workers: int
+            Number of worker processes, by default the number of CPUs
+        chunksize: int
+            Number of queries sent to a worker at once
+
+    return:
+        The Path of each query (in the order of the queries), None if the minotaurs can't be reached
+    """
+    grid = labyrinth.edge_grid
+    owned = not isinstance(grid, SharedEdgeGrid)
+    if owned:
+        grid = SharedEdgeGrid.from_grid(memory_grid(grid, labyrinth.active_area, "shared"))
+    try:
+        with multiprocessing.Pool(workers, initializer=_init_worker,
+                                  initargs=(grid.name, grid.width, labyrinth.active_area)) as pool:
+            return pool.map(_solve_query, queries, chunksize)
+    finally:
+        if owned:
+            grid.unlink()
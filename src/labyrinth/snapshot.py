@@ -0,0 +1,210 @@
+## Binary snapshots of built labyrinths to start the workers from a prepared maze
+from .labyrinth_objects import Door, Wall
+from .two_dimension import Point
+from .grid import EdgeGrid
+from .path import Path
+from .Labyrinth import Labyrinth
+from .fields import connected_components, distance_field
+from array import array
+import mmap
+import struct
+import sys
+
+SNAPSHOT_MAGIC = b"LABSNAP\0"
+SNAPSHOT_VERSION = 1
+
+# magic, version, flags, max_area, active_area, objects_area, teseo (x, y), minotaurs (x, y),
+# number of walls, number of doors, cells of the indexes (area), origin of the distance field (x, y)
+_HEADER = struct.Struct("<8sHHIII4dIIIii")
+_ALIGNMENT = 8
+
+FLAG_COMPONENTS = 1
+FLAG_DISTANCES = 2
+
+def _objects_to_array(objects: 'list[Wall]') -> 'array':
+    coords = array('d')
+    for obj in objects:
+        coords.extend((obj.edge1.x, obj.edge1.y, obj.edge2.x, obj.edge2.y))
+    return coords
+
+
+def _number(value: float):
+    return int(value) if value.is_integer() else value
+
+
+def _little_endian(values: 'array') -> bytes:
+    if sys.byteorder != "little":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _padding(size: int) -> bytes:
+    return bytes(-size % _ALIGNMENT)
+
+
+def save_snapshot(labyrinth: Labyrinth, filename: str, components: bool = False, distances: bool = False):
+    """
+    Writes a snapshot of the labyrinth (edges of the grid, objects, teseo and the minotaurs) in a binary file.
+    The edges are written from memory, a disk-backed grid is copied tile by tile (all the grid) first.
+
+    Format (little endian, version SNAPSHOT_VERSION), each section padded to 8 bytes:
+        header (see _HEADER), vertical edges, horizontal edges, walls and doors as
+        4 doubles (x1, y1, x2, y2), components as int32 and distance field as int64 per cell
+        of the active area of the labyrinth (optional indexes, see the flags)
+
+    Args:
+        labyrinth: Labyrinth
+            Labyrinth to save
+        filename: str
+            File of the snapshot
+        components: bool
+            Save the connected components of the cells (see connected_components())
+        distances: bool
+            Save the distance field from the cell of teseo (see distance_field())
+    """
+    grid = labyrinth.edge_grid
+    if not isinstance(grid, EdgeGrid):
+        grid = grid.to_edge_grid()
+    area = labyrinth.active_area
+    origin = Path.node_coords(labyrinth.get_node_contains(labyrinth.teseo)[0])
+    flags = (FLAG_COMPONENTS if components else 0) | (FLAG_DISTANCES if distances else 0)
+    walls, doors = labyrinth.labyrinth_objs()
+
+    header = _HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, flags,
+                          labyrinth.MAX_COORD, labyrinth.active_area, labyrinth._objects_area,
+                          labyrinth.teseo.x, labyrinth.teseo.y, labyrinth.minotaurs.x, labyrinth.minotaurs.y,
+                          len(walls), len(doors), area, origin[0], origin[1])
+    sections = [header, bytes(grid.vertical), bytes(grid.horizontal),
+                _little_endian(_objects_to_array(walls)),
+                _little_endian(_objects_to_array(doors))]
+    if components:
+        sections.append(_little_endian(connected_components(grid, area)))
+    if distances:
+        sections.append(_little_endian(distance_field(grid, origin, area, labyrinth.DOOR_COST)))
+
+    with open(filename, "wb") as file:
+        for section in sections:
+            file.write(section)
+            file.write(_padding(len(section)))
+
+
+class Snapshot:
+    """
+    Labyrinth restored from a snapshot file, with the optional indexes of the snapshot.
+
+    The file is mapped in memory (mmap), the edges of the grid are copied in one block
+    and the indexes are read directly from the mapped file.
+
+    Atributtes:
+        labyrinth: Labyrinth
+            The restored labyrinth (the nodes are built lazily from its grid)
+        version: int
+            Version of the format of the file
+        area: int
+            The indexes are of the area x area cells
+        origin: tuple[int, int]
+            Cell of teseo, origin of the distance field
+        components: memoryview | None
+            Connected component of each cell (index y * area + x)
+        distances: memoryview | None
+            Cost of the min path from the origin to each cell (index y * area + x), -1 if not reachable
+    """
+
+    def __init__(self, filename: str):
+        with open(filename, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        view = self._view = memoryview(self._map)
+        try:
+            (magic, self.version, flags, max_area, active_area, objects_area, teseo_x, teseo_y,
+             minotaurs_x, minotaurs_y, number_of_walls, number_of_doors, self.area,
+             origin_x, origin_y) = _HEADER.unpack_from(view, 0)
+        except struct.error:
+            raise ValueError("Error: " + filename + " is not a labyrinth snapshot")
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError("Error: " + filename + " is not a labyrinth snapshot")
+        if self.version != SNAPSHOT_VERSION:
+            raise ValueError("Error: unsupported snapshot version " + str(self.version))
+        self.origin = (origin_x, origin_y)
+        self._offset = _HEADER.size + len(_padding(_HEADER.size))
+
+        vertical = self._section(view, (max_area + 1) * max_area)
+        horizontal = self._section(view, max_area * (max_area + 1))
+        walls = self._objects(self._section(view, number_of_walls * 32).cast('d'), Wall)
+        doors = self._objects(self._section(view, number_of_doors * 32).cast('d'), Door)
+
+        labyrinth = Labyrinth(Point(_number(minotaurs_x), _number(minotaurs_y)), Point(_number(teseo_x), _number(teseo_y)),
+                              walls=[], doors=[], max_area=max_area)
+        labyrinth.edge_grid.vertical[:] = vertical
+        labyrinth.edge_grid.horizontal[:] = horizontal
+        labyrinth._walls.extend(walls)
+        labyrinth._doors.extend(doors)
+        labyrinth.active_area = active_area
+        labyrinth._objects_area = objects_area
+        self.labyrinth = labyrinth
+
+        cells = self.area * self.area
+        self.components = self._section(view, cells * 4).cast('i') if flags & FLAG_COMPONENTS else None
+        self.distances = self._section(view, cells * 8).cast('q') if flags & FLAG_DISTANCES else None
+
+    def _section(self, view: memoryview, size: int) -> memoryview:
+        section = view[self._offset:self._offset + size]
+        if len(section) != size:
+            raise ValueError("Error: truncated labyrinth snapshot")
+        self._offset += size + len(_padding(size))
+        return section
+
+    @staticmethod
+    def _objects(coords: memoryview, kind) -> 'list[Wall]':
+        return [kind(Point(_number(coords[i]), _number(coords[i + 1])), Point(_number(coords[i + 2]), _number(coords[i + 3])))
+                for i in range(0, len(coords), 4)]
+
+    def same_component(self, first: 'tuple[int, int]', second: 'tuple[int, int]') -> bool:
+        """
+        Tells if there is a path between two cells (needs the components index)
+        """
+        if self.components is None:
+            raise ValueError("Error: the snapshot has no components index")
+        return self.components[first[1] * self.area + first[0]] == self.components[second[1] * self.area + second[0]]
+
+    def doors_and_cells(self, cell: 'tuple[int, int]') -> 'tuple[int, int] | None':
+        """
+        Number of doors and cells of the min path from the origin (teseo) to the cell,
+        None if it can't be reached (needs the distance field)
+        """
+        if self.distances is None:
+            raise ValueError("Error: the snapshot has no distance field")
+        cost = self.distances[cell[1] * self.area + cell[0]]
+        if cost < 0:
+            return None
+        doors, moves = divmod(cost, self.labyrinth.DOOR_COST)
+        return doors, moves // self.labyrinth.EMPTY_COST + 1
+
+    def close(self):
+        """
+        Releases the mapped file, the restored labyrinth is still valid
+        """
+        for index in (self.components, self.distances):
+            if index is not None:
+                index.release()
+        self.components = None
+        self.distances = None
+        self._view.release()
+        self._map.close()
+
+    def __enter__(self) -> 'Snapshot':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def load_snapshot(filename: str) -> Snapshot:
+    """
+    Restores a labyrinth saved with save_snapshot()
+
+    raise:
+        ValueError
+            If the file is not a snapshot or its version is not supported
+    """
+    return Snapshot(filename)
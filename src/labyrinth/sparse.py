@@ -0,0 +1,353 @@
+## Coordinate-compressed labyrinth for big and mostly empty maps
+from .labyrinth_objects import Door
+from .two_dimension import Point
+from .graphs import Direction
+from .grid import EdgeGrid
+from .path import Path
+from bisect import bisect_left
+import heapq
+import math
+
+
+class _LineIntervals:
+    """
+    Intervals of cells [first, last) covered by objects of one kind in each line
+    """
+
+    def __init__(self):
+        self._intervals: 'dict[int, list[tuple[int, int]]]' = {}
+        self._starts: 'dict[int, list[int]]' = {}
+
+    def add(self, line: int, first: int, last: int):
+        self._intervals.setdefault(line, []).append((first, last))
+
+    def build(self):
+        """
+        Merge the overlapping intervals of each line, must be called after adding the objects
+        """
+        for line, intervals in self._intervals.items():
+            intervals.sort()
+            merged = []
+            for first, last in intervals:
+                if merged and first <= merged[-1][1]:
+                    merged[-1] = (merged[-1][0], max(merged[-1][1], last))
+                else:
+                    merged.append((first, last))
+            self._intervals[line] = merged
+            self._starts[line] = [first for first, _ in merged]
+
+    def paint(self, line: int, starts: 'list[int]', kinds: bytearray, kind: int):
+        """
+        Sets the kind in the compressed cells (with the first cells starts) covered by the line
+        """
+        for first, last in self._intervals.get(line, ()):
+            for index in range(bisect_left(starts, first), bisect_left(starts, last)):
+                kinds[index] = kind
+
+
+class _LineObjects:
+    """
+    Walls and doors of the lines of one orientation (all the lines X = a or all the lines Y = b),
+    doors overwrite walls.
+    """
+
+    def __init__(self):
+        self.walls = _LineIntervals()
+        self.doors = _LineIntervals()
+
+    def build(self):
+        self.walls.build()
+        self.doors.build()
+
+    def kinds(self, line: int, starts: 'list[int]') -> bytearray:
+        """
+        Kinds (EdgeGrid.EMPTY, DOOR or WALL) of the edges of the line in each compressed cell,
+        starts are the first cells of the compressed cells along the line
+        """
+        kinds = bytearray(len(starts))
+        self.walls.paint(line, starts, kinds, EdgeGrid.WALL)
+        self.doors.paint(line, starts, kinds, EdgeGrid.DOOR)
+        return kinds
+
+
+class SparseLabyrinth:
+    """
+    Labyrinth for huge and mostly empty maps (coordinates up to 10^6 or more) with few objects.
+
+    The X and Y coordinates are compressed: the columns (and rows) of cells next to
+    a wall, a door, Teseo or the minotaurs are kept as columns of 1 cell, and all the
+    empty columns between two of them are one "band" column with the width of all of them.
+    A compressed cell is a rectangle of cells, passing to a compressed cell costs its width
+    (moving in the X axis) or its height (moving in the Y axis) in cells.
+
+    All the objects are in the lines between compressed cells, and the min paths of the
+    labyrinth can always be moved to the rows and columns of 1 cell (the plane between them
+    is empty), so the number of doors and cells are the same than in a Labyrinth.
+    Memory and time depend on the number of objects and not on the area of the map.
+
+    Atributtes:
+        minotaurs: Point
+            Position of the minotaurs
+        teseo: Point
+            Position of teseo
+        max_area: int
+            The map is [0, max_area) in X and Y, by default the bounding box of the objects
+            plus a margin of 1 cell (see Labyrinth.bounding_area())
+        DOOR_COST: int
+            Cost of pass a door, more than the max number of cells of a path
+        expanded: int
+            Number of compressed cells expanded in the last search
+    """
+    MARGIN = 1
+
+    def __init__(self, minotaurs: Point, teseo: Point = Point(0,0),
+                 walls: 'list[Wall]' = (), doors: 'list[Door]' = (), max_area: int = None):
+        self.minotaurs = minotaurs
+        self.teseo = teseo
+        walls = list(walls)
+        doors = list(doors)
+
+        if max_area is None:
+            max_coord = max(teseo.x, teseo.y, minotaurs.x, minotaurs.y)
+            for obj in walls + doors:
+                max_coord = max(max_coord, obj.edge1.x, obj.edge1.y, obj.edge2.x, obj.edge2.y)
+            max_area = max(math.ceil(max_coord) + self.MARGIN, 2)
+        self.max_area = max_area
+        self.DOOR_COST = max_area * max_area
+        self.expanded = 0
+
+        # Objects of the lines X = a (vertical) and Y = b (horizontal)
+        self._vertical = _LineObjects()
+        self._horizontal = _LineObjects()
+        key_xs = {0, max_area - 1}
+        key_ys = {0, max_area - 1}
+
+        for obj in walls + doors:
+            is_door = isinstance(obj, Door)
+            if obj.edge1.y == obj.edge2.y and obj.edge1.y == math.floor(obj.edge1.y):
+                line = int(obj.edge1.y)
+                first = math.floor(min(obj.edge1.x, obj.edge2.x))
+                last = math.ceil(max(obj.edge1.x, obj.edge2.x))
+                if first >= last:
+                    continue
+                (self._horizontal.doors if is_door else self._horizontal.walls).add(line, first, last)
+                key_ys.update((line - 1, line))
+                key_xs.update((first - 1, first, last - 1, last))
+            elif obj.edge1.x == obj.edge2.x and obj.edge1.x == math.floor(obj.edge1.x):
+                line = int(obj.edge1.x)
+                first = math.floor(min(obj.edge1.y, obj.edge2.y))
+                last = math.ceil(max(obj.edge1.y, obj.edge2.y))
+                if first >= last:
+                    continue
+                (self._vertical.doors if is_door else self._vertical.walls).add(line, first, last)
+                key_xs.update((line - 1, line))
+                key_ys.update((first - 1, first, last - 1, last))
+        self._vertical.build()
+        self._horizontal.build()
+
+        self.start = self.cell_of(teseo)
+        self.goal = self.cell_of(minotaurs)
+        if self.start is None or self.goal is None:
+            raise ValueError("Error: Minotaurs must be in the labyrinth coordenates")
+        key_xs.update((self.start[0], self.goal[0]))
+        key_ys.update((self.start[1], self.goal[1]))
+
+        self._column_starts, self._column_widths = self._compress(key_xs)
+        self._row_starts, self._row_heights = self._compress(key_ys)
+        # prefix sums of the widths/heights for the heuristic
+        self._column_prefix = self._prefix(self._column_widths)
+        self._row_prefix = self._prefix(self._row_heights)
+        self._west_cache: 'dict[int, bytearray]' = {}
+        self._south_cache: 'dict[int, bytearray]' = {}
+
+    def cell_of(self, point: Point) -> 'tuple[int, int] | None':
+        """
+        Cell (x, y) that contains the point, the same cell than Labyrinth.get_node_contains(point)[0]
+        None if the point is not in the map
+        """
+        floor_x = math.floor(point.x)
+        floor_y = math.floor(point.y)
+        on_x = point.x == floor_x
+        on_y = point.y == floor_y
+        if on_x and on_y:
+            candidates = [(floor_x - 1, floor_y), (floor_x, floor_y), (floor_x - 1, floor_y - 1), (floor_x, floor_y - 1)]
+        elif on_y:
+            candidates = [(floor_x, floor_y - 1), (floor_x, floor_y)]
+        elif on_x:
+            candidates = [(floor_x, floor_y), (floor_x - 1, floor_y)]
+        else:
+            candidates = [(floor_x, floor_y)]
+        for x, y in candidates:
+            if 0 <= x < self.max_area and 0 <= y < self.max_area:
+                return (x, y)
+        return None
+
+    def _compress(self, keys: 'set[int]') -> 'tuple[list[int], list[int]]':
+        """
+        Compressed columns (or rows) as the lists of the first cell and the width of each one
+        """
+        keys = sorted(key for key in keys if 0 <= key < self.max_area)
+        starts = []
+        widths = []
+        for index, key in enumerate(keys):
+            starts.append(key)
+            widths.append(1)
+            following = keys[index + 1] if index + 1 < len(keys) else self.max_area
+            if following - key > 1:
+                # Band of empty columns between two key columns
+                starts.append(key + 1)
+                widths.append(following - key - 1)
+        return starts, widths
+
+    @staticmethod
+    def _prefix(widths: 'list[int]') -> 'list[int]':
+        result = [0]
+        for width in widths:
+            result.append(result[-1] + width)
+        return result
+
+    @property
+    def compressed_size(self) -> 'tuple[int, int]':
+        """
+        Number of compressed columns and rows
+        """
+        return len(self._column_starts), len(self._row_starts)
+
+    def _west_kinds(self, column: int) -> bytearray:
+        """
+        Kinds of the west edges of the compressed column in each compressed row,
+        the objects are the same along all the edge of a compressed cell.
+        Built when the search reaches the column for the first time.
+        """
+        kinds = self._west_cache.get(column)
+        if kinds is None:
+            kinds = self._vertical.kinds(self._column_starts[column], self._row_starts)
+            self._west_cache[column] = kinds
+        return kinds
+
+    def _south_kinds(self, row: int) -> bytearray:
+        """
+        Kinds of the south edges of the compressed row in each compressed column
+        """
+        kinds = self._south_cache.get(row)
+        if kinds is None:
+            kinds = self._horizontal.kinds(self._row_starts[row], self._column_starts)
+            self._south_cache[row] = kinds
+        return kinds
+
+    def _heuristic(self, column: int, row: int, goal_column: int, goal_row: int) -> int:
+        """
+        Cells that must be crossed in X and Y to reach the goal, never overestimates the cost
+        """
+        if column < goal_column:
+            cost = self._column_prefix[goal_column + 1] - self._column_prefix[column + 1]
+        else:
+            cost = self._column_prefix[column] - self._column_prefix[goal_column]
+        if row < goal_row:
+            cost += self._row_prefix[goal_row + 1] - self._row_prefix[row + 1]
+        else:
+            cost += self._row_prefix[row] - self._row_prefix[goal_row]
+        return cost
+
+    def teseo_to_minotaurs_path(self) -> 'Path | None':
+        """
+        Get the min path (min doors first and min cells second) from teseo to the minotaurs
+
+        A* search over the compressed cells, passing to a compressed cell costs its width or height.
+
+        return:
+            The Path from teseo to the minotaurs (len(path) cells, path.doors doors),
+            or None if is not possible to reach them
+        """
+        columns = len(self._column_starts)
+        rows = len(self._row_starts)
+        start = (bisect_left(self._column_starts, self.start[0]), bisect_left(self._row_starts, self.start[1]))
+        goal = (bisect_left(self._column_starts, self.goal[0]), bisect_left(self._row_starts, self.goal[1]))
+
+        cost_so_far = {start: 0}
+        came_from = {start: None}
+        # Ties of the priority are broken by the deepest cell (-cost), there are a lot of ties
+        # in the empty regions, and the deepest cell is the nearest to the goal
+        frontier = [(self._heuristic(*start, *goal), 0, start)]
+        self.expanded = 0
+        widths = self._column_widths
+        heights = self._row_heights
+
+        while frontier:
+            _, cost, current = heapq.heappop(frontier)
+            cost = -cost
+            if cost > cost_so_far[current]:
+                continue
+            self.expanded += 1
+            if current == goal:
+                break
+            column, row = current
+            west = self._west_kinds(column)
+            south = self._south_kinds(row)
+            neighbours = []
+            if row + 1 < rows:
+                neighbours.append((column, row + 1, Direction.NORTH, self._south_kinds(row + 1)[column], heights[row + 1]))
+            if row > 0:
+                neighbours.append((column, row - 1, Direction.SOUTH, south[column], heights[row - 1]))
+            if column > 0:
+                neighbours.append((column - 1, row, Direction.WEST, west[row], widths[column - 1]))
+            if column + 1 < columns:
+                neighbours.append((column + 1, row, Direction.EAST, self._west_kinds(column + 1)[row], widths[column + 1]))
+
+            for next_column, next_row, direction, kind, step in neighbours:
+                if kind == EdgeGrid.WALL:
+                    continue
+                new_cost = cost + step + (self.DOOR_COST if kind == EdgeGrid.DOOR else 0)
+                next_cell = (next_column, next_row)
+                if next_cell not in cost_so_far or new_cost < cost_so_far[next_cell]:
+                    cost_so_far[next_cell] = new_cost
+                    came_from[next_cell] = (current, direction)
+                    priority = new_cost + self._heuristic(next_column, next_row, *goal)
+                    heapq.heappush(frontier, (priority, -new_cost, next_cell))
+        else:
+            return None
+
+        # Compressed moves from the start to the goal
+        moves_path = []
+        current = goal
+        while came_from[current] is not None:
+            current, direction = came_from[current]
+            moves_path.append(direction)
+        moves_path.reverse()
+
+        doors = cost_so_far[goal] // self.DOOR_COST
+        return Path(self.start, self._expand_moves(start, moves_path), doors)
+
+    def _expand_moves(self, start: 'tuple[int, int]', moves: 'list[Direction]') -> 'list[tuple[Direction, int]]':
+        """
+        Moves of cells of a path of compressed cells.
+
+        Entering a band, the position stays in its first cell and only walks to the
+        other side of the band when the path leaves it by that side, so the cells
+        used are never more than the cost of the compressed path.
+        """
+        runs = []
+        column, row = start
+        x, y = self.start
+        for direction in moves:
+            if direction == Direction.EAST:
+                border = self._column_starts[column] + self._column_widths[column] - 1
+                runs.append((direction, border - x + 1))
+                column += 1
+                x = border + 1
+            elif direction == Direction.WEST:
+                border = self._column_starts[column]
+                runs.append((direction, x - border + 1))
+                column -= 1
+                x = border - 1
+            elif direction == Direction.NORTH:
+                border = self._row_starts[row] + self._row_heights[row] - 1
+                runs.append((direction, border - y + 1))
+                row += 1
+                y = border + 1
+            else:
+                border = self._row_starts[row]
+                runs.append((direction, y - border + 1))
+                row -= 1
+                y = border - 1
+        return runs
@@ -0,0 +1,41 @@
+## Statistics of the searches in the labyrinth
+import time
+
+
+class SearchStats:
+    """
+    Counters of the last search of a labyrinth, to compare heuristics and engines
+
+    Atributtes:
+        engine: str
+            Name of the engine (algorithm) of the search
+        expanded: int
+            Number of nodes taken from the frontier and expanded
+        pushed: int
+            Number of nodes put in the frontier (heap operations)
+        elapsed: float
+            Seconds of the search
+    """
+
+    def __init__(self, engine: str = "astar"):
+        self.reset(engine)
+
+    def reset(self, engine: str = "astar"):
+        """
+        Starts the counters of a new search
+        """
+        self.engine = engine
+        self.expanded = 0
+        self.pushed = 0
+        self.elapsed = 0.0
+        self._start = time.perf_counter()
+
+    def stop(self):
+        """
+        Ends the search, sets the elapsed time
+        """
+        self.elapsed = time.perf_counter() - self._start
+
+    def __repr__(self) -> str:
+        return "".join(["SearchStats(", self.engine, ", expanded=", str(self.expanded),
+                        ", pushed=", str(self.pushed), ", elapsed=", "%.6f" % self.elapsed, ")"])
@@ -0,0 +1,251 @@
+## Disk-backed storage of the walls and doors of the labyrinth for mazes bigger than the memory
+from .graphs import Direction
+from .grid import EdgeGrid
+from collections import OrderedDict
+import tempfile
+
+# Kind of the vertical edge and of the horizontal edge of each byte of a tile
+_VERTICAL_KINDS = bytes(value & 3 for value in range(256))
+_HORIZONTAL_KINDS = bytes((value >> 2) & 3 for value in range(256))
+
+
+class TiledEdgeGrid:
+    """
+    EdgeGrid stored in a file by tiles of tile_size x tile_size positions, with a LRU cache of tiles.
+
+    Each position (x, y) of the grid, 0 <= x <= width and 0 <= y <= height, is one byte with
+    the edge in the line X = x of the row y (bits 0-1) and the edge in the line Y = y
+    of the column x (bits 2-3), so a tile has all the edges of its cells.
+    The tiles are stored one after the other in the file (row of tiles by row of tiles) and are
+    loaded when they are used, the modified tiles are written back to the file when
+    they leave the cache or when the grid is flushed.
+
+    It has the same interface than EdgeGrid, so a Labyrinth can use it as backend:
+        Labyrinth(max_area=..., grid_factory=lambda size: TiledEdgeGrid(size, memory_budget=1 << 20))
+
+    Atributtes:
+        width: int
+            Number of cells in the X axis
+        height: int
+            Number of cells in the Y axis
+        tile_size: int
+            Number of positions of the side of a tile
+        memory_budget: int
+            Max bytes of the cached tiles (and of the in-memory copies of the engines, see grid.memory_grid())
+        max_tiles: int
+            Number of tiles in the cache, memory_budget // (tile_size^2) (at least 1)
+        hits: int
+            Number of tile accesses found in the cache
+        misses: int
+            Number of tile accesses loaded from the file
+        evictions: int
+            Number of tiles removed from the cache
+        writes: int
+            Number of tiles written back to the file
+    """
+    HORIZONTAL_SHIFT = 2
+    KIND_MASK = 3
+
+    def __init__(self, width: int, height: int = None, tile_size: int = 256,
+                 memory_budget: int = 1 << 24, path: str = None):
+        """
+        Initializes an empty grid
+
+        Args:
+            width: int
+                Number of cells in the X axis
+            height: int
+                Number of cells in the Y axis, by default width
+            tile_size: int
+                Number of positions of the side of a tile
+            memory_budget: int
+                Max bytes of the cached tiles
+            path: str
+                File of the tiles, it is created (or truncated), by default an anonymous temporary file
+        """
+        if height is None:
+            height = width
+        if tile_size < 1:
+            raise ValueError("Error: tile size should be positive")
+        self.width = width
+        self.height = height
+        self.tile_size = tile_size
+        self.memory_budget = memory_budget
+        self.max_tiles = max(1, memory_budget // (tile_size * tile_size))
+        self.tiles_x = width // tile_size + 1
+        self.tiles_y = height // tile_size + 1
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.writes = 0
+
+        self._file = open(path, "w+b") if path is not None else tempfile.TemporaryFile()
+        self._file_size = self.tiles_x * self.tiles_y * tile_size * tile_size
+        self._file.truncate(self._file_size)
+        self._cache: 'OrderedDict[int, bytearray]' = OrderedDict()
+        self._dirty: 'set[int]' = set()
+
+    def _tile(self, index: int) -> bytearray:
+        """
+        Tile with the index, loaded from the file if it is not in the cache
+        """
+        tile = self._cache.get(index)
+        if tile is not None:
+            self.hits += 1
+            self._cache.move_to_end(index)
+            return tile
+
+        self.misses += 1
+        if len(self._cache) >= self.max_tiles:
+            old_index, old_tile = self._cache.popitem(last=False)
+            self.evictions += 1
+            if old_index in self._dirty:
+                self._write_tile(old_index, old_tile)
+        tile_bytes = self.tile_size * self.tile_size
+        self._file.seek(index * tile_bytes)
+        tile = bytearray(self._file.read(tile_bytes))
+        self._cache[index] = tile
+        return tile
+
+    def _write_tile(self, index: int, tile: bytearray):
+        self._file.seek(index * len(tile))
+        self._file.write(tile)
+        self._dirty.discard(index)
+        self.writes += 1
+
+    def _position(self, x: int, y: int) -> 'tuple[int, int]':
+        """
+        Index of the tile and offset in the tile of the position (x, y)
+        """
+        tile_x, offset_x = divmod(x, self.tile_size)
+        tile_y, offset_y = divmod(y, self.tile_size)
+        return tile_y * self.tiles_x + tile_x, offset_y * self.tile_size + offset_x
+
+    def _get(self, x: int, y: int) -> int:
+        index, offset = self._position(x, y)
+        return self._tile(index)[offset]
+
+    def _set(self, x: int, y: int, kind: int, shift: int):
+        index, offset = self._position(x, y)
+        tile = self._tile(index)
+        tile[offset] = (tile[offset] & ~(self.KIND_MASK << shift)) | (kind << shift)
+        self._dirty.add(index)
+
+    def contains_cell(self, x: int, y: int) -> bool:
+        """
+        Tells if the cell (x, y) is inside of the grid
+        """
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def get_vertical(self, x: int, y: int) -> int:
+        """
+        Kind of the edge in the line X = x of the row y
+        """
+        return self._get(x, y) & self.KIND_MASK
+
+    def set_vertical(self, x: int, y: int, kind: int):
+        self._set(x, y, kind, 0)
+
+    def get_horizontal(self, x: int, y: int) -> int:
+        """
+        Kind of the edge in the line Y = y of the column x
+        """
+        return self._get(x, y) >> self.HORIZONTAL_SHIFT
+
+    def set_horizontal(self, x: int, y: int, kind: int):
+        self._set(x, y, kind, self.HORIZONTAL_SHIFT)
+
+    def get_edge(self, x: int, y: int, direction: Direction) -> int:
+        """
+        Kind of the object in the edge of the cell (x, y) in the given direction
+        """
+        if direction == Direction.NORTH:
+            return self.get_horizontal(x, y + 1)
+        elif direction == Direction.SOUTH:
+            return self.get_horizontal(x, y)
+        elif direction == Direction.WEST:
+            return self.get_vertical(x, y)
+        else:
+            return self.get_vertical(x + 1, y)
+
+    def set_edge(self, x: int, y: int, direction: Direction, kind: int):
+        """
+        Sets the kind of the object in the edge of the cell (x, y) in the given direction,
+        the neighbour cell in that direction shares the edge
+        """
+        if direction == Direction.NORTH:
+            self.set_horizontal(x, y + 1, kind)
+        elif direction == Direction.SOUTH:
+            self.set_horizontal(x, y, kind)
+        elif direction == Direction.WEST:
+            self.set_vertical(x, y, kind)
+        else:
+            self.set_vertical(x + 1, y, kind)
+
+    def flush(self):
+        """
+        Writes the modified tiles of the cache back to the file
+        """
+        for index in sorted(self._dirty):
+            self._write_tile(index, self._cache[index])
+        self._file.flush()
+
+    def clear(self):
+        """
+        Removes all the objects of the grid, the file is truncated and the cache emptied
+        """
+        self._cache.clear()
+        self._dirty.clear()
+        self._file.truncate(0)
+        self._file.truncate(self._file_size)
+
+    def close(self):
+        """
+        Writes the modified tiles and closes the file
+        """
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def to_edge_grid(self, area: int = None) -> EdgeGrid:
+        """
+        In-memory EdgeGrid with the same objects, of all the grid or of the area x area cells
+        of the origin. The tiles are read one by one (from the cache or the file, the cache
+        is not changed) and copied by rows of the tile.
+        """
+        width = self.width if area is None else min(area, self.width)
+        height = self.height if area is None else min(area, self.height)
+        grid = EdgeGrid(width, height)
+        size = self.tile_size
+        for tile_y in range(height // size + 1):
+            for tile_x in range(width // size + 1):
+                index = tile_y * self.tiles_x + tile_x
+                tile = self._cache.get(index)
+                if tile is None:
+                    self._file.seek(index * size * size)
+                    tile = self._file.read(size * size)
+                vertical = tile.translate(_VERTICAL_KINDS)
+                horizontal = tile.translate(_HORIZONTAL_KINDS)
+                x = tile_x * size
+                vertical_count = min(size, width + 1 - x)
+                horizontal_count = min(size, width - x)
+                for offset_y in range(min(size, height + 1 - tile_y * size)):
+                    y = tile_y * size + offset_y
+                    row = offset_y * size
+                    if y < height:
+                        start = y * (width + 1) + x
+                        grid.vertical[start:start + vertical_count] = vertical[row:row + vertical_count]
+                    if horizontal_count > 0:
+                        start = y * width + x
+                        grid.horizontal[start:start + horizontal_count] = horizontal[row:row + horizontal_count]
+        return grid
+
+    def __enter__(self) -> 'TiledEdgeGrid':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __repr__(self) -> str:
+        return "".join(["TiledEdgeGrid(", str(self.width), "x", str(self.height),
+                        ", tiles ", str(self.tile_size), ", cache ", str(len(self._cache)), "/", str(self.max_tiles), ")"])
@@ -0,0 +1,211 @@
+## NumPy wavefront search (optional, BitsetWavefront is used without NumPy)
+from .graphs import Direction
+from .grid import EdgeGrid, memory_grid
+from .path import Path
+from .bitset import BitsetWavefront
+
+# NumPy module, imported the first time it is needed (see numpy()), so importing the labyrinth doesn't load it
+_numpy_module = None
+_numpy_imported = False
+
+# Codes of the parent directions (direction of the move that reaches the cell), 0 is no parent
+_DIRECTIONS = (None, Direction.NORTH, Direction.SOUTH, Direction.WEST, Direction.EAST)
+_NORTH, _SOUTH, _WEST, _EAST = 1, 2, 3, 4
+
+
+def numpy():
+    """
+    NumPy module, or None if it is not installed (imported the first time it is called)
+    """
+    global _numpy_module, _numpy_imported
+    if not _numpy_imported:
+        try:
+            import numpy as module
+        except ImportError:
+            module = None
+        _numpy_module = module
+        _numpy_imported = True
+    return _numpy_module
+
+
+def shift(cells: 'np.ndarray', passable: 'tuple[np.ndarray, ...]') -> 'list[np.ndarray]':
+    """
+    Cells reached moving the cells one cell to the north, south, west and east
+    (passable are the boolean arrays of the edges of each direction), the arrays
+    can have more dimensions before [y, x] (ex: stacks of labyrinths)
+    """
+    np = numpy()
+    north, south, west, east = passable
+    moved = [np.zeros_like(cells) for _ in range(4)]
+    moved[0][..., 1:, :] = cells[..., :-1, :] & north[..., :-1, :]
+    moved[1][..., :-1, :] = cells[..., 1:, :] & south[..., 1:, :]
+    moved[2][..., :, :-1] = cells[..., :, 1:] & west[..., :, 1:]
+    moved[3][..., :, 1:] = cells[..., :, :-1] & east[..., :, :-1]
+    return moved
+
+
+def passable_arrays(grid: EdgeGrid, area: int, kind: int) -> 'tuple[np.ndarray, ...]':
+    """
+    Boolean arrays [y, x] (area x area) of the edges of the given kind in the north, south, west and east
+    of each cell, the edges of the border of the area are not passable (they lead outside)
+
+    raise:
+        MemoryError
+            If the grid is disk-backed and the area doesn't fit in its memory budget (see grid.memory_grid())
+    """
+    np = numpy()
+    grid = memory_grid(grid, area, "numpy")
+    vertical = np.frombuffer(bytes(grid.vertical), dtype=np.uint8).reshape(grid.height, grid.width + 1)[:area, :area + 1]
+    horizontal = np.frombuffer(bytes(grid.horizontal), dtype=np.uint8).reshape(grid.height + 1, grid.width)[:area + 1, :area]
+    west = vertical[:, :area] == kind
+    east = vertical[:, 1:] == kind
+    south = horizontal[:area, :] == kind
+    north = horizontal[1:, :] == kind
+    west[:, 0] = False
+    east[:, -1] = False
+    south[0, :] = False
+    north[-1, :] = False
+    return north, south, west, east
+
+
+class NumpyWavefront:
+    """
+    Search engine that expands the wavefronts with NumPy array operations.
+
+    The edges are boolean arrays [y, x] for the four directions (north, south, west and east
+    of each cell), for the empty edges and for the doors. The wavefront of the cells reached with
+    d doors and m moves is moved with masked shifts of the arrays (BFS layers in the door level d),
+    the cells through the doors are the seeds of the level d+1, so the first wavefront with the goal
+    has the min doors and then the min cells (same results than the A* search).
+
+    Without NumPy the search is done by BitsetWavefront (pure Python, same algorithm with bitsets).
+
+    The arrays are built from an in-memory copy of a TiledEdgeGrid (MemoryError if the working
+    region is bigger than its memory budget, see grid.memory_grid()).
+
+    Atributtes:
+        area: int
+            The search only uses the cells with both coordenates lower than area
+        doors: np.ndarray | None
+            Doors of the min path from the start to each cell [y, x] of the last search, -1 not reached
+        cells: np.ndarray | None
+            Cells of the min path from the start to each cell [y, x] of the last search (start included)
+        parents: np.ndarray | None
+            Direction of the last move of the min path to each cell (1 N, 2 S, 3 W, 4 E, 0 none)
+        stats: SearchStats
+            Statistics of the search (the expanded nodes are the cells reached, there is no heap)
+    """
+
+    def __init__(self, labyrinth):
+        self.area = labyrinth.active_area
+        self.stats = labyrinth.stats
+        self.doors = None
+        self.cells = None
+        self.parents = None
+        if numpy() is None:
+            self._fallback = BitsetWavefront(labyrinth)
+            return
+        self._fallback = None
+
+        self._empty = passable_arrays(labyrinth.edge_grid, self.area, EdgeGrid.EMPTY)
+        self._door = passable_arrays(labyrinth.edge_grid, self.area, EdgeGrid.DOOR)
+
+    def search(self, start: 'tuple[int, int]', goal: 'tuple[int, int]') -> 'Path | None':
+        """
+        Min path (doors first and then cells) from the start cell to the goal cell
+
+        return:
+            The Path or None if the goal can't be reached
+        """
+        if self._fallback is not None:
+            return self._fallback.search(start, goal)
+        np = numpy()
+        stats = self.stats
+        stats.reset("numpy")
+        area = self.area
+        goal_x, goal_y = goal
+        doors = self.doors = np.full((area, area), -1, dtype=np.int32)
+        cells = self.cells = np.zeros((area, area), dtype=np.int32)
+        parents = self.parents = np.zeros((area, area), dtype=np.int8)
+        unvisited = np.ones((area, area), dtype=bool)
+
+        level = 0
+        first = np.zeros((area, area), dtype=bool)
+        first[start[1], start[0]] = True
+        # Seeds of the level: moves -> (cells, parent directions)
+        seeds = {0: (first, parents.copy())}
+        while seeds:
+            door_seeds = {}
+            frontier = None
+            moves = 0
+            while frontier is not None or seeds:
+                if frontier is None:
+                    moves = min(seeds)
+                    wavefront = np.zeros((area, area), dtype=bool)
+                    directions = np.zeros((area, area), dtype=np.int8)
+                else:
+                    wavefront, directions = self._spread(frontier, self._empty)
+                if moves in seeds:
+                    seed_cells, seed_directions = seeds.pop(moves)
+                    new_seeds = seed_cells & ~wavefront
+                    wavefront |= seed_cells
+                    directions[new_seeds] = seed_directions[new_seeds]
+                wavefront &= unvisited
+                if not wavefront.any():
+                    frontier = None
+                    continue
+                unvisited &= ~wavefront
+                doors[wavefront] = level
+                cells[wavefront] = moves + 1
+                parents[wavefront] = directions[wavefront]
+                stats.expanded += int(np.count_nonzero(wavefront))
+
+                if wavefront[goal_y, goal_x]:
+                    stats.stop()
+                    return self._reconstruct(start, goal, level)
+
+                through_doors, door_directions = self._spread(wavefront, self._door)
+                through_doors &= unvisited
+                if through_doors.any():
+                    if moves + 1 in door_seeds:
+                        previous_cells, previous_directions = door_seeds[moves + 1]
+                        added = through_doors & ~previous_cells
+                        previous_cells |= added
+                        previous_directions[added] = door_directions[added]
+                    else:
+                        door_seeds[moves + 1] = (through_doors, door_directions)
+                frontier = wavefront
+                moves += 1
+            seeds = door_seeds
+            level += 1
+
+        stats.stop()
+        return None
+
+    @staticmethod
+    def _spread(cells: 'np.ndarray', passable: 'tuple[np.ndarray, ...]') -> 'tuple[np.ndarray, np.ndarray]':
+        """
+        Cells next to the cells through the passable edges and the direction used to reach them
+        """
+        np = numpy()
+        spread = np.zeros_like(cells)
+        directions = np.zeros(cells.shape, dtype=np.int8)
+        for code, moved in zip((_NORTH, _SOUTH, _WEST, _EAST), shift(cells, passable)):
+            new = moved & ~spread
+            directions[new] = code
+            spread |= moved
+        return spread, directions
+
+    def _reconstruct(self, start: 'tuple[int, int]', goal: 'tuple[int, int]', doors: int) -> Path:
+        """
+        Path following the parent directions from the goal to the start
+        """
+        x, y = goal
+        reverse_runs = []
+        while (x, y) != tuple(start):
+            direction = _DIRECTIONS[self.parents[y, x]]
+            reverse_runs.append((direction, 1))
+            delta_x, delta_y = Path.OFFSETS[direction]
+            x -= delta_x
+            y -= delta_y
+        return Path(start, reverse_runs[::-1], doors)
@@ -0,0 +1,129 @@
+## Writers for the results of the labyrinth resolutions
+from .path import Path
+import json
+import sys
+
+
+class ResultWriter:
+    """
+    Writes the resolution of labyrinths into a text stream using buffered block writes.
+
+    Instead of one print() per line, the lines of the results are stored in a buffer
+    and written in a single block when the buffer is bigger than buffer_size
+    or when the writer is flushed/closed.
+
+    Formats:
+        "text":  Same output as Labyrinth.print_path_teseo_to_minotaurs (byte to byte)
+        "jsonl": One json object per labyrinth with the summary of the resolution
+                 {"record": 0, "is_possible": true, "doors": 5, "cells": 13}
+        "rle":   One line per labyrinth "is_possible doors cells path", where the path
+                 is run-length-encoded as directions, ex: "1 5 13 E4N3W3S1" ("-" if no path)
+
+    Atributtes:
+        stream: TextIO
+            Stream where the results are written (sys.stdout by default)
+        fmt: str
+            Format of the output, one of ResultWriter.FORMATS
+        buffer_size: int
+            Number of characters to store before writting a block in the stream
+        records: int
+            Number of results written by this writer
+    """
+    FORMATS = ("text", "jsonl", "rle")
+    SEPARATOR = "---------------------------------------"
+
+    def __init__(self, stream=None, fmt: str = "text", buffer_size: int = 1 << 16):
+        if fmt not in self.FORMATS:
+            raise ValueError("Error: Unknown output format " + repr(fmt))
+        self.stream = stream if stream is not None else sys.stdout
+        self.fmt = fmt
+        self.buffer_size = buffer_size
+        self.records = 0
+        self._chunks: 'list[str]' = []
+        self._buffered = 0
+
+    def write_result(self, is_possible: bool, path: 'list[CellNode] | Path', number_of_doors_used: int):
+        """
+        Write the result of one labyrinth in the selected format
+
+        Args:
+            is_possible: bool
+                If there is a path between teseo and the minotaurs
+            path: list[CellNode] | Path
+                Nodes of the path from teseo to the minotaurs,
+                the "jsonl" and "rle" formats also accept a compact Path (or None if there is no path)
+            number_of_doors_used: int
+                Number of doors used in the path
+        """
+        self.write(self.format_result(is_possible, path, number_of_doors_used))
+
+    def format_result(self, is_possible: bool, path: 'list[CellNode] | Path', number_of_doors_used: int) -> str:
+        """
+        Text of the result of one labyrinth in the selected format (see write_result()),
+        the result is counted as written, so the text should be written later with write()
+        """
+        if self.fmt == "text":
+            lines = [self.SEPARATOR,
+                     "Is possible to resolve?: " + str(is_possible),
+                     "Number of doors used: " + str(number_of_doors_used),
+                     "Number of cells used: " + str(len(path) if path else 0),
+                     self.SEPARATOR,
+                     "\nPath:"]
+            if is_possible:
+                lines.extend(map(repr, path))
+            text = "\n".join(lines) + "\n"
+
+        elif self.fmt == "jsonl":
+            summary = {"record": self.records, "is_possible": bool(is_possible),
+                       "doors": number_of_doors_used, "cells": len(path) if path else 0}
+            text = json.dumps(summary) + "\n"
+
+        else:
+            encoded = ""
+            if is_possible:
+                if not isinstance(path, Path):
+                    path = Path.from_nodes(path, number_of_doors_used)
+                encoded = path.encode()
+            text = " ".join([str(int(bool(is_possible))), str(number_of_doors_used),
+                             str(len(path) if path else 0), encoded or "-"]) + "\n"
+        self.records += 1
+        return text
+
+    def write_summary(self, is_possible: bool, number_of_doors_used: int, number_of_cells_used: int):
+        """
+        Write the result of one labyrinth without its path (ex: solved in a batch), only the "jsonl" format
+        """
+        if self.fmt != "jsonl":
+            raise ValueError("Error: The " + self.fmt + " format needs the path of the result")
+        summary = {"record": self.records, "is_possible": bool(is_possible),
+                   "doors": number_of_doors_used, "cells": number_of_cells_used}
+        self.records += 1
+        self.write(json.dumps(summary) + "\n")
+
+    def write(self, data: str):
+        """
+        Write text in the buffer, the buffer is written in the stream when it is bigger than buffer_size
+        """
+        self._chunks.append(data)
+        self._buffered += len(data)
+        if self._buffered >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        """
+        Write all the buffered results in the stream in one block
+        """
+        if self._chunks:
+            self.stream.write("".join(self._chunks))
+            self._chunks = []
+            self._buffered = 0
+        self.stream.flush()
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self) -> 'ResultWriter':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
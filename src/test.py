@@ -1,7 +1,114 @@
 import unittest
+import unittest.mock
 from labyrinth.two_dimension import FiniteLine, Point, Rectangle
 from labyrinth.Labyrinth import Labyrinth
 from labyrinth.labyrinth_objects import Wall, Door
+from labyrinth.writer import ResultWriter
+from labyrinth.path import Path
+from labyrinth.graphs import Direction
+from labyrinth.grid import EdgeGrid
+from labyrinth.sparse import SparseLabyrinth
+from labyrinth.tiled import TiledEdgeGrid
+from labyrinth.snapshot import save_snapshot, load_snapshot
+from labyrinth.shared import SharedEdgeGrid, solve_parallel
+from labyrinth import shared as shared_module
+from labyrinth.records import LabyrinthRecord, iter_records
+from labyrinth.service import SolveService, solve_remote
+from labyrinth.corridors import ReducedGraph
+from labyrinth.jps import JumpPointSearch
+from labyrinth.bitset import BitsetWavefront
+from labyrinth.vectorized import NumpyWavefront
+from labyrinth import vectorized
+from labyrinth.batch import solve_batch
+from labyrinth import batch
+from labyrinth.hierarchy import ContractionHierarchy
+from labyrinth.pathdb import build_path_database, load_path_database, hilbert_order
+from labyrinth.parallel import ParallelSearch, scaling_benchmark
+from labyrinth.frontier import FrontierSearch
+from labyrinth.columns import ObjectColumns
+import asyncio
+import Main
+import pickle
+import random
+import tempfile
+import os
+import contextlib
+import io
+import json
+
+
+def random_objects(rng: random.Random, area: int) -> 'tuple[list[Wall], list[Door]]':
+    """
+    Random walls and doors (up to 25 objects) with the corners in the area x area cells
+    """
+    walls = []
+    doors = []
+    for _ in range(rng.randrange(25)):
+        x, y = rng.randrange(area), rng.randrange(area)
+        if rng.random() < 0.5:
+            length = rng.randrange(1, area)
+            walls.append(Wall(Point(x, y), Point(x, y + length)) if rng.random() < 0.5 else Wall(Point(x, y), Point(x + length, y)))
+        else:
+            doors.append(Door(Point(x, y), Point(x, y + 1)) if rng.random() < 0.5 else Door(Point(x, y), Point(x + 1, y)))
+    return walls, doors
+
+
+def random_cell(rng: random.Random, area: int) -> 'tuple[int, int]':
+    return rng.randrange(area), rng.randrange(area)
+
+
+def random_labyrinths(seeds: int, min_area: int = 2, max_area: int = 12, place: bool = True):
+    """
+    Random labyrinth of each seed with random objects (see random_objects()), the side is in [min_area, max_area)
+
+    Args:
+        place: bool
+            If True the minotaurs and teseo are in random cells, if not both are in the origin
+    return:
+        Generator of (rng, labyrinth), the rng of the seed to draw more random values
+    """
+    for seed in range(seeds):
+        rng = random.Random(seed)
+        area = rng.randrange(min_area, max_area)
+        walls, doors = random_objects(rng, area)
+        if place:
+            labyrinth = Labyrinth(Point(rng.randrange(area) + 0.5, rng.randrange(area) + 0.5),
+                                  Point(rng.randrange(area) + 0.5, rng.randrange(area) + 0.5),
+                                  walls=[], doors=[], max_area=area)
+        else:
+            labyrinth = Labyrinth(walls=[], doors=[], max_area=area)
+        labyrinth.add_labyrinth_objs(walls, doors)
+        yield rng, labyrinth
+
+
+def assert_same_path(test: unittest.TestCase, path: 'Path | None', expected: 'Path | None', labyrinth: Labyrinth):
+    """
+    Checks that the path has the same doors, cells and end than the expected path (or both are None)
+    and that its cost in the labyrinth is the cost of its doors and cells
+    """
+    test.assertEqual(path is None, expected is None)
+    if path is not None:
+        test.assertEqual((path.doors, len(path), path.end()), (expected.doors, len(expected), expected.end()))
+        test.assertEqual(labyrinth._path_cost(path), path.doors * labyrinth.DOOR_COST + len(path) - 1)
+
+
+def assert_same_as_astar(test: unittest.TestCase, engine: str, seeds: int = 200):
+    """
+    Compares the engine with the A* search in the random labyrinths of the seeds
+    """
+    for _, labyrinth in random_labyrinths(seeds):
+        expected = labyrinth.teseo_to_minotaurs_path()
+        assert_same_path(test, labyrinth.teseo_to_minotaurs_path(engine=engine), expected, labyrinth)
+
+
+def assert_same_as_bitset(test: unittest.TestCase, labyrinth: Labyrinth, search, rng: random.Random, queries: int = 1):
+    """
+    Compares search(start, goal) with the bitset engine between random cells of the working region
+    """
+    for _ in range(queries):
+        start = random_cell(rng, labyrinth.active_area)
+        goal = random_cell(rng, labyrinth.active_area)
+        assert_same_path(test, search(start, goal), BitsetWavefront(labyrinth).search(start, goal), labyrinth)
 
 class TestPoint(unittest.TestCase):
     """
@@ -485,6 +592,997 @@ class TestLabyrinth(unittest.TestCase):
         self.assertEqual(number_of_doors_used, 9)  # The min path uses doors
         self.assertEqual(number_of_nodes_used, 16) # The min path uses  nodes
 
+
+class TestResultWriter(unittest.TestCase):
+    """Test of the buffered writer of results"""
+
+    def setUp(self):
+        self.labyrinth = Labyrinth(walls=[], doors=[], max_area=6)
+        walls = [Wall(Point(1,1), Point(2,1)), Wall(Point(1,1), Point(1,2)),
+                 Wall(Point(2,1), Point(2,2))]
+        doors = [Door(Point(1,2), Point(2,2))]
+        self.labyrinth.minotaurs = Point(1.5, 1.5)
+        self.labyrinth.add_labyrinth_objs(walls, doors)
+
+    def test_text_same_as_print(self):
+        printed = io.StringIO()
+        with contextlib.redirect_stdout(printed):
+            self.labyrinth.print_path_teseo_to_minotaurs()
+
+        written = io.StringIO()
+        with ResultWriter(written, "text", buffer_size=10) as writer:
+            self.labyrinth.print_path_teseo_to_minotaurs(writer)
+
+        self.assertEqual(printed.getvalue(), written.getvalue())
+        self.assertIn("Number of doors used: 1\n", written.getvalue())
+
+    def test_jsonl_and_rle(self):
+        is_possible, path, doors = self.labyrinth.teseo_to_minotaurs()
+
+        written = io.StringIO()
+        with ResultWriter(written, "jsonl") as writer:
+            writer.write_result(is_possible, path, doors)
+            writer.write_result(False, [], 0)
+        lines = [json.loads(line) for line in written.getvalue().splitlines()]
+        self.assertEqual(lines[0], {"record": 0, "is_possible": True, "doors": 1, "cells": len(path)})
+        self.assertEqual(lines[1]["is_possible"], False)
+
+        written = io.StringIO()
+        with ResultWriter(written, "rle") as writer:
+            writer.write_result(is_possible, path, doors)
+            writer.write_result(False, [], 0)
+        first, second = written.getvalue().splitlines()
+        encoded = first.split(" ")[3]
+        self.assertEqual(first.split(" ")[:3], ["1", "1", str(len(path))])
+        self.assertEqual(sum(int(run[1:]) for run in encoded.replace("N", " N").replace("S", " S")
+                             .replace("E", " E").replace("W", " W").split()), len(path) - 1)
+        self.assertEqual(second, "0 0 0 -")
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            ResultWriter(io.StringIO(), "xml")
+
+
+class TestPath(unittest.TestCase):
+    """Test of the compact run-length-encoded path"""
+
+    def test_runs_and_iteration(self):
+        path = Path((0,0), [(Direction.EAST, 2), (Direction.EAST, 1), (Direction.NORTH, 2)], doors=1)
+
+        self.assertEqual(len(path), 6)
+        self.assertEqual(path.doors, 1)
+        self.assertEqual(path.encode(), "E3N2")
+        self.assertEqual(list(path), [(0,0), (1,0), (2,0), (3,0), (3,1), (3,2)])
+        self.assertEqual(path.end(), (3,2))
+        self.assertEqual(Path.decode((0,0), "E3N2", 1), path)
+        self.assertEqual(pickle.loads(pickle.dumps(path)), path)
+
+    def test_labyrinth_path(self):
+        labyrinth = Labyrinth(walls=[], doors=[], max_area=6)
+        labyrinth.minotaurs = Point(1.5, 1.5)
+        labyrinth.add_labyrinth_objs([Wall(Point(1,1), Point(2,1)), Wall(Point(1,1), Point(1,2)),
+                                      Wall(Point(2,1), Point(2,2))], [Door(Point(1,2), Point(2,2))])
+
+        is_possible, nodes, doors = labyrinth.teseo_to_minotaurs()
+        path = labyrinth.teseo_to_minotaurs_path()
+
+        self.assertTrue(is_possible)
+        self.assertEqual(path, Path.from_nodes(nodes, doors))
+        self.assertEqual(len(path), len(nodes))
+        self.assertEqual(path.doors, 1)
+        self.assertEqual(path.to_nodes(labyrinth), nodes)
+
+        labyrinth.add_labyrinth_objs([Wall(Point(1,2), Point(2,2))])
+        self.assertIsNone(labyrinth.teseo_to_minotaurs_path())
+
+
+class TestRender(unittest.TestCase):
+    """Test of the ASCII rows of the labyrinth"""
+
+    def setUp(self):
+        self.labyrinth = Labyrinth(walls=[], doors=[], max_area=4)
+        self.labyrinth.minotaurs = Point(1.5, 1.5)
+        self.labyrinth.add_labyrinth_objs([Wall(Point(1,1), Point(2,1)), Wall(Point(1,1), Point(1,2)),
+                                           Wall(Point(2,1), Point(2,2))], [Door(Point(1,2), Point(2,2))])
+
+    def test_rows(self):
+        path = self.labyrinth.teseo_to_minotaurs_path()
+        rows = list(self.labyrinth.iter_rows(path))
+
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(rows[-1][:3], "[T]")
+        self.assertEqual(rows[2][3:6], "[M]")
+        self.assertEqual(sum(row.count("[#]") for row in rows), len(path) - 2)
+        self.assertEqual(rows, ["".join(sub) for sub in self.labyrinth._get_labyrinth_matrix_no_info(path.to_nodes(self.labyrinth))])
+
+    def test_viewport(self):
+        rows = list(self.labyrinth.iter_rows(viewport=(1, 1, 2, 1), use_info=True))
+        self.assertEqual(rows, ["[|_|][|  ]"])
+
+        # The viewport is clipped to the labyrinth
+        rows = list(self.labyrinth.iter_rows(viewport=(3, 2, 10, 10)))
+        self.assertEqual(rows, ["[ ]", "[ ]"])
+
+
+class TestAutoSize(unittest.TestCase):
+    """Test of the labyrinth clipped to the bounding box of the objects"""
+
+    def _walls_doors(self):
+        walls = [Wall(Point(1,1), Point(1,4)), Wall(Point(1,1), Point(4,1)),
+                 Wall(Point(4,1), Point(4,4)), Wall(Point(1,4), Point(4,4))]
+        doors = [Door(Point(2,4), Point(3,4))]
+        return walls, doors
+
+    def test_same_result_as_big_labyrinth(self):
+        walls, doors = self._walls_doors()
+        big = Labyrinth(minotaurs=Point(2.5, 2.5), walls=walls, doors=doors, max_area=30)
+
+        walls, doors = self._walls_doors()
+        small = Labyrinth(minotaurs=Point(2.5, 2.5), walls=[], doors=[], max_area=2)
+        small.fit_to_objects(walls, doors)
+        small.add_labyrinth_objs(walls, doors)
+
+        self.assertEqual(small.MAX_COORD, 5)
+        big_result = big.teseo_to_minotaurs()
+        small_result = small.teseo_to_minotaurs()
+        self.assertEqual(small_result[2], big_result[2])
+        self.assertEqual(len(small_result[1]), len(big_result[1]))
+        # The path goes around the box by the margin: (0,0) -> (0,4) -> (2,4) -> (2,2)
+        self.assertEqual((big_result[2], len(big_result[1])), (1, 9))
+
+    def test_grow_and_clip(self):
+        labyrinth = Labyrinth(walls=[], doors=[], max_area=2)
+        labyrinth.minotaurs = Point(6.5, 0.5)
+        labyrinth.fit_to_objects()
+        self.assertEqual(labyrinth.MAX_COORD, 8)
+        self.assertEqual(len(labyrinth.teseo_to_minotaurs()[1]), 7)
+
+        # A smaller record clips the working region but doesn't shrink the labyrinth
+        labyrinth.eliminate_labyrinth_objs()
+        labyrinth.minotaurs = Point(1.5, 0.5)
+        walls = [Wall(Point(1,0), Point(1,1))]
+        labyrinth.fit_to_objects(walls)
+        labyrinth.add_labyrinth_objs(walls)
+        self.assertEqual((labyrinth.MAX_COORD, labyrinth.active_area), (8, 3))
+        is_possible, path, doors = labyrinth.teseo_to_minotaurs()
+        self.assertTrue(is_possible)
+        self.assertEqual((doors, len(path)), (0, 4))
+        self.assertTrue(all(node.cell.bottom_left.y < 3 for node in path))
+
+    def test_exact_cost_model(self):
+        # With EMPTY_COST = 0 and DOOR_COST = MAX_COORD the heuristic overestimated the cost:
+        # the search returned 9 cells instead of 7 around the walls
+        walls = [Wall(Point(1,3), Point(2,3)), Wall(Point(2,1), Point(2,4)), Wall(Point(1,1), Point(1,3))]
+        labyrinth = Labyrinth(minotaurs=Point(3.5, 3.5), walls=walls, doors=[], max_area=5)
+        is_possible, path, doors = labyrinth.teseo_to_minotaurs()
+        self.assertTrue(is_possible)
+        self.assertEqual((doors, len(path)), (0, 7))
+
+        # And it went through the door (1 door, 4 cells) instead of around the wall (0 doors, 10 cells)
+        walls = [Wall(Point(1,0), Point(1,3))]
+        doors = [Door(Point(1,2), Point(2,2)), Door(Point(1,0), Point(1,1))]
+        labyrinth = Labyrinth(minotaurs=Point(3.5, 0.5), walls=walls, doors=doors, max_area=4)
+        is_possible, path, doors = labyrinth.teseo_to_minotaurs()
+        self.assertTrue(is_possible)
+        self.assertEqual((doors, len(path)), (0, 10))
+
+
+class TestLazyLabyrinth(unittest.TestCase):
+    """Test of the lazy construction of the nodes from the EdgeGrid"""
+
+    def test_nodes_created_on_demand(self):
+        labyrinth = Labyrinth(walls=[], doors=[], max_area=1000)
+        self.assertTrue(all(row is None for row in labyrinth._rows))
+
+        labyrinth.minotaurs = Point(3.5, 0.5)
+        labyrinth.add_labyrinth_objs([Wall(Point(2,0), Point(2,1))], [Door(Point(2,0), Point(2,1))])
+        is_possible, path, doors = labyrinth.teseo_to_minotaurs()
+
+        self.assertTrue(is_possible)
+        self.assertEqual((doors, len(path)), (0, 6)) # around the door by the row 1
+        self.assertLess(sum(row is not None for row in labyrinth._rows), 5)
+
+    def test_edge_grid_and_nodes(self):
+        labyrinth = Labyrinth(walls=[], doors=[], max_area=6)
+        node = labyrinth.get_node(1, 1) # created before the objects are added
+        labyrinth.add_labyrinth_objs([Wall(Point(1,1), Point(1,3)), Wall(Point(1,2), Point(3,2))],
+                                     [Door(Point(1,1), Point(1,2))])
+
+        grid = labyrinth.edge_grid
+        self.assertEqual(grid.get_edge(1, 1, Direction.WEST), EdgeGrid.DOOR)
+        self.assertEqual(grid.get_edge(0, 1, Direction.EAST), EdgeGrid.DOOR)
+        self.assertEqual(grid.get_edge(1, 2, Direction.WEST), EdgeGrid.WALL)
+        self.assertEqual(grid.get_edge(2, 1, Direction.NORTH), EdgeGrid.WALL)
+        self.assertEqual(grid.get_edge(2, 2, Direction.SOUTH), EdgeGrid.WALL)
+        self.assertEqual(grid.get_edge(3, 1, Direction.NORTH), EdgeGrid.EMPTY)
+
+        self.assertEqual(repr(node.west_obj), "Line((1,1), (1,2))[W][D]")
+        self.assertEqual(repr(labyrinth.get_node(1, 2).west_obj), "Line((1,2), (1,3))[W]")
+        self.assertIsNone(labyrinth.get_node(3, 1).north_obj)
+
+        labyrinth.eliminate_labyrinth_objs()
+        self.assertIsNone(node.west_obj)
+        self.assertEqual(grid.get_edge(1, 2, Direction.WEST), EdgeGrid.EMPTY)
+
+
+class TestSparseLabyrinth(unittest.TestCase):
+    """
+    Test of the coordinate-compressed labyrinth
+    """
+
+    def test_same_as_dense(self):
+        for seed in range(150):
+            rng = random.Random(seed)
+            area = rng.randrange(3, 12)
+            walls, doors = random_objects(rng, area)
+            teseo = Point(rng.randrange(2 * area) / 2, rng.randrange(2 * area) / 2)
+            minotaurs = Point(rng.randrange(2 * area) / 2, rng.randrange(2 * area) / 2)
+
+            dense = Labyrinth(minotaurs, teseo, walls=[], doors=[], max_area=area + 2)
+            dense.add_labyrinth_objs(walls, doors)
+            path = SparseLabyrinth(minotaurs, teseo, walls, doors, max_area=area + 2).teseo_to_minotaurs_path()
+            assert_same_path(self, path, dense.teseo_to_minotaurs_path(), dense)
+
+    def test_huge_coordinates(self):
+        # A wall crossing all the map with only one door far from teseo
+        size = 10 ** 6
+        labyrinth = SparseLabyrinth(Point(0.5, size - 0.5), Point(0.5, 0.5),
+                                    [Wall(Point(0, 500000), Point(size, 500000))],
+                                    [Door(Point(size - 1, 500000), Point(size, 500000))], max_area=size)
+        path = labyrinth.teseo_to_minotaurs_path()
+
+        self.assertEqual(labyrinth.compressed_size, (4, 6))
+        self.assertEqual(path.doors, 1)
+        self.assertEqual(len(path), 1 + 2 * (size - 1) + (size - 1))
+        self.assertEqual(path.end(), (0, size - 1))
+
+
+class TestTiledEdgeGrid(unittest.TestCase):
+    """
+    Test of the disk-backed grid with a LRU cache of tiles
+    """
+
+    def test_write_back_and_eviction(self):
+        with tempfile.TemporaryDirectory() as directory:
+            grid = TiledEdgeGrid(20, tile_size=4, memory_budget=2 * 4 * 4, path=os.path.join(directory, "grid.tiles"))
+            expected = EdgeGrid(20)
+            for x in range(20):
+                for target in (grid, expected):
+                    target.set_edge(x, x, Direction.NORTH, EdgeGrid.WALL)
+                    target.set_edge(x, 19 - x, Direction.EAST, EdgeGrid.DOOR)
+
+            self.assertEqual(grid.max_tiles, 2)
+            self.assertGreater(grid.evictions, 0)
+            self.assertGreater(grid.writes, 0)
+            self.assertEqual(grid.get_edge(3, 4, Direction.SOUTH), EdgeGrid.WALL)
+            self.assertEqual(grid.get_edge(5, 15, Direction.WEST), EdgeGrid.DOOR)
+            self.assertEqual(grid.to_edge_grid(), expected)
+
+            grid.clear()
+            self.assertEqual(grid.to_edge_grid(), EdgeGrid(20))
+            grid.close()
+
+    def test_labyrinth_backend(self):
+        walls = [Wall(Point(3,0), Point(3,9)), Wall(Point(0,5), Point(8,5))]
+        doors = [Door(Point(3,7), Point(3,8)), Door(Point(6,5), Point(7,5))]
+        tiled = Labyrinth(Point(8.5, 8.5), walls=[], doors=[], max_area=12,
+                          grid_factory=lambda size: TiledEdgeGrid(size, tile_size=4, memory_budget=16))
+        tiled.add_labyrinth_objs(walls, doors)
+        dense = Labyrinth(Point(8.5, 8.5), walls=[], doors=[], max_area=12)
+        dense.add_labyrinth_objs(walls, doors)
+
+        is_possible, path, doors_used = tiled.teseo_to_minotaurs()
+        expected = dense.teseo_to_minotaurs()
+        self.assertEqual((is_possible, len(path), doors_used), (expected[0], len(expected[1]), expected[2]))
+        self.assertEqual(tiled.edge_grid.to_edge_grid(), dense.edge_grid)
+        self.assertGreater(tiled.edge_grid.misses, 1)
+
+    def test_engines_in_memory_budget(self):
+        walls = [Wall(Point(3,0), Point(3,9)), Wall(Point(0,5), Point(8,5))]
+        doors = [Door(Point(3,7), Point(3,8)), Door(Point(6,5), Point(7,5))]
+        tiled = Labyrinth(Point(8.5, 8.5), Point(9.5, 0.5), walls=[], doors=[], max_area=30,
+                          grid_factory=lambda size: TiledEdgeGrid(size, tile_size=4, memory_budget=512))
+        tiled.fit_to_objects(walls, doors)
+        tiled.add_labyrinth_objs(walls, doors)
+        expected = tiled.teseo_to_minotaurs_path()
+        self.assertIsNotNone(expected)
+        for engine in ("bitset", "frontier", "numpy"):
+            path = tiled.teseo_to_minotaurs_path(engine=engine)
+            self.assertEqual((path.doors, len(path)), (expected.doors, len(expected)))
+
+        tiled.edge_grid.memory_budget = 64
+        self.assertRaises(MemoryError, tiled.teseo_to_minotaurs_path, "bitset")
+        self.assertEqual(len(tiled.teseo_to_minotaurs_path("jps")), len(expected))
+
+
+class TestSnapshot(unittest.TestCase):
+    """
+    Test of the binary snapshots of labyrinths
+    """
+
+    def test_restore_with_indexes(self):
+        labyrinth = Labyrinth(Point(8.5, 8.5), walls=[], doors=[], max_area=12)
+        labyrinth.add_labyrinth_objs([Wall(Point(3,0), Point(3,9)), Wall(Point(3,5), Point(8,5)), Wall(Point(10,10), Point(10,12))],
+                                     [Door(Point(3,7), Point(3,8)), Door(Point(6,5), Point(7,5))])
+        labyrinth.add_labyrinth_objs([Wall(Point(10,10), Point(12,10))])
+        is_possible, path, doors = labyrinth.teseo_to_minotaurs()
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "labyrinth.snap")
+            save_snapshot(labyrinth, filename, components=True, distances=True)
+            with load_snapshot(filename) as snapshot:
+                restored = snapshot.labyrinth
+                self.assertEqual(restored.edge_grid, labyrinth.edge_grid)
+                self.assertEqual(repr(restored._walls), repr(labyrinth._walls))
+                self.assertEqual(repr(restored._doors), repr(labyrinth._doors))
+                self.assertEqual((restored.teseo, restored.minotaurs), (labyrinth.teseo, labyrinth.minotaurs))
+
+                goal = Path.node_coords(path[-1])
+                self.assertEqual(snapshot.doors_and_cells(goal), (doors, len(path)))
+                self.assertTrue(snapshot.same_component((0, 0), goal))
+                self.assertFalse(snapshot.same_component((0, 0), (11, 11)))
+                self.assertIsNone(snapshot.doors_and_cells((11, 11)))
+
+            restored_path = restored.teseo_to_minotaurs()
+            self.assertEqual((restored_path[0], len(restored_path[1]), restored_path[2]), (is_possible, len(path), doors))
+
+    def test_invalid_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "labyrinth.snap")
+            with open(filename, "wb") as file:
+                file.write(b"not a snapshot of a labyrinth at all, only some bytes" * 4)
+            with self.assertRaises(ValueError):
+                load_snapshot(filename)
+
+
+class TestSharedEdgeGrid(unittest.TestCase):
+    """
+    Test of the grid in shared memory and the parallel queries
+    """
+
+    def test_attach_read_only(self):
+        grid = EdgeGrid(5)
+        grid.set_edge(2, 2, Direction.EAST, EdgeGrid.DOOR)
+        shared = SharedEdgeGrid.from_grid(grid)
+        try:
+            attached = SharedEdgeGrid.attach(shared.name, 5)
+            self.assertEqual(attached, grid)
+            shared.set_edge(1, 1, Direction.NORTH, EdgeGrid.WALL) # seen by the attached grid
+            self.assertEqual(attached.get_edge(1, 2, Direction.SOUTH), EdgeGrid.WALL)
+            with self.assertRaises(TypeError):
+                attached.set_edge(0, 0, Direction.NORTH, EdgeGrid.WALL)
+            attached.close()
+        finally:
+            shared.unlink()
+
+    def test_parallel_queries(self):
+        labyrinth = Labyrinth(walls=[], doors=[], max_area=10)
+        labyrinth.add_labyrinth_objs([Wall(Point(3,0), Point(3,10)), Wall(Point(3,5), Point(8,5))],
+                                     [Door(Point(3,7), Point(3,8)), Door(Point(6,5), Point(7,5))])
+        queries = [(Point(0.5, 0.5), Point(8.5, 8.5)), (Point(5.5, 0.5), Point(0, 0)),
+                   (Point(9.5, 0.5), Point(9.5, 9.5)), (Point(4.5, 6.5), Point(4.5, 4.5))]
+
+        paths = solve_parallel(labyrinth, queries, workers=2, chunksize=1)
+
+        expected = []
+        for teseo, minotaurs in queries:
+            labyrinth.teseo, labyrinth.minotaurs = teseo, minotaurs
+            expected.append(labyrinth.teseo_to_minotaurs_path())
+        self.assertEqual(paths, expected)
+        self.assertEqual([path.doors for path in paths], [1, 1, 0, 0])
+
+        tiled = Labyrinth(walls=[], doors=[], max_area=10, grid_factory=lambda size: TiledEdgeGrid(size, tile_size=4))
+        tiled.add_labyrinth_objs(*labyrinth.labyrinth_objs())
+        self.assertEqual(solve_parallel(tiled, queries, workers=2), expected)
+        tiled.edge_grid.memory_budget = 64
+        self.assertRaises(MemoryError, solve_parallel, tiled, queries, workers=2)
+
+    def test_worker_releases_nodes(self):
+        grid = EdgeGrid(6)
+        grid.set_edge(2, 0, Direction.EAST, EdgeGrid.WALL)
+        shared = SharedEdgeGrid.from_grid(grid)
+        try:
+            shared_module._init_worker(shared.name, 6, 6)
+            path = shared_module._solve_query((Point(0.5, 0.5), Point(5.5, 0.5)))
+            self.assertEqual((path.doors, len(path)), (0, 8))
+            self.assertTrue(all(row is None for row in shared_module._worker_labyrinth._rows))
+            shared_module._worker_labyrinth.edge_grid.close()
+        finally:
+            shared_module._worker_labyrinth = None
+            shared.unlink()
+
+    def test_from_grid_error(self):
+        grid = EdgeGrid(5)
+        grid.vertical = bytearray(3)
+        with unittest.mock.patch.object(SharedEdgeGrid, "unlink", autospec=True, side_effect=SharedEdgeGrid.unlink) as unlink:
+            self.assertRaises(ValueError, SharedEdgeGrid.from_grid, grid)
+        unlink.assert_called_once()
+
+
+class TestRecords(unittest.TestCase):
+    """
+    Test of the text and json formats of the records
+    """
+
+    def test_text_and_json(self):
+        lines = ["2 1", "1 1 0 3", "1 1 1 2", "2 1 1", "1.5 1.5", "0 0", "3 3", "-1 -1", "ignored"]
+        records = list(iter_records(lines))
+        self.assertEqual(len(records), 2)
+        self.assertEqual(repr(records[0].walls), "[Line((1,1), (4,1))[W], Line((1,1), (1,3))[W]]")
+        self.assertEqual(records[0].minotaurs, Point(1.5, 1.5))
+
+        data = json.loads(json.dumps(records[0].to_json()))
+        restored = LabyrinthRecord.from_json(data)
+        self.assertEqual(repr(restored.walls), repr(records[0].walls))
+        self.assertEqual(repr(restored.doors), repr(records[0].doors))
+        with self.assertRaises(ValueError):
+            LabyrinthRecord.from_json({"walls": [[1, 1]]})
+        with self.assertRaises(Exception):
+            list(iter_records(["1 0", "1 1 0"]))
+
+
+class TestSolveService(unittest.TestCase):
+    """
+    Test of the asyncio service in localhost
+    """
+
+    def test_text_json_and_errors(self):
+        record = LabyrinthRecord([], [], Point(1.5, 1.5))
+
+        async def requests():
+            async with SolveService(workers=1) as service:
+                return await solve_remote(["2 1\n1 1 0 3\n1 1 1 2\n2 1 1\n1.5 1.5", record, '{"doors": []}'],
+                                          port=service.port)
+
+        results = asyncio.run(requests())
+        self.assertEqual([result["record"] for result in results], [0, 1, 2])
+        labyrinth = Labyrinth(walls=[], doors=[], max_area=10)
+        next(iter_records(["2 1", "1 1 0 3", "1 1 1 2", "2 1 1", "1.5 1.5"])).apply(labyrinth)
+        path = labyrinth.teseo_to_minotaurs_path()
+        self.assertEqual((results[0]["doors"], results[0]["cells"], results[0]["path"]), (path.doors, len(path), path.encode()))
+        self.assertEqual(results[1]["path"], "N1E1")
+        self.assertIn("error", results[2])
+
+    def test_timeout(self):
+        async def requests():
+            async with SolveService(workers=1, timeout=0) as service:
+                return await solve_remote([LabyrinthRecord([], [], Point(1.5, 1.5))], port=service.port)
+
+        self.assertEqual(asyncio.run(requests()), [{"record": 0, "error": "timeout"}])
+
+    def test_failing_record_keeps_connection(self):
+        record = LabyrinthRecord([], [], Point(1.5, 1.5))
+
+        async def requests():
+            async with SolveService(workers=1) as service:
+                return await solve_remote([record, '{"minotaurs": ["nan", 1]}', "0 0\n-3.5 1.5", record],
+                                          port=service.port)
+
+        results = asyncio.run(requests())
+        self.assertEqual([result["record"] for result in results], [0, 1, 2, 3])
+        self.assertIn("error", results[1])
+        self.assertIn("error", results[2])
+        self.assertEqual((results[0]["path"], results[3]["path"]), ("N1E1", "N1E1"))
+
+
+class TestPipeline(unittest.TestCase):
+    """
+    Test of the parse/solve/write pipeline of Main
+    """
+    RECORDS = "2 1\n1 1 0 3\n1 1 1 2\n2 1 1\n1.5 1.5\n0 0\n3.5 0.5\n1 0\n2 0 1 3\n2.5 0.5\n-1 -1\n"
+
+    def test_results_in_order(self):
+        stream = io.StringIO()
+        with ResultWriter(stream, "rle") as writer:
+            Main.solve_pipeline(io.StringIO(self.RECORDS), Labyrinth(walls=[], doors=[], max_area=2),
+                                writer, auto_size=True, queue_size=1)
+
+        expected = []
+        labyrinth = Labyrinth(walls=[], doors=[], max_area=10)
+        for record in iter_records(self.RECORDS.splitlines()):
+            record.apply(labyrinth)
+            path = labyrinth.teseo_to_minotaurs_path()
+            expected.append(" ".join(["1", str(path.doors), str(len(path)), path.encode() or "-"]))
+        self.assertEqual(stream.getvalue().splitlines(), expected)
+
+    def test_invalid_record(self):
+        with ResultWriter(io.StringIO(), "jsonl") as writer:
+            with self.assertRaises(Exception):
+                Main.solve_pipeline(io.StringIO("0 0\n1.5 1.5\n1 0\n1 1\n"), Labyrinth(walls=[], doors=[], max_area=5), writer)
+            self.assertEqual(writer.records, 1)
+
+
+class TestLandmarks(unittest.TestCase):
+    """
+    Test of the ALT heuristic with landmarks
+    """
+
+    def test_less_expansions_same_path(self):
+        # Fifth labyrinth of the input, the Manhattan distance floods the regions behind the walls
+        filename = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data_files", "input.txt")
+        with open(filename) as file:
+            record = list(iter_records(file))[4]
+        labyrinth = Labyrinth(walls=[], doors=[], max_area=2)
+        record.apply(labyrinth, auto_size=True)
+        is_possible, path, doors = labyrinth.teseo_to_minotaurs()
+        expanded = labyrinth.stats.expanded
+
+        landmarks = labyrinth.build_landmarks(4)
+        self.assertEqual(landmarks.cells[0], (0, 0))
+        self.assertEqual(len(landmarks.tables), 4)
+        result = labyrinth.teseo_to_minotaurs()
+
+        self.assertEqual((result[0], len(result[1]), result[2]), (is_possible, len(path), doors))
+        self.assertLess(labyrinth.stats.expanded, expanded)
+        self.assertEqual(labyrinth.stats.engine, "astar")
+
+    def test_discarded_with_new_objects(self):
+        labyrinth = Labyrinth(Point(4.5, 4.5), walls=[], doors=[], max_area=6)
+        labyrinth.build_landmarks()
+        labyrinth.add_labyrinth_objs([Wall(Point(0,2), Point(6,2))], [Door(Point(4,2), Point(5,2))])
+        self.assertIsNone(labyrinth.landmarks)
+
+        labyrinth.build_landmarks()
+        # Unreachable cells: the bound is infinite
+        labyrinth.add_labyrinth_objs([Wall(Point(4,2), Point(5,2))])
+        self.assertIsNone(labyrinth.landmarks)
+        labyrinth.build_landmarks()
+        self.assertEqual(labyrinth.landmarks.heuristic(0, 0, 4, 4), float('inf'))
+        self.assertFalse(labyrinth.teseo_to_minotaurs()[0])
+
+
+class TestBoundedSearch(unittest.TestCase):
+    """
+    Test of the weighted and anytime searches
+    """
+
+    def random_labyrinths(self, seeds: int):
+        for _, labyrinth in random_labyrinths(seeds, min_area=3):
+            path = labyrinth.teseo_to_minotaurs_path()
+            yield labyrinth, (labyrinth._path_cost(path) if path is not None else None)
+
+    def test_weighted_within_bound(self):
+        for labyrinth, optimal in self.random_labyrinths(150):
+            for epsilon in (0, 0.5, 3):
+                result = labyrinth.teseo_to_minotaurs_weighted(epsilon)
+                self.assertEqual(result.is_possible, optimal is not None)
+                self.assertTrue(result.finished)
+                self.assertEqual(labyrinth.stats.engine, "weighted")
+                if optimal is None:
+                    continue
+                self.assertLessEqual(result.cost, (1 + epsilon) * optimal)
+                self.assertLessEqual(result.bound, 1 + epsilon)
+                self.assertLessEqual(result.cost, result.bound * optimal + 1e-9)
+                self.assertEqual(result.doors, result.cost // labyrinth.DOOR_COST)
+                if epsilon == 0:
+                    self.assertEqual(result.cost, optimal)
+
+    def test_anytime_improves_until_optimal(self):
+        for labyrinth, optimal in self.random_labyrinths(60):
+            results = list(labyrinth.teseo_to_minotaurs_anytime(epsilon=4, max_expansions=3))
+            self.assertTrue(results[-1].finished)
+            self.assertFalse(any(result.finished for result in results[:-1]))
+            self.assertEqual(results[-1].bound, 1.0)
+            self.assertEqual(results[-1].is_possible, optimal is not None)
+            if optimal is not None:
+                self.assertEqual(results[-1].cost, optimal)
+            costs = [result.cost for result in results]
+            self.assertEqual(costs, sorted(costs, reverse=True))
+
+    def test_negative_epsilon(self):
+        labyrinth = Labyrinth(Point(2.5, 2.5), walls=[], doors=[], max_area=4)
+        self.assertRaises(ValueError, labyrinth.teseo_to_minotaurs_weighted, -1)
+        self.assertRaises(ValueError, labyrinth.teseo_to_minotaurs_anytime, -0.5)
+
+
+class TestJumpPointSearch(unittest.TestCase):
+    """
+    Test of the jump point search engine
+    """
+
+    def test_same_as_astar(self):
+        assert_same_as_astar(self, "jps")
+
+    def test_less_pushes_in_open_areas(self):
+        labyrinth = Labyrinth(Point(45.5, 40.5), walls=[], doors=[], max_area=50, engine="jps")
+        labyrinth.add_labyrinth_objs([Wall(Point(0,20), Point(30,20)), Wall(Point(31,20), Point(50,20))],
+                                     [Door(Point(30,20), Point(31,20))])
+        path = labyrinth.teseo_to_minotaurs_path()
+        pushed = labyrinth.stats.pushed
+        self.assertEqual(labyrinth.stats.engine, "jps")
+
+        expected = labyrinth.teseo_to_minotaurs_path(engine="astar")
+        self.assertEqual((path.doors, len(path), path.end()), (expected.doors, len(expected), expected.end()))
+        self.assertLess(pushed * 20, labyrinth.stats.pushed)
+
+    def test_reused_with_other_goals(self):
+        labyrinth = Labyrinth(walls=[], doors=[], max_area=10)
+        engine = JumpPointSearch(labyrinth)
+        self.assertEqual(len(engine.search((0, 0), (0, 9))), 10)
+        self.assertEqual(len(engine.search((0, 0), (0, 5))), 6)
+
+        rng = random.Random(7)
+        walls, doors = random_objects(rng, 10)
+        labyrinth.add_labyrinth_objs(walls, doors)
+        assert_same_as_bitset(self, labyrinth, JumpPointSearch(labyrinth).search, rng, queries=30)
+
+    def test_unknown_engine(self):
+        self.assertRaises(ValueError, Labyrinth, walls=[], doors=[], max_area=4, engine="dijkstra")
+        labyrinth = Labyrinth(Point(2.5, 2.5), walls=[], doors=[], max_area=4)
+        self.assertRaises(ValueError, labyrinth.teseo_to_minotaurs_path, "dijkstra")
+
+
+class TestCorridors(unittest.TestCase):
+    """
+    Test of the dead-end and corridor reduction
+    """
+
+    def test_same_as_astar(self):
+        assert_same_as_astar(self, "corridors")
+
+    def test_serpentine(self):
+        # Corridor from teseo to the minotaurs with a dead end after the minotaurs
+        walls = [Wall(Point(0,1), Point(5,1)), Wall(Point(1,2), Point(6,2)), Wall(Point(0,3), Point(5,3)),
+                 Wall(Point(1,4), Point(6,4)), Wall(Point(0,5), Point(5,5))]
+        labyrinth = Labyrinth(Point(2.5, 5.5), walls=[], doors=[Door(Point(5,3), Point(6,3))], max_area=6)
+        labyrinth.add_labyrinth_objs(walls)
+        graph = ReducedGraph(labyrinth, [(0, 0), (2, 5)])
+
+        self.assertEqual(graph.dead_ends, 2)
+        self.assertEqual(graph.junctions, 2)
+        self.assertEqual(graph.corridor_cells, 32)
+        path = graph.search((0, 0), (2, 5))
+        self.assertEqual((path.doors, len(path)), (1, 34))
+        self.assertEqual(path.encode(), "E5N1W5N1E5N1W5N1E5N1W3")
+        self.assertEqual(labyrinth.stats.expanded, 2)
+
+
+class TestBitsetWavefront(unittest.TestCase):
+    """
+    Test of the bit-parallel wavefront engine
+    """
+
+    def test_same_as_astar(self):
+        assert_same_as_astar(self, "bitset")
+
+    def test_row_bitsets(self):
+        labyrinth = Labyrinth(Point(3.5, 0.5), walls=[], doors=[], max_area=4)
+        labyrinth.add_labyrinth_objs([Wall(Point(2,0), Point(2,2)), Wall(Point(0,1), Point(2,1))], [Door(Point(2,0), Point(2,1))])
+        engine = BitsetWavefront(labyrinth)
+
+        self.assertEqual(engine._east[:3], [0b101, 0b101, 0b111])
+        self.assertEqual(engine._east_doors[:2], [0b010, 0b000])
+        self.assertEqual(engine._north[:4], [0b1100, 0b1111, 0b1111, 0])
+        path = engine.search((0, 0), (3, 0))
+        self.assertEqual((path.doors, len(path)), (1, 4))
+        self.assertEqual(labyrinth.stats.engine, "bitset")
+
+
+class TestNumpyWavefront(unittest.TestCase):
+    """
+    Test of the NumPy engine (and its fallback without NumPy)
+    """
+
+    @unittest.skipUnless(vectorized.numpy() is not None, "NumPy is not installed")
+    def test_same_as_astar(self):
+        for _, labyrinth in random_labyrinths(200):
+            expected = labyrinth.teseo_to_minotaurs_path()
+            engine = NumpyWavefront(labyrinth)
+            start = Path.node_coords(labyrinth.get_node_contains(labyrinth.teseo)[0])
+            result = engine.search(start, Path.node_coords(labyrinth.get_node_contains(labyrinth.minotaurs)[0]))
+
+            self.assertEqual(labyrinth.stats.engine, "numpy")
+            assert_same_path(self, result, expected, labyrinth)
+            self.assertEqual((engine.doors[start[1], start[0]], engine.cells[start[1], start[0]]), (0, 1))
+            if result is not None:
+                end_x, end_y = result.end()
+                self.assertEqual((engine.doors[end_y, end_x], engine.cells[end_y, end_x]), (result.doors, len(result)))
+
+    def test_fallback_without_numpy(self):
+        _, labyrinth = list(random_labyrinths(4))[3]
+        expected = labyrinth.teseo_to_minotaurs_path()
+        with unittest.mock.patch.object(vectorized, "numpy", lambda: None):
+            result = labyrinth.teseo_to_minotaurs_path(engine="numpy")
+        self.assertEqual(labyrinth.stats.engine, "bitset")
+        self.assertEqual((result.doors, len(result)), (expected.doors, len(expected)))
+
+    def test_main_engine(self):
+        filename = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data_files", "input.txt")
+        outputs = []
+        for engine in ("astar", "numpy"):
+            stream = io.StringIO()
+            Main.main(filename, output_format="jsonl", stream=stream, auto_size=True, engine=engine)
+            outputs.append(stream.getvalue())
+        self.assertEqual(outputs[0], outputs[1])
+
+
+class TestBatch(unittest.TestCase):
+    """
+    Test of the batched solving of many labyrinths
+    """
+
+    def records(self) -> 'list[LabyrinthRecord]':
+        records = []
+        for seed in range(80):
+            rng = random.Random(seed)
+            area = rng.randrange(2, 20)
+            walls, doors = random_objects(rng, area)
+            records.append(LabyrinthRecord(walls, doors, Point(rng.randrange(area) + 0.5, rng.randrange(area) + 0.5)))
+        return records
+
+    def expected(self, records: 'list[LabyrinthRecord]') -> 'list[tuple[bool, int, int]]':
+        labyrinth = Labyrinth(walls=[], doors=[], max_area=2)
+        results = []
+        for record in records:
+            record.apply(labyrinth, auto_size=True)
+            is_possible, path, doors = labyrinth.teseo_to_minotaurs()
+            results.append((is_possible, doors, len(path)))
+        return results
+
+    def test_same_as_astar(self):
+        records = self.records()
+        expected = self.expected(records)
+        self.assertIn((False, 0, 0), expected)
+        self.assertEqual(solve_batch(records, granularity=4, max_batch=16), expected)
+        with unittest.mock.patch.object(batch, "numpy", lambda: None):
+            self.assertEqual(solve_batch(records), expected)
+
+    def test_main_batch(self):
+        filename = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data_files", "input.txt")
+        outputs = []
+        for batch_mode in (False, True):
+            stream = io.StringIO()
+            Main.main(filename, output_format="jsonl", stream=stream, auto_size=True, batch=batch_mode)
+            outputs.append(stream.getvalue())
+        self.assertEqual(outputs[0], outputs[1])
+        self.assertRaises(ValueError, Main.main, filename, output_format="rle", batch=True)
+
+
+class TestMultiGoal(unittest.TestCase):
+    """
+    Test of the search of the nearest of various targets
+    """
+
+    def test_same_as_one_search_per_target(self):
+        for rng, labyrinth in random_labyrinths(150, place=False):
+            area = labyrinth.active_area
+            labyrinth.teseo = Point(rng.randrange(area) + 0.5, rng.randrange(area) + 0.5)
+            targets = [Point(rng.randrange(area) + 0.5, rng.randrange(area) + 0.5) for _ in range(rng.randrange(1, 5))]
+            expected = []
+            for target in targets:
+                labyrinth.minotaurs = target
+                path = labyrinth.teseo_to_minotaurs_path()
+                expected.append(None if path is None else (path.doors, len(path)))
+
+            nearest, path, costs = labyrinth.teseo_to_nearest(targets, all_costs=True)
+            self.assertEqual(costs, expected)
+            self.assertEqual(labyrinth.teseo_to_nearest(targets)[2], None)
+            if all(cost is None for cost in expected):
+                self.assertEqual((nearest, path), (None, None))
+            else:
+                self.assertEqual(expected[nearest], min(cost for cost in expected if cost is not None))
+                self.assertEqual((path.doors, len(path)), expected[nearest])
+                self.assertEqual(path.end(), (int(targets[nearest].x), int(targets[nearest].y)))
+
+    def test_stops_in_the_nearest(self):
+        labyrinth = Labyrinth(walls=[], doors=[], max_area=30)
+        targets = [Point(25.5, 25.5), Point(2.5, 1.5), Point(29.5, 0.5)]
+        nearest, path, costs = labyrinth.teseo_to_nearest(targets)
+        self.assertEqual((nearest, len(path), costs), (1, 4, None))
+        self.assertLess(labyrinth.stats.expanded, 10)
+        self.assertEqual(labyrinth.stats.engine, "multigoal")
+
+        self.assertEqual(labyrinth.teseo_to_nearest(targets, all_costs=True)[2], [(0, 51), (0, 4), (0, 30)])
+        self.assertRaises(ValueError, labyrinth.teseo_to_nearest, [Point(40, 40)])
+
+class TestContractionHierarchy(unittest.TestCase):
+    """
+    Test of the contraction hierarchy of the cells
+    """
+
+    def test_same_as_search(self):
+        for rng, labyrinth in random_labyrinths(60, place=False):
+            hierarchy = ContractionHierarchy.build(labyrinth)
+            assert_same_as_bitset(self, labyrinth, hierarchy.query, rng, queries=8)
+
+    def test_save_and_load(self):
+        labyrinth = Labyrinth(walls=[], doors=[], max_area=20)
+        labyrinth.add_labyrinth_objs([Wall(Point(5,0), Point(5,18)), Wall(Point(12,2), Point(12,20))],
+                                     [Door(Point(5,9), Point(5,10))])
+        hierarchy = ContractionHierarchy.build(labyrinth)
+        path = hierarchy.query((0, 0), (19, 0))
+        self.assertEqual((path.doors, len(path)), (0, 56))
+        self.assertLess(hierarchy.settled, 20 * 20)
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "labyrinth.ch")
+            hierarchy.save(filename)
+            loaded = ContractionHierarchy.load(filename)
+            self.assertEqual(loaded.query((0, 0), (19, 0)), path)
+            detour = loaded.query((0, 9), (6, 9))
+            self.assertEqual((detour.doors, len(detour)), (0, 25))
+            self.assertRaises(ValueError, loaded.query, (0, 0), (20, 0))
+
+            with open(filename, "wb") as file:
+                file.write(b"not a hierarchy")
+            self.assertRaises(ValueError, ContractionHierarchy.load, filename)
+
+class TestPathDatabase(unittest.TestCase):
+    """
+    Test of the compressed path database (first moves)
+    """
+
+    def test_same_as_search(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "labyrinth.pdb")
+            for rng, labyrinth in random_labyrinths(40, place=False):
+                build_path_database(labyrinth, filename, workers=1)
+                with load_path_database(filename) as database:
+                    assert_same_as_bitset(self, labyrinth, database.query, rng, queries=8)
+
+    def test_parallel_build_and_compression(self):
+        self.assertEqual(sorted(hilbert_order(5)), list(range(25)))
+        labyrinth = Labyrinth(walls=[], doors=[], max_area=16)
+        labyrinth.add_labyrinth_objs([Wall(Point(8,0), Point(8,16))], [Door(Point(8,3), Point(8,4))])
+        with tempfile.TemporaryDirectory() as directory:
+            first = os.path.join(directory, "one.pdb")
+            second = os.path.join(directory, "two.pdb")
+            build_path_database(labyrinth, first, workers=1)
+            build_path_database(labyrinth, second, workers=2, chunksize=8)
+            with open(first, "rb") as one, open(second, "rb") as two:
+                self.assertEqual(one.read(), two.read())
+
+            with load_path_database(first) as database:
+                self.assertLess(database.runs, 16 * 16 * 16 * 16 // 8)
+                self.assertEqual(database.first_move((7, 0), (9, 0)), (Direction.NORTH, False))
+                self.assertEqual(database.first_move((7, 3), (9, 3)), (Direction.EAST, True))
+                self.assertEqual(database.first_move((7, 3), (7, 3)), (None, False))
+                self.assertEqual(database.query((0, 0), (15, 0)).doors, 1)
+                self.assertRaises(ValueError, database.query, (0, 0), (16, 0))
+
+            with open(first, "wb") as file:
+                file.write(b"not a path database")
+            self.assertRaises(ValueError, load_path_database, first)
+
+class TestParallelSearch(unittest.TestCase):
+    """
+    Test of the parallel search in worker processes
+    """
+
+    def test_same_as_search(self):
+        for rng, labyrinth in random_labyrinths(12, max_area=14, place=False):
+            assert_same_as_bitset(self, labyrinth, ParallelSearch(labyrinth, workers=3).search, rng)
+
+    def test_engine_and_benchmark(self):
+        labyrinth = Labyrinth(Point(11.5, 0.5), walls=[], doors=[], max_area=12, engine="parallel")
+        labyrinth.add_labyrinth_objs([Wall(Point(6,0), Point(6,12))], [Door(Point(6,10), Point(6,11))])
+        is_possible, path, doors = labyrinth.teseo_to_minotaurs()
+        self.assertEqual((is_possible, len(path), doors), (True, 32, 1))
+        self.assertEqual((labyrinth.stats.engine, labyrinth.stats.pushed), ("parallel", 0))
+
+        results = scaling_benchmark(labyrinth, (0, 0), (11, 0), workers=(1, 2, 5))
+        self.assertEqual([workers for workers, _ in results], [1, 2, 5])
+        self.assertTrue(all(seconds > 0 for _, seconds in results))
+
+class TestFrontierSearch(unittest.TestCase):
+    """
+    Test of the memory-bounded frontier search
+    """
+
+    def test_same_as_search_with_caps(self):
+        for rng, labyrinth in random_labyrinths(150, max_area=14, place=False):
+            start = random_cell(rng, labyrinth.active_area)
+            goal = random_cell(rng, labyrinth.active_area)
+            expected = BitsetWavefront(labyrinth).search(start, goal)
+            for max_nodes in (None, 60, 25):
+                engine = FrontierSearch(labyrinth, max_nodes)
+                try:
+                    path = engine.search(start, goal)
+                except MemoryError:
+                    continue
+                self.assertLessEqual(engine.peak, engine.max_nodes)
+                assert_same_path(self, path, expected, labyrinth)
+
+    def test_divide_and_conquer(self):
+        labyrinth = Labyrinth(Point(39.5, 0.5), walls=[], doors=[], max_area=40, engine="frontier")
+        labyrinth.add_labyrinth_objs([Wall(Point(20,0), Point(20,40))], [Door(Point(20,30), Point(20,31))])
+        is_possible, path, doors = labyrinth.teseo_to_minotaurs()
+        self.assertEqual((is_possible, len(path), doors), (True, 100, 1))
+        self.assertEqual(labyrinth.stats.engine, "frontier")
+
+        engine = FrontierSearch(labyrinth, max_nodes=200)
+        path = engine.search((0, 0), (39, 0))
+        self.assertEqual((path.doors, len(path)), (1, 100))
+        self.assertLessEqual(engine.peak, 200)
+        self.assertGreater(labyrinth.stats.expanded, 40 * 40)
+        self.assertRaises(MemoryError, FrontierSearch(labyrinth, max_nodes=5).search, (0, 0), (39, 0))
+        self.assertRaises(ValueError, FrontierSearch, labyrinth, 0)
+
+
+class TestColumns(unittest.TestCase):
+    """
+    Test of the columnar ingestion of walls and doors
+    """
+
+    def test_same_grid_as_objects(self):
+        for seed in range(100):
+            rng = random.Random(seed)
+            area = rng.randrange(2, 14)
+            walls, doors = random_objects(rng, area)
+            expected = Labyrinth(walls=[], doors=[], max_area=area)
+            expected.add_labyrinth_objs(walls, doors)
+            columns = ObjectColumns.from_objects(walls, doors)
+            labyrinth = Labyrinth(walls=[], doors=[], max_area=area)
+            labyrinth._row(0)
+            labyrinth.add_labyrinth_columns(columns.wall_x, columns.wall_y, columns.wall_parallel, columns.wall_length,
+                                            columns.door_x, columns.door_y, columns.door_parallel)
+            self.assertEqual(labyrinth.edge_grid, expected.edge_grid)
+            self.assertEqual(labyrinth._objects_area, expected._objects_area)
+            self.assertEqual(list(labyrinth.iter_rows()), list(expected.iter_rows()))
+            self.assertEqual(repr(labyrinth.labyrinth_objs()), repr((walls, doors)))
+
+    def test_resize_and_invalid_columns(self):
+        labyrinth = Labyrinth(Point(5.5, 0.5), walls=[], doors=[], max_area=6)
+        labyrinth.add_labyrinth_columns([3], [0], [1], [6], [3], [2], [1])
+        self.assertEqual(labyrinth.teseo_to_minotaurs_path().doors, 1)
+        labyrinth.resize(8)
+        self.assertEqual(labyrinth.edge_grid.get_vertical(3, 5), EdgeGrid.WALL)
+        self.assertEqual(labyrinth.edge_grid.get_vertical(3, 2), EdgeGrid.DOOR)
+        self.assertRaises(ValueError, labyrinth.add_labyrinth_columns, [1, 2], [0], [1], [3])
+        self.assertRaises(ValueError, labyrinth.add_labyrinth_columns, door_x=[0.5], door_y=[0], door_parallel=[1])
+
+    @unittest.skipUnless(vectorized.numpy() is not None, "NumPy is not installed")
+    def test_numpy_columns(self):
+        np = vectorized.numpy()
+        labyrinth = Labyrinth(walls=[], doors=[], max_area=6)
+        labyrinth.add_labyrinth_columns(np.array([3, 0]), np.array([0, 4]), np.array([1, 0]), np.array([6, 3]),
+                                        np.array([3]), np.array([2]), np.array([1]))
+        expected = Labyrinth(walls=[], doors=[], max_area=6)
+        expected.add_labyrinth_objs([Wall(Point(3,0), Point(3,6)), Wall(Point(0,4), Point(3,4))], [Door(Point(3,2), Point(3,3))])
+        self.assertEqual(labyrinth.edge_grid, expected.edge_grid)
+
+
+class TestNormalizedColumns(unittest.TestCase):
+    """
+    Test of the normalization of the walls and doors in columns
+    """
+
+    def test_merge_and_doors(self):
+        # Overlapping, adjacent, reversed and repeated walls in X = 2, a door in the middle and a repeated door
+        columns = ObjectColumns([2, 2, 2, 2, 0, 3], [0, 2, 5, 0, 4, 4], [1, 1, 1, 1, 0, 0], [3, 3, -1, 0, 2, 1],
+                                [2, 2, 1], [3, 3, 4], [1, 1, 0])
+        minimal, saved = columns.normalized()
+        self.assertEqual((list(minimal.wall_x), list(minimal.wall_y), list(minimal.wall_parallel), list(minimal.wall_length)),
+                         ([0, 3, 2, 2], [4, 4, 0, 4], [0, 0, 1, 1], [1, 1, 3, 1]))
+        self.assertEqual((list(minimal.door_x), list(minimal.door_y), list(minimal.door_parallel)), ([1, 2], [4, 3], [0, 1]))
+        self.assertEqual(saved, columns.unit_edges() - minimal.unit_edges())
+        self.assertEqual(saved, (10 + 3) - (6 + 2))
+
+        labyrinth = Labyrinth(walls=[], doors=[], max_area=6)
+        labyrinth.add_object_columns(columns)
+        expected = Labyrinth(walls=[], doors=[], max_area=6)
+        expected.add_labyrinth_objs(columns.walls(), columns.doors())
+        self.assertEqual(labyrinth.edge_grid, expected.edge_grid)
+        self.assertEqual(labyrinth.saved_edges, saved)
+        labyrinth.eliminate_labyrinth_objs()
+        self.assertEqual(labyrinth.saved_edges, 0)
+
+    def test_same_grid_random(self):
+        for seed in range(100):
+            rng = random.Random(seed)
+            area = rng.randrange(2, 14)
+            walls, doors = random_objects(rng, area)
+            walls += walls[:rng.randrange(len(walls) + 1)]
+            columns = ObjectColumns.from_objects(walls, doors + doors[:2])
+            minimal, saved = columns.normalized()
+            self.assertGreaterEqual(saved, 0)
+            self.assertLessEqual(len(minimal.door_x), len(doors))
+            labyrinth = Labyrinth(walls=[], doors=[], max_area=area)
+            labyrinth.add_object_columns(columns)
+            expected = Labyrinth(walls=[], doors=[], max_area=area)
+            expected.add_labyrinth_objs(walls, doors)
+            self.assertEqual(labyrinth.edge_grid, expected.edge_grid)
+
     
 if __name__ == '__main__':
     unittest.main()